@@ -0,0 +1,81 @@
+#####################################################################
+# =========================== LIBRAIRIES ========================== #
+#####################################################################
+
+import os
+import sys
+import time
+import logging
+import tempfile
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from generate_data import generate_folder
+
+
+#####################################################################
+# =========================== CONSTANTS =========================== #
+#####################################################################
+
+ARC_COUNT = 12
+STUDY_COUNT = 60
+YEARS = [2024, 2025, 2026]
+REPEAT = 5
+
+
+#####################################################################
+# ===================== ASSISTANCE FUNCTIONS ====================== #
+#####################################################################
+
+def make_folder(root, seed=0):
+    """
+    Writes a synthetic "imotion" folder (see generate_data.generate_folder): ARC_COUNT ARCs, STUDY_COUNT studies
+    and the history of every week of YEARS for each ARC.
+    """
+    return generate_folder(root, ARC_COUNT, STUDY_COUNT, tuple(YEARS), seed)
+
+
+def best_time(function, clear_charts=False):
+    from imotion_charts import _CHART_CACHE
+
+    timings = []
+    for _ in range(REPEAT):
+        if clear_charts:
+            _CHART_CACHE.clear()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+#####################################################################
+# ========================== ALGO LAUNCH ========================== #
+#####################################################################
+
+if __name__ == "__main__":
+    # Streamlit runs in "bare" mode here: widgets return their default value and nothing is displayed
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as root:
+        make_folder(root)
+        os.chdir(root)
+        import time_entry_manager_online as app
+
+        views = list(app.VIEWS.items())
+
+        def all_views():
+            # What st.tabs executes on every rerun
+            for _, show_view in views:
+                show_view()
+
+        # First run: builds the rollup and fills the read cache
+        all_views()
+
+        print(f"Données : {ARC_COUNT} ARCs, {STUDY_COUNT} études, {len(YEARS)} années d'historique")
+        print(f"{'rerun':<42} {'graphiques en cache (ms)':>25} {'graphiques à redessiner (ms)':>29}")
+        print(f"{'onglets (6 vues)':<42} {best_time(all_views) * 1000:>25.1f} {best_time(all_views, clear_charts=True) * 1000:>29.1f}")
+        for label, show_view in views:
+            print(f"{'barre latérale : ' + label[2:]:<42} {best_time(show_view) * 1000:>25.1f} {best_time(show_view, clear_charts=True) * 1000:>29.1f}")
@@ -0,0 +1,101 @@
+#####################################################################
+# =========================== LIBRAIRIES ========================== #
+#####################################################################
+
+import os
+import sys
+import time
+import random
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from imotion_storage import CATEGORIES, ACTION_CAT, normalize_time_frame
+from imotion_reconcile import reconcile_week
+
+
+#####################################################################
+# =========================== CONSTANTS =========================== #
+#####################################################################
+
+YEAR = 2026
+WEEK = 42
+STUDY_COUNTS = [10, 50, 200, 1000]
+HISTORY_YEARS = [1, 3, 10]
+REPEAT = 3
+
+
+#####################################################################
+# ===================== ASSISTANCE FUNCTIONS ====================== #
+#####################################################################
+
+def legacy_reconcile(ongoing_df, time_df, assigned_studies, year, week):
+    """
+    The row-wise reconciliation formerly inlined in time_entry_online.main, kept as the reference.
+    """
+    merged_df = pd.merge(ongoing_df, time_df, on=['YEAR', 'WEEK', 'STUDY'], suffixes=('_ongoing', '_time'), how='outer')
+    assigned_studies = set(assigned_studies)
+    merged_df = merged_df[merged_df['STUDY'].isin(assigned_studies)]
+    columns_to_update = CATEGORIES[3:]
+    for col in columns_to_update:
+        merged_df[col + '_ongoing'] = merged_df.apply(
+            lambda row: row[col + '_time'] if not pd.isna(row[col + '_time']) and row[col + '_ongoing'] == 0 else row[col + '_ongoing'], axis=1)
+    for study in assigned_studies:
+        if study not in merged_df['STUDY'].tolist():
+            new_row_data = {'YEAR': year, 'WEEK': week, 'STUDY': study}
+            new_row_data.update({col + '_ongoing': 0 for col in columns_to_update[:]})
+            new_row_data['COMMENTAIRE_ongoing'] = "Aucun"
+            merged_df = pd.concat([merged_df, pd.DataFrame([new_row_data])], ignore_index=True)
+    filtered_columns = [col for col in merged_df.columns if '_time' not in col]
+    return merged_df[filtered_columns].rename(columns={col + '_ongoing': col for col in columns_to_update})
+
+
+def make_inputs(n_studies, n_years, seed=0):
+    """
+    Builds a synthetic week: an Ongoing file half filled in, a history of the same week over n_years years,
+    and an assignment list with 10% of studies absent from both sources.
+    """
+    rng = random.Random(seed)
+    studies = [f"STUDY_{i}" for i in range(n_studies)]
+
+    def row(year, study, filled):
+        values = {'YEAR': year, 'WEEK': WEEK, 'STUDY': study, 'TOTAL': round(rng.random() * 8, 2) if filled else 0}
+        values.update({col: filled and rng.random() < 0.3 for col in ACTION_CAT})
+        values.update({col: rng.randint(0, 3) if filled else 0 for col in CATEGORIES[-5:-1]})
+        values['COMMENTAIRE'] = "Aucun"
+        return values
+
+    ongoing = pd.DataFrame([row(YEAR, study, rng.random() < 0.5) for study in studies[:int(n_studies * 0.8)]], columns=CATEGORIES)
+    history = pd.DataFrame([row(YEAR - offset, study, True) for offset in range(n_years) for study in studies[int(n_studies * 0.1):int(n_studies * 0.9)]],
+                           columns=CATEGORIES)
+    return ongoing, history, studies
+
+
+def best_time(function, *args):
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def same_result(legacy, vectorized):
+    def canonical(df):
+        return normalize_time_frame(df).sort_values(['YEAR', 'WEEK', 'STUDY']).reset_index(drop=True)
+    return canonical(legacy).equals(canonical(vectorized))
+
+
+#####################################################################
+# ========================== ALGO LAUNCH ========================== #
+#####################################################################
+
+if __name__ == "__main__":
+    print(f"{'études':>8} {'années':>7} {'lignes hist.':>13} {'legacy (ms)':>12} {'vectorisé (ms)':>15} {'gain':>7}  identique")
+    for n_studies in STUDY_COUNTS:
+        for n_years in HISTORY_YEARS:
+            ongoing, history, studies = make_inputs(n_studies, n_years)
+            args = (ongoing, history, studies, YEAR, WEEK)
+            legacy_seconds, legacy = best_time(legacy_reconcile, *args)
+            vectorized_seconds, vectorized = best_time(reconcile_week, *args)
+            print(f"{n_studies:>8} {n_years:>7} {len(history):>13} {legacy_seconds * 1000:>12.1f} {vectorized_seconds * 1000:>15.1f} "
+                  f"{legacy_seconds / vectorized_seconds:>6.1f}x  {same_result(legacy, vectorized)}")
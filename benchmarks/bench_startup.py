@@ -0,0 +1,102 @@
+#####################################################################
+# =========================== LIBRAIRIES ========================== #
+#####################################################################
+
+import os
+import sys
+import json
+import time
+import runpy
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+#####################################################################
+# =========================== CONSTANTS =========================== #
+#####################################################################
+
+APPS = ["time_entry_online", "time_entry_manager_online"]
+HEAVY_MODULES = ["matplotlib", "seaborn"]
+REPEAT = 5
+
+
+#####################################################################
+# ===================== ASSISTANCE FUNCTIONS ====================== #
+#####################################################################
+
+class BareSessionState(dict):
+    """
+    Stand-in for st.session_state, which is not available when the script runs outside `streamlit run`.
+    """
+    def __getattr__(self, key):
+        return self.get(key)
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+
+def measure_child(app_name):
+    """
+    Runs in a fresh interpreter: executes the app script twice, top to bottom as `streamlit run` does
+    (first render, then a rerun), and prints the timings as JSON.
+    """
+    import warnings
+    import logging
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.WARNING)
+
+    script = os.path.join(ROOT, app_name + ".py")
+    start = time.perf_counter()
+    import streamlit as st
+    st.session_state = BareSessionState()
+    imported = time.perf_counter()
+    runpy.run_path(script, run_name="__main__")
+    first_render = time.perf_counter()
+    runpy.run_path(script, run_name="__main__")
+    rerun = time.perf_counter()
+
+    print(json.dumps({
+        'streamlit': imported - start,
+        'first_render': first_render - start,
+        'rerun': rerun - first_render,
+        'heavy_modules': [name for name in HEAVY_MODULES if name in sys.modules],
+    }))
+
+
+def measure(app_name, folder):
+    """
+    Starts REPEAT fresh interpreters for an app and keeps the best timings.
+    """
+    runs = []
+    for _ in range(REPEAT):
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", app_name],
+                                cwd=folder, capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    best = {key: min(run[key] for run in runs) for key in ('streamlit', 'first_render', 'rerun')}
+    best['heavy_modules'] = runs[-1]['heavy_modules']
+    return best
+
+
+#####################################################################
+# ========================== ALGO LAUNCH ========================== #
+#####################################################################
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        measure_child(sys.argv[2])
+        sys.exit(0)
+
+    from bench_navigation import make_folder
+
+    with tempfile.TemporaryDirectory() as root:
+        make_folder(root)
+        # Page displayed before login: ARC selection for the employees, password for the managers
+        print(f"{'application':<28} {'import streamlit (ms)':>21} {'premier rendu (ms)':>19} {'rerun (ms)':>11}  modules graphiques chargés")
+        for app_name in APPS:
+            result = measure(app_name, root)
+            print(f"{app_name:<28} {result['streamlit'] * 1000:>21.1f} {result['first_render'] * 1000:>19.1f} {result['rerun'] * 1000:>11.1f}  "
+                  f"{', '.join(result['heavy_modules']) or 'aucun'}")
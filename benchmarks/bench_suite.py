@@ -0,0 +1,192 @@
+#####################################################################
+# =========================== LIBRAIRIES ========================== #
+#####################################################################
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import platform
+import argparse
+import datetime
+import tempfile
+import warnings
+import statistics
+import contextlib
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from generate_data import generate_folder
+
+
+#####################################################################
+# =========================== CONSTANTS =========================== #
+#####################################################################
+
+RESULTS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+REPEAT = 5
+# A case is reported as a regression when its best time grows by more than this ratio and by more than 5 ms
+REGRESSION_RATIO = 1.2
+REGRESSION_MIN_S = 0.005
+DASHBOARD_VIEWS = ['show_arc_dashboard', 'show_all_arcs_dashboard', 'show_study_dashboard', 'show_all_studies_dashboard']
+
+
+#####################################################################
+# ===================== ASSISTANCE FUNCTIONS ====================== #
+#####################################################################
+
+def measure(function, repeat, before=None):
+    """
+    Calls a function repeat times and returns its timings: the first call (cold caches), then the best
+    and the median of all the calls.
+    """
+    timings = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {'first_s': timings[0], 'best_s': min(timings), 'median_s': statistics.median(timings)}
+
+
+def git_version():
+    """
+    Returns the short hash of the checked-out commit and whether the tree has local changes (None outside git).
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def run_cases(repeat):
+    """
+    Times the hot paths of both apps in the current directory, which holds the "imotion" folder.
+    Streamlit runs in "bare" mode: widgets return their default value and nothing is displayed.
+
+    Returns:
+    - dict: case name -> timings (see measure).
+    """
+    import time_entry_online as employee
+    import time_entry_manager_online as manager
+    from imotion_charts import _CHART_CACHE
+
+    results = {}
+    arc = sorted(employee.load_arc_passwords())[0]
+    _, _, week, _, year = employee.calculate_weeks()
+
+    # Employee app
+    results['load_data'] = measure(lambda: employee.load_data(arc), repeat)
+    # The password input of the sidebar is empty in bare mode: the benchmark is authenticated
+    employee.authenticate_user = lambda arc_name, password: True
+    results['current_week_rerun'] = measure(employee.main, repeat)
+    week_rows = employee.load_weekly_data(arc, week)
+    results['save_week'] = measure(lambda: employee.save_week_data(week_rows, arc, {(year, week)}), repeat)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results['auto_save_all'] = measure(lambda: employee.main_auto_save_all(workers=4), repeat)
+
+    # Manager app: study list, then the dashboards with every chart redrawn
+    results['load_all_study_names'] = measure(manager.load_all_study_names, repeat)
+    for name in DASHBOARD_VIEWS:
+        results[name] = measure(getattr(manager, name), repeat, before=_CHART_CACHE.clear)
+    return results
+
+
+def print_results(report, baseline=None):
+    """
+    Prints the timings of a report, compared with those of a baseline report if given.
+
+    Returns:
+    - list: The names of the cases that regressed against the baseline.
+    """
+    base = (baseline or {}).get('results', {})
+    header = f"{'cas':<28} {'1er appel (ms)':>15} {'meilleur (ms)':>14} {'médiane (ms)':>13}"
+    if baseline:
+        header += f" {'référence (ms)':>15} {'ratio':>7}"
+    print(header)
+    regressions = []
+    for name, timing in report['results'].items():
+        line = f"{name:<28} {timing['first_s'] * 1000:>15.1f} {timing['best_s'] * 1000:>14.1f} {timing['median_s'] * 1000:>13.1f}"
+        if baseline and name in base:
+            ratio = timing['best_s'] / base[name]['best_s'] if base[name]['best_s'] else float('inf')
+            line += f" {base[name]['best_s'] * 1000:>15.1f} {ratio:>7.2f}"
+            if ratio > REGRESSION_RATIO and timing['best_s'] - base[name]['best_s'] > REGRESSION_MIN_S:
+                line += "  régression"
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+#####################################################################
+# ========================== ALGO LAUNCH ========================== #
+#####################################################################
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mesure les chemins critiques des deux applications et enregistre les résultats en JSON.")
+    parser.add_argument("--arcs", type=int, default=12, help="Nombre d'ARCs générés (12 par défaut)")
+    parser.add_argument("--studies", type=int, default=60, help="Nombre d'études générées (60 par défaut)")
+    parser.add_argument("--years", type=int, nargs='+', default=[2024, 2025, 2026], help="Années d'historique générées")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du générateur aléatoire")
+    parser.add_argument("--data", help="Dossier contenant un dossier 'imotion' existant, copié avant la mesure (au lieu de le générer)")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help=f"Nombre d'appels par cas ({REPEAT} par défaut)")
+    parser.add_argument("--output", help="Fichier JSON des résultats (benchmarks/results/<date>_<commit>.json par défaut)")
+    parser.add_argument("--compare", help="Fichier JSON d'une mesure précédente à comparer")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.WARNING)
+    commit, dirty = git_version()
+
+    with tempfile.TemporaryDirectory() as root:
+        if args.data:
+            shutil.copytree(os.path.join(args.data, "imotion"), os.path.join(root, "imotion"))
+            data = {'source': os.path.abspath(args.data)}
+        else:
+            summary = generate_folder(root, args.arcs, args.studies, tuple(args.years), args.seed)
+            data = {'arcs': args.arcs, 'studies': args.studies, 'years': args.years, 'seed': args.seed,
+                    'rows': summary['rows'], 'bytes': summary['bytes']}
+        cwd = os.getcwd()
+        os.chdir(root)
+        try:
+            results = run_cases(args.repeat)
+        finally:
+            os.chdir(cwd)
+
+    from imotion_charts import chart_engine
+    report = {
+        'commit': commit,
+        'dirty': dirty,
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'backend': os.getenv("IMOTION_BACKEND", "csv"),
+        'chart_engine': chart_engine(),
+        'repeat': args.repeat,
+        'data': data,
+        'results': results,
+    }
+
+    output = args.output or os.path.join(RESULTS_FOLDER, f"{datetime.datetime.now():%Y%m%d-%H%M%S}_{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    regressions = print_results(report, baseline)
+    print(f"Résultats enregistrés dans {output}")
+    if regressions:
+        # Non-zero exit code so that a CI step comparing with a reference run fails
+        print(f"{len(regressions)} régression(s) : {', '.join(regressions)}")
+        sys.exit(1)
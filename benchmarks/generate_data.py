@@ -0,0 +1,149 @@
+#####################################################################
+# =========================== LIBRAIRIES ========================== #
+#####################################################################
+
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from imotion_storage import CATEGORIES, ACTION_CAT, DATA_FOLDER
+from imotion_calendar import iso_week, weeks_in_year
+
+
+#####################################################################
+# =========================== CONSTANTS =========================== #
+#####################################################################
+
+QUANTITY_CAT = ['NB_VISITE', 'NB_PAT_SCR', 'NB_PAT_RAN', 'NB_EOS']
+# Share of the studies only present in the history (archived), share of the studies with a backup ARC
+ARCHIVED_SHARE = 0.1
+BACKUP_SHARE = 0.7
+# Share of the (study, week) rows without any time, mean hours of the other ones
+IDLE_SHARE = 0.25
+MEAN_HOURS = 3.0
+# Probability of each action, mean of the quantities of a week
+ACTION_PROBABILITY = 0.25
+QUANTITY_MEAN = 0.6
+PASSWORD = "mdp"
+
+
+#####################################################################
+# ===================== ASSISTANCE FUNCTIONS ====================== #
+#####################################################################
+
+def week_range(years, until):
+    """
+    Lists the (year, week) pairs of the years, up to and excluding the current week (which is in the Ongoing files).
+    """
+    weeks = [(year, week) for year in years for week in range(1, weeks_in_year(year) + 1)]
+    return [pair for pair in weeks if pair < until]
+
+
+def random_rows(rng, studies, weeks):
+    """
+    Builds the rows of every (week, study) pair with realistic values: a quarter of idle rows,
+    hours rounded to the quarter of an hour, a few actions and small patient counts.
+    """
+    count = len(studies) * len(weeks)
+    idle = rng.random(count) < IDLE_SHARE
+    df = pd.DataFrame({
+        'YEAR': np.repeat([year for year, _ in weeks], len(studies)),
+        'WEEK': np.repeat([week for _, week in weeks], len(studies)),
+        'STUDY': np.tile(studies, len(weeks)),
+        'TOTAL': np.where(idle, 0.0, np.round(rng.gamma(2.0, MEAN_HOURS / 2.0, count) * 4) / 4),
+    })
+    for col in ACTION_CAT:
+        df[col] = ~idle & (rng.random(count) < ACTION_PROBABILITY)
+    for col in QUANTITY_CAT:
+        df[col] = np.where(idle, 0, rng.poisson(QUANTITY_MEAN, count))
+    df['COMMENTAIRE'] = "Aucun"
+    return df[CATEGORIES]
+
+
+def generate_folder(root, arc_count=12, study_count=60, years=(2024, 2025, 2026), seed=0, until=None):
+    """
+    Writes a synthetic "imotion" folder: ARC_MDP.csv, STUDY.csv, one Time_{arc}.csv history and one
+    Ongoing_{arc}.csv file per ARC.
+
+    Each active study has a principal ARC and, for BACKUP_SHARE of them, a backup ARC; ARCHIVED_SHARE of the
+    studies are archived (absent from STUDY.csv, present in the history of the years before the last one).
+    The histories cover every ISO week of the years (52 or 53) up to the current week, which is in the
+    Ongoing files with half of the rows already filled in.
+
+    Parameters:
+    - root (str): The directory in which the "imotion" folder is created.
+    - arc_count (int, optional): The number of ARCs. Defaults to 12.
+    - study_count (int, optional): The number of studies (active and archived). Defaults to 60.
+    - years (tuple, optional): The years of history. Defaults to (2024, 2025, 2026).
+    - seed (int, optional): The seed of the random generator. Defaults to 0.
+    - until (tuple, optional): The current (ISO year, ISO week). Defaults to the current week.
+
+    Returns:
+    - dict: 'folder', 'arcs', 'studies', 'rows' (history rows) and 'bytes' (size of the folder).
+    """
+    rng = np.random.default_rng(seed)
+    until = until or iso_week()
+    folder = os.path.join(root, DATA_FOLDER)
+    os.makedirs(folder, exist_ok=True)
+
+    arcs = [f"ARC_{i:03d}" for i in range(arc_count)]
+    studies = [f"STUDY_{i:04d}" for i in range(study_count)]
+    archived_count = int(study_count * ARCHIVED_SHARE)
+    active = studies[archived_count:]
+
+    # Principal ARC in turn, backup ARC the next one for BACKUP_SHARE of the studies
+    principal = [arcs[i % arc_count] for i in range(study_count)]
+    has_backup = rng.random(study_count) < BACKUP_SHARE
+    backup = [arcs[(i + 1) % arc_count] if has_backup[i] and arc_count > 1 else None for i in range(study_count)]
+    pd.DataFrame({'ARC': arcs, 'MDP': PASSWORD}).to_csv(os.path.join(folder, "ARC_MDP.csv"), sep=';', index=False)
+    pd.DataFrame({'STUDY': active, 'ARC': principal[archived_count:], 'ARC_BACKUP': backup[archived_count:]}).to_csv(
+        os.path.join(folder, "STUDY.csv"), sep=';', index=False)
+
+    weeks = week_range(years, until)
+    archived_weeks = [pair for pair in weeks if pair[0] < max(years)]
+    rows = 0
+    for arc in arcs:
+        own = [i for i in range(study_count) if principal[i] == arc or backup[i] == arc]
+        own_active = [studies[i] for i in own if i >= archived_count]
+        own_archived = [studies[i] for i in own if i < archived_count]
+
+        history = [random_rows(rng, own_active, weeks)]
+        if own_archived and archived_weeks:
+            history.append(random_rows(rng, own_archived, archived_weeks))
+        history = pd.concat(history, ignore_index=True).sort_values(['YEAR', 'WEEK', 'STUDY'], kind='stable')
+        history.to_csv(os.path.join(folder, f"Time_{arc}.csv"), sep=';', index=False)
+        rows += len(history)
+
+        ongoing = random_rows(rng, own_active, [until])
+        blank = ongoing.index[len(ongoing) // 2:]
+        ongoing.loc[blank, ['TOTAL'] + QUANTITY_CAT] = 0
+        ongoing.loc[blank, ACTION_CAT] = False
+        ongoing.to_csv(os.path.join(folder, f"Ongoing_{arc}.csv"), sep=';', index=False)
+
+    size = sum(entry.stat().st_size for entry in os.scandir(folder) if entry.is_file())
+    return {'folder': folder, 'arcs': arc_count, 'studies': study_count, 'rows': rows, 'bytes': size}
+
+
+#####################################################################
+# ========================== ALGO LAUNCH ========================== #
+#####################################################################
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Génère un dossier 'imotion' synthétique (ARCs, études, historiques, fichiers Ongoing).")
+    parser.add_argument("root", help="Dossier dans lequel créer le dossier 'imotion'")
+    parser.add_argument("--arcs", type=int, default=12, help="Nombre d'ARCs (12 par défaut)")
+    parser.add_argument("--studies", type=int, default=60, help="Nombre d'études, actives et archivées (60 par défaut)")
+    parser.add_argument("--years", type=int, nargs='+', default=[2024, 2025, 2026], help="Années d'historique")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du générateur aléatoire")
+    args = parser.parse_args()
+
+    if os.path.exists(os.path.join(args.root, DATA_FOLDER)):
+        print(f"Le dossier {os.path.join(args.root, DATA_FOLDER)} existe déjà.")
+        sys.exit(1)
+    summary = generate_folder(args.root, args.arcs, args.studies, tuple(args.years), args.seed)
+    print(f"{summary['folder']} : {summary['arcs']} ARCs, {summary['studies']} études, "
+          f"{summary['rows']} lignes d'historique, {summary['bytes'] / 1e6:.1f} Mo")
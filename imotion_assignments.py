@@ -0,0 +1,153 @@
+#####################################################################
+# =========================== LIBRAIRIES ========================== #
+#####################################################################
+
+import os
+import threading
+import pandas as pd
+from imotion_storage import DATA_FOLDER, get_table_store
+
+
+#####################################################################
+# =========================== CONSTANTS =========================== #
+#####################################################################
+
+STUDY_FILE = "STUDY.csv"
+PRINCIPAL = 'Principal'
+BACKUP = 'Backup'
+
+
+#####################################################################
+# ======================= ASSIGNMENT INDEX ======================== #
+#####################################################################
+
+def _is_arc(value):
+    return value is not None and not (isinstance(value, float) and pd.isna(value)) and value != ''
+
+
+class StudyAssignmentIndex:
+    """
+    In-memory index of STUDY.csv, built in a single pass over the file:
+    - by_arc: ARC -> list of (row position, study, role), in the order of STUDY.csv;
+    - by_study: study -> (principal ARC, backup ARC).
+    An ARC that is both principal and backup of a study is only listed as principal.
+    """
+
+    def __init__(self, df_study):
+        self.df_study = df_study
+        self.by_arc = {}
+        self.by_study = {}
+        for position, (study, principal, backup) in enumerate(zip(df_study['STUDY'], df_study['ARC'], df_study['ARC_BACKUP'])):
+            principal = principal if _is_arc(principal) else None
+            backup = backup if _is_arc(backup) else None
+            if principal is not None:
+                self.by_arc.setdefault(principal, []).append((position, study, PRINCIPAL))
+            if backup is not None and backup != principal:
+                self.by_arc.setdefault(backup, []).append((position, study, BACKUP))
+            self.by_study[study] = (principal, backup)
+
+    def studies_of(self, arc):
+        """
+        Returns the studies assigned to an ARC (principal or backup), in the order of STUDY.csv.
+
+        Parameters:
+        - arc (str): The ARC identifier.
+
+        Returns:
+        - list: The study names.
+        """
+        return [study for _, study, _ in self.by_arc.get(arc, [])]
+
+    def roles_of(self, arc):
+        """
+        Returns the (study, role) pairs of an ARC, in the order of STUDY.csv.
+
+        Parameters:
+        - arc (str): The ARC identifier.
+
+        Returns:
+        - list: (study, 'Principal' or 'Backup') tuples.
+        """
+        return [(study, role) for _, study, role in self.by_arc.get(arc, [])]
+
+    def arcs_of(self, study):
+        """
+        Returns the principal and backup ARCs of a study.
+
+        Parameters:
+        - study (str): The study name.
+
+        Returns:
+        - tuple: (principal ARC or None, backup ARC or None).
+        """
+        return self.by_study.get(study, (None, None))
+
+    def frame_of(self, arc):
+        """
+        Returns the rows of STUDY.csv assigned to an ARC, with an additional 'ROLE' column.
+
+        Parameters:
+        - arc (str): The ARC identifier.
+
+        Returns:
+        - pandas.DataFrame: A new DataFrame (the rows keep their index in STUDY.csv).
+        """
+        entries = self.by_arc.get(arc, [])
+        frame = self.df_study.iloc[[position for position, _, _ in entries]].copy()
+        frame['ROLE'] = pd.Series([role for _, _, role in entries], index=frame.index, dtype=object)
+        return frame
+
+
+# Module-level cache: one index per storage backend and data folder, rebuilt when STUDY.csv changes
+_INDEXES = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def _cache_key(store):
+    return store.name, os.path.abspath(store.folder)
+
+
+def get_assignment_index(store=None):
+    """
+    Returns the assignment index of the current version of STUDY.csv, building it only when the file changed.
+
+    Parameters:
+    - store (CsvTableStore or SqliteTableStore, optional): The table store. Defaults to the configured one.
+
+    Returns:
+    - StudyAssignmentIndex: The index.
+
+    Raises:
+    - FileNotFoundError: If STUDY.csv does not exist.
+    """
+    store = store or get_table_store(folder=DATA_FOLDER)
+    key = _cache_key(store)
+    version = store.version(STUDY_FILE)
+    with _INDEXES_LOCK:
+        cached = _INDEXES.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+    index = StudyAssignmentIndex(store.read(STUDY_FILE, sep=';', encoding='utf-8', copy=False))
+    with _INDEXES_LOCK:
+        _INDEXES[key] = (version, index)
+    return index
+
+
+def update_assignment_index(df_study, store=None):
+    """
+    Replaces the cached index with one built from a STUDY DataFrame that was just saved, so that
+    the next lookups do not read the file back.
+
+    Parameters:
+    - df_study (pandas.DataFrame): The saved content of STUDY.csv.
+    - store (CsvTableStore or SqliteTableStore, optional): The table store it was saved to. Defaults to the configured one.
+
+    Returns:
+    - StudyAssignmentIndex: The new index.
+    """
+    store = store or get_table_store(folder=DATA_FOLDER)
+    index = StudyAssignmentIndex(df_study.reset_index(drop=True))
+    with _INDEXES_LOCK:
+        _INDEXES[_cache_key(store)] = (store.version(STUDY_FILE), index)
+    return index
@@ -0,0 +1,225 @@
+#####################################################################
+# =========================== LIBRAIRIES ========================== #
+#####################################################################
+
+import os
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+
+#####################################################################
+# =========================== CONSTANTS =========================== #
+#####################################################################
+
+CACHE_SIZE_ENV_VAR = "IMOTION_CACHE_MB"
+DEFAULT_CACHE_SIZE_MB = 256
+
+
+#####################################################################
+# ========================== LRU CACHE ============================ #
+#####################################################################
+
+def estimate_size(value):
+    """
+    Estimates the memory footprint of a cached value.
+
+    Parameters:
+    - value: A pandas object, bytes, or any other Python object.
+
+    Returns:
+    - int: The estimated size in bytes.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    return 1024
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache bounded by the total estimated size of its values.
+    Hit, miss and eviction counters are kept so that the cache efficiency can be checked in production.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Returns the value stored for a key and marks it as recently used.
+
+        Parameters:
+        - key (hashable): The cache key.
+
+        Returns:
+        - The cached value, or None if the key is absent.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """
+        Stores a value, evicting the least recently used entries until the size cap is respected.
+        Values larger than the whole cap are not stored.
+
+        Parameters:
+        - key (hashable): The cache key.
+        - value: The value to store.
+
+        Returns:
+        None
+        """
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def discard(self, predicate):
+        """
+        Removes every entry whose key matches a predicate.
+
+        Parameters:
+        - predicate (callable): Function receiving a key and returning True if the entry must be removed.
+
+        Returns:
+        - int: The number of removed entries.
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self.current_bytes -= self._entries.pop(key)[1]
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+        - dict: hits, misses, evictions, entries, bytes and max_bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+#####################################################################
+# ======================== CSV READ CACHE ========================= #
+#####################################################################
+
+# Module-level cache: Streamlit re-executes the app scripts on every rerun, but imported modules
+# stay loaded, so this cache is shared by every session and every rerun of the process.
+_READ_CACHE = LRUCache(int(os.getenv(CACHE_SIZE_ENV_VAR, DEFAULT_CACHE_SIZE_MB)) * 1024 * 1024)
+
+
+def file_version(file_path):
+    """
+    Returns a cheap version stamp of a file.
+
+    Parameters:
+    - file_path (str): The path of the file.
+
+    Returns:
+    - tuple: (modification time in nanoseconds, size in bytes).
+
+    Raises:
+    - FileNotFoundError: If the file does not exist.
+    """
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_csv_cached(file_path, sep=';', encoding='utf-8', copy=False, dtype=None):
+    """
+    Reads a CSV file through the process-wide cache, keyed by (path, mtime, size).
+    Falls back to Latin1 if the file is not valid for the requested encoding.
+
+    Parameters:
+    - file_path (str): The path of the CSV file.
+    - sep (str, optional): The column separator. Defaults to ';'.
+    - encoding (str, optional): The encoding of the file. Defaults to 'utf-8'.
+    - copy (bool, optional): Return a copy of the cached DataFrame. Readers that modify the
+      DataFrame in place must ask for a copy. Defaults to False.
+    - dtype (dict, optional): Column types passed to pandas.read_csv. Defaults to None.
+
+    Returns:
+    - pandas.DataFrame: The parsed DataFrame. Without copy, it is shared and must not be mutated.
+
+    Raises:
+    - FileNotFoundError: If the file does not exist.
+    """
+    path = os.path.abspath(file_path)
+    key = (path, *file_version(path), sep, encoding, repr(dtype))
+
+    df = _READ_CACHE.get(key)
+    if df is None:
+        try:
+            df = pd.read_csv(path, sep=sep, encoding=encoding, dtype=dtype)
+        except UnicodeDecodeError:
+            df = pd.read_csv(path, sep=sep, encoding='latin1', dtype=dtype)
+        # Older versions of the same file can no longer be hit: drop them right away
+        _READ_CACHE.discard(lambda cached_key: cached_key[0] == path and cached_key[1:3] != key[1:3])
+        _READ_CACHE.put(key, df)
+
+    return df.copy() if copy else df
+
+
+def invalidate(file_path=None):
+    """
+    Removes the cached versions of a file, or of every file. Called by all the write paths.
+
+    Parameters:
+    - file_path (str, optional): The path of the file that was written. None clears the whole cache.
+
+    Returns:
+    None
+    """
+    if file_path is None:
+        _READ_CACHE.clear()
+        return
+    path = os.path.abspath(file_path)
+    _READ_CACHE.discard(lambda cached_key: cached_key[0] == path)
+
+
+def cache_stats():
+    """
+    Returns the hit/miss counters of the CSV read cache.
+
+    Returns:
+    - dict: hits, misses, evictions, entries, bytes and max_bytes.
+    """
+    return _READ_CACHE.stats()
@@ -0,0 +1,199 @@
+#####################################################################
+# =========================== LIBRAIRIES ========================== #
+#####################################################################
+
+import datetime
+import functools
+import numpy as np
+import pandas as pd
+
+
+#####################################################################
+# =========================== CONSTANTS =========================== #
+#####################################################################
+
+# Years covered by the calendar (ISO years, inclusive)
+CALENDAR_FIRST_YEAR = 2000
+CALENDAR_LAST_YEAR = 2100
+CALENDAR_COLUMNS = ['ISO_YEAR', 'ISO_WEEK', 'WEEK_START', 'WEEK_END', 'MONTH']
+
+
+#####################################################################
+# ===================== ASSISTANCE FUNCTIONS ====================== #
+#####################################################################
+
+def week_key(year, week):
+    """
+    Encodes (ISO year, ISO week) pairs as one integer, YEAR * 100 + WEEK, which sorts chronologically.
+    Works on scalars as well as on columns or arrays.
+
+    Parameters:
+    - year (int or array-like): The ISO years.
+    - week (int or array-like): The ISO weeks.
+
+    Returns:
+    - int or numpy.ndarray: The keys.
+    """
+    if np.isscalar(year) and np.isscalar(week):
+        return int(year) * 100 + int(week)
+    return np.asarray(year, dtype=np.int64) * 100 + np.asarray(week, dtype=np.int64)
+
+
+@functools.lru_cache(maxsize=1)
+def get_calendar():
+    """
+    Builds the ISO calendar dimension once per process: one row per ISO week from CALENDAR_FIRST_YEAR to
+    CALENDAR_LAST_YEAR, with its Monday and Sunday and the month it belongs to. As for the ISO year, a week
+    belongs to the month of its Thursday, so every week is in exactly one month, including the weeks that
+    cross a month or a year boundary (e.g. week 1 of 2026, from 29/12/2025 to 04/01/2026, is in January 2026).
+
+    Returns:
+    - pandas.DataFrame: The CALENDAR_COLUMNS columns, indexed by week_key and sorted chronologically
+      (shared cached DataFrame: do not modify).
+    """
+    first_monday = datetime.date.fromisocalendar(CALENDAR_FIRST_YEAR, 1, 1)
+    last_monday = datetime.date.fromisocalendar(CALENDAR_LAST_YEAR + 1, 1, 1) - datetime.timedelta(weeks=1)
+    mondays = pd.date_range(first_monday, last_monday, freq='7D')
+    iso = mondays.isocalendar()
+    thursdays = mondays + pd.Timedelta(days=3)
+
+    calendar = pd.DataFrame({
+        'ISO_YEAR': iso['year'].to_numpy(dtype=np.int64),
+        'ISO_WEEK': iso['week'].to_numpy(dtype=np.int64),
+        'WEEK_START': mondays.date,
+        'WEEK_END': (mondays + pd.Timedelta(days=6)).date,
+        'MONTH': thursdays.month.to_numpy(dtype=np.int64),
+    }, columns=CALENDAR_COLUMNS)
+    calendar.index = pd.Index(week_key(calendar['ISO_YEAR'], calendar['ISO_WEEK']), name='KEY')
+    return calendar
+
+
+@functools.lru_cache(maxsize=1)
+def _month_index():
+    # (ISO year, month) -> sorted week keys, and ISO year -> number of weeks, computed once from the calendar
+    calendar = get_calendar()
+    months = {group: np.asarray(keys) for group, keys in calendar.groupby(['ISO_YEAR', 'MONTH']).groups.items()}
+    weeks = calendar.groupby('ISO_YEAR')['ISO_WEEK'].max().to_dict()
+    return months, weeks
+
+
+def weeks_in_year(year):
+    """
+    Returns the number of ISO weeks of a year: 53 for the long years (e.g. 2026), 52 otherwise.
+
+    Parameters:
+    - year (int): The ISO year.
+
+    Returns:
+    - int: 52 or 53.
+    """
+    weeks = _month_index()[1].get(int(year))
+    if weeks is None:
+        return datetime.date(int(year), 12, 28).isocalendar()[1]
+    return weeks
+
+
+def week_dates(year, week):
+    """
+    Returns the first (Monday) and last (Sunday) days of an ISO week.
+
+    Parameters:
+    - year (int): The ISO year.
+    - week (int): The ISO week.
+
+    Returns:
+    - tuple: (datetime.date, datetime.date) The Monday and the Sunday of the week.
+    """
+    monday = datetime.date.fromisocalendar(int(year), int(week), 1)
+    return monday, monday + datetime.timedelta(days=6)
+
+
+def iso_week(today=None):
+    """
+    Returns the ISO year and week of a day. In the last days of December or the first days of January,
+    the ISO year can differ from the calendar year.
+
+    Parameters:
+    - today (datetime.date, optional): The day. Defaults to today.
+
+    Returns:
+    - tuple: (int, int) The ISO year and week.
+    """
+    iso = (today or datetime.date.today()).isocalendar()
+    return iso[0], iso[1]
+
+
+def shift_week(year, week, offset):
+    """
+    Moves an ISO week by a number of weeks, across year boundaries and 53-week years.
+
+    Parameters:
+    - year (int): The ISO year.
+    - week (int): The ISO week.
+    - offset (int): The number of weeks (negative to go back).
+
+    Returns:
+    - tuple: (int, int) The ISO year and week.
+    """
+    iso = (datetime.date.fromisocalendar(int(year), int(week), 1) + datetime.timedelta(weeks=offset)).isocalendar()
+    return iso[0], iso[1]
+
+
+def last_weeks(year, week, count):
+    """
+    Lists the count ISO weeks ending with the given one, in chronological order.
+
+    Parameters:
+    - year (int): The ISO year of the last week.
+    - week (int): The last ISO week.
+    - count (int): The number of weeks.
+
+    Returns:
+    - list: (ISO year, ISO week) tuples, oldest first.
+    """
+    return [shift_week(year, week, -offset) for offset in range(count - 1, -1, -1)]
+
+
+def month_week_keys(year, month):
+    """
+    Returns the weeks belonging to a month (see get_calendar), as week keys, with a dictionary lookup.
+
+    Parameters:
+    - year (int): The year.
+    - month (int): The month, from 1 to 12.
+
+    Returns:
+    - numpy.ndarray: The sorted week keys (empty outside the calendar).
+    """
+    return _month_index()[0].get((int(year), int(month)), np.empty(0, dtype=np.int64))
+
+
+def filter_weeks(df, keys):
+    """
+    Keeps the rows whose (YEAR, WEEK) is in a set of week keys, in one vectorized lookup.
+
+    Parameters:
+    - df (pandas.DataFrame): Rows with YEAR and WEEK columns (ISO year and week).
+    - keys (array-like): The week keys to keep (see week_key).
+
+    Returns:
+    - pandas.DataFrame: The matching rows.
+    """
+    if df.empty:
+        return df
+    return df[np.isin(week_key(df['YEAR'], df['WEEK']), np.asarray(keys, dtype=np.int64))]
+
+
+def filter_month(df, year, month):
+    """
+    Keeps the rows of the weeks of a month (see get_calendar).
+
+    Parameters:
+    - df (pandas.DataFrame): Rows with YEAR and WEEK columns (ISO year and week).
+    - year (int): The year.
+    - month (int): The month, from 1 to 12.
+
+    Returns:
+    - pandas.DataFrame: The rows of the month.
+    """
+    return filter_weeks(df, month_week_keys(year, month))
@@ -0,0 +1,247 @@
+#####################################################################
+# =========================== LIBRAIRIES ========================== #
+#####################################################################
+
+import os
+import sys
+import threading
+import pandas as pd
+from imotion_storage import DATA_FOLDER, normalize_time_frame, load_all_histories, get_time_store, get_table_store, path_lock
+
+
+#####################################################################
+# =========================== CONSTANTS =========================== #
+#####################################################################
+
+CATALOG_FILE = "STUDY_CATALOG.csv"
+STUDY_FILE = "STUDY.csv"
+CATALOG_COLUMNS = ['STUDY', 'STATUS', 'FIRST_YEAR', 'FIRST_WEEK', 'LAST_YEAR', 'LAST_WEEK', 'ARCS']
+ACTIVE = "active"
+ARCHIVED = "archived"
+# Separator of the ARCs in the ARCS column (the CSV files are ';' separated)
+ARC_SEPARATOR = ","
+
+
+#####################################################################
+# ===================== ASSISTANCE FUNCTIONS ====================== #
+#####################################################################
+
+def _split_arcs(value):
+    if not isinstance(value, str) or not value:
+        return set()
+    return set(value.split(ARC_SEPARATOR))
+
+
+def _join_arcs(arcs):
+    return ARC_SEPARATOR.join(sorted(str(arc) for arc in arcs))
+
+
+def _studies_of_study_file(store):
+    # Studies currently listed in STUDY.csv, i.e. the active ones
+    if not store.exists(STUDY_FILE):
+        return set()
+    return set(store.read(STUDY_FILE, sep=';', encoding='utf-8', copy=False)['STUDY'].dropna().astype(str))
+
+
+def summarize_rows(arc, df_rows):
+    """
+    Summarizes saved time rows per study: first and last (year, week) and the ARCs.
+
+    Parameters:
+    - arc (str): The ARC identifier.
+    - df_rows (pandas.DataFrame): Time rows of this ARC.
+
+    Returns:
+    - pandas.DataFrame: One row per study with STUDY, FIRST_YEAR, FIRST_WEEK, LAST_YEAR, LAST_WEEK and ARCS.
+    """
+    df = normalize_time_frame(df_rows)[['STUDY', 'YEAR', 'WEEK']].dropna(subset=['STUDY'])
+    if df.empty:
+        return pd.DataFrame(columns=[col for col in CATALOG_COLUMNS if col != 'STATUS'])
+    df = df.assign(STUDY=df['STUDY'].astype(str), KEY=df['YEAR'].astype(int) * 100 + df['WEEK'].astype(int))
+    grouped = df.groupby('STUDY')['KEY'].agg(['min', 'max'])
+    return pd.DataFrame({'STUDY': grouped.index,
+                         'FIRST_YEAR': grouped['min'].to_numpy() // 100, 'FIRST_WEEK': grouped['min'].to_numpy() % 100,
+                         'LAST_YEAR': grouped['max'].to_numpy() // 100, 'LAST_WEEK': grouped['max'].to_numpy() % 100,
+                         'ARCS': str(arc)})
+
+
+def merge_catalog(catalog, summary, active_studies=None):
+    """
+    Merges per-study summaries into the catalog: the ranges are widened, the ARCs are added and the new studies are
+    appended. The status is recomputed when the set of active studies is given.
+
+    Parameters:
+    - catalog (pandas.DataFrame or None): The current catalog.
+    - summary (pandas.DataFrame): Summaries as returned by summarize_rows (several rows per study are allowed).
+    - active_studies (set, optional): The studies of STUDY.csv. Defaults to None (status kept, new studies active).
+
+    Returns:
+    - pandas.DataFrame: The new catalog, sorted by study.
+    """
+    catalog = pd.DataFrame(columns=CATALOG_COLUMNS) if catalog is None else catalog
+    entries = {row['STUDY']: row for row in catalog[CATALOG_COLUMNS].to_dict('records')}
+
+    for row in summary.to_dict('records'):
+        entry = entries.setdefault(row['STUDY'], {'STUDY': row['STUDY'], 'STATUS': ACTIVE, 'FIRST_YEAR': None, 'FIRST_WEEK': None,
+                                                  'LAST_YEAR': None, 'LAST_WEEK': None, 'ARCS': ""})
+        first, last = (row['FIRST_YEAR'], row['FIRST_WEEK']), (row['LAST_YEAR'], row['LAST_WEEK'])
+        if pd.isna(entry['FIRST_YEAR']) or first < (entry['FIRST_YEAR'], entry['FIRST_WEEK']):
+            entry['FIRST_YEAR'], entry['FIRST_WEEK'] = first
+        if pd.isna(entry['LAST_YEAR']) or last > (entry['LAST_YEAR'], entry['LAST_WEEK']):
+            entry['LAST_YEAR'], entry['LAST_WEEK'] = last
+        entry['ARCS'] = _join_arcs(_split_arcs(entry['ARCS']) | _split_arcs(row['ARCS']))
+
+    if active_studies is not None:
+        for study in active_studies:
+            entries.setdefault(study, {'STUDY': study, 'FIRST_YEAR': None, 'FIRST_WEEK': None, 'LAST_YEAR': None, 'LAST_WEEK': None, 'ARCS': ""})
+        for study, entry in entries.items():
+            entry['STATUS'] = ACTIVE if study in active_studies else ARCHIVED
+
+    merged = pd.DataFrame(list(entries.values()), columns=CATALOG_COLUMNS).sort_values('STUDY', kind='stable')
+    for col in ['FIRST_YEAR', 'FIRST_WEEK', 'LAST_YEAR', 'LAST_WEEK']:
+        merged[col] = pd.to_numeric(merged[col]).astype('Int64')
+    return merged.reset_index(drop=True)
+
+
+# ========================================================================================================================================
+# INCREMENTAL UPDATE
+def update_study_catalog(arc, df_rows, folder=DATA_FOLDER):
+    """
+    Updates the catalog after a save of an ARC: the saved studies get their range widened and the ARC added.
+    A range never shrinks (a study removed from a week keeps its first and last weeks until a rebuild).
+
+    Parameters:
+    - arc (str): The ARC identifier.
+    - df_rows (pandas.DataFrame): The saved rows.
+    - folder (str, optional): The data folder. Defaults to "imotion".
+
+    Returns:
+    None
+    """
+    summary = summarize_rows(arc, df_rows)
+    if summary.empty:
+        return
+
+    def merge(catalog):
+        merged = merge_catalog(catalog, summary)
+        if catalog is not None and merged.astype(str).equals(merge_catalog(catalog, summary.iloc[:0]).astype(str)):
+            return None  # Nothing new (the usual case when a week is saved again): the file is not rewritten
+        return merged
+
+    store = get_table_store(folder=folder)
+    # Checked under the catalog lock: a rebuild running meanwhile finishes first, then this save is merged into it
+    with path_lock(store.path(CATALOG_FILE)):
+        if not store.exists(CATALOG_FILE):
+            # Never built: the first read builds it completely from the raw histories
+            return
+        store.update(CATALOG_FILE, merge)
+
+
+def sync_study_status(df_study, folder=DATA_FOLDER):
+    """
+    Recomputes the active/archived status of the catalog after STUDY.csv was written (study added, archived or reassigned).
+
+    Parameters:
+    - df_study (pandas.DataFrame): The saved content of STUDY.csv.
+    - folder (str, optional): The data folder. Defaults to "imotion".
+
+    Returns:
+    None
+    """
+    store = get_table_store(folder=folder)
+    active_studies = set(df_study['STUDY'].dropna().astype(str))
+    with path_lock(store.path(CATALOG_FILE)):
+        if not store.exists(CATALOG_FILE):
+            return
+        store.update(CATALOG_FILE, lambda catalog: merge_catalog(catalog, pd.DataFrame(columns=CATALOG_COLUMNS), active_studies))
+
+
+# ========================================================================================================================================
+# READING
+# Module-level cache: the sorted study names of each version of the catalog, per backend and data folder
+_NAMES = {}
+_NAMES_LOCK = threading.Lock()
+
+
+def _ensure_catalog(store, folder):
+    # Builds the catalog on the first read; another session may have built it while this one waited for the lock
+    if not store.exists(CATALOG_FILE):
+        with path_lock(store.path(CATALOG_FILE)):
+            if not store.exists(CATALOG_FILE):
+                rebuild_study_catalog(folder)
+
+
+def load_study_catalog(folder=DATA_FOLDER):
+    """
+    Loads the study catalog, building it from the raw histories if it does not exist yet.
+
+    Parameters:
+    - folder (str, optional): The data folder. Defaults to "imotion".
+
+    Returns:
+    - pandas.DataFrame: One row per study with the CATALOG_COLUMNS columns (shared cached DataFrame: do not modify).
+    """
+    store = get_table_store(folder=folder)
+    _ensure_catalog(store, folder)
+    return store.read(CATALOG_FILE, sep=';', encoding='utf-8', copy=False)
+
+
+def catalog_study_names(folder=DATA_FOLDER):
+    """
+    Returns the sorted names of every study of the catalog (active and archived). The list is computed once
+    per version of the catalog; the other calls only check the version.
+
+    Parameters:
+    - folder (str, optional): The data folder. Defaults to "imotion".
+
+    Returns:
+    - list: The study names.
+    """
+    store = get_table_store(folder=folder)
+    _ensure_catalog(store, folder)
+    key = (store.name, os.path.abspath(store.folder))
+    version = store.version(CATALOG_FILE)
+    with _NAMES_LOCK:
+        cached = _NAMES.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+    names = sorted(load_study_catalog(folder)['STUDY'].dropna().astype(str))
+    with _NAMES_LOCK:
+        _NAMES[key] = (version, names)
+    return names
+
+
+# ========================================================================================================================================
+# REBUILD
+def rebuild_study_catalog(folder=DATA_FOLDER):
+    """
+    Regenerates the whole catalog from the raw histories and STUDY.csv, which remain the source of truth.
+    Runs under the catalog lock, so that the saves made meanwhile are merged after the new catalog is written.
+
+    Parameters:
+    - folder (str, optional): The data folder. Defaults to "imotion".
+
+    Returns:
+    - pandas.DataFrame: The new catalog.
+    """
+    store = get_table_store(folder=folder)
+    with path_lock(store.path(CATALOG_FILE)):
+        facts, _ = load_all_histories(store=get_time_store(folder=folder))
+        summaries = [summarize_rows(arc, rows) for arc, rows in facts.groupby('ARC')] if not facts.empty else []
+        summary = pd.concat(summaries, ignore_index=True) if summaries else pd.DataFrame(columns=CATALOG_COLUMNS)
+        catalog = merge_catalog(None, summary, _studies_of_study_file(store))
+        store.write(CATALOG_FILE, catalog, sep=';', encoding='utf-8')
+    return catalog
+
+
+#####################################################################
+# ========================== ALGO LAUNCH ========================== #
+#####################################################################
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "rebuild":
+        catalog = rebuild_study_catalog()
+        print(f"{CATALOG_FILE} : {len(catalog)} études ({int((catalog['STATUS'] == ACTIVE).sum())} actives)")
+    else:
+        print("Usage : python imotion_catalog.py rebuild")
@@ -0,0 +1,160 @@
+#####################################################################
+# =========================== LIBRAIRIES ========================== #
+#####################################################################
+
+import os
+import time
+import hashlib
+import logging
+from io import BytesIO
+import pandas as pd
+from imotion_cache import LRUCache
+from imotion_profiling import record_span, profiling_enabled
+
+
+#####################################################################
+# =========================== CONSTANTS =========================== #
+#####################################################################
+
+CHART_ENGINE_ENV_VAR = "IMOTION_CHART_ENGINE"
+# "altair": the aggregated table is sent to the browser and drawn there; "matplotlib": a PNG rendered on the server
+CHART_ENGINES = ("altair", "matplotlib")
+DEFAULT_CHART_ENGINE = "altair"
+CHART_CACHE_SIZE_ENV_VAR = "IMOTION_CHART_CACHE_MB"
+DEFAULT_CHART_CACHE_SIZE_MB = 64
+# Same rendering options as st.pyplot, so that a cached image looks exactly like a direct rendering
+SAVEFIG_OPTIONS = {"bbox_inches": "tight", "dpi": 200}
+RECENT_REPORTS_SIZE = 50
+
+logger = logging.getLogger("imotion.charts")
+
+
+#####################################################################
+# ========================= CHART CACHE =========================== #
+#####################################################################
+
+# Module-level cache shared by every session and rerun of the process (see imotion_cache)
+_CHART_CACHE = LRUCache(int(os.getenv(CHART_CACHE_SIZE_ENV_VAR, DEFAULT_CHART_CACHE_SIZE_MB)) * 1024 * 1024)
+_RECENT_REPORTS = []
+
+
+def chart_engine():
+    """
+    Returns the chart engine selected with IMOTION_CHART_ENGINE.
+
+    Returns:
+    - str: "altair" or "matplotlib".
+
+    Raises:
+    - ValueError: If the variable names an unknown engine.
+    """
+    engine = os.getenv(CHART_ENGINE_ENV_VAR, DEFAULT_CHART_ENGINE).lower()
+    if engine not in CHART_ENGINES:
+        raise ValueError(f"Moteur de graphiques inconnu : {engine} (attendu : {', '.join(CHART_ENGINES)})")
+    return engine
+
+
+def _record_report(report):
+    logger.info("%s : %s en %.1f ms (%s octets)", report['chart'], "cache" if report['hit'] else report['engine'],
+                report['seconds'] * 1000, "?" if report['bytes'] is None else report['bytes'])
+    _RECENT_REPORTS.append(report)
+    del _RECENT_REPORTS[:-RECENT_REPORTS_SIZE]
+    record_span(f"render:{report['chart']}", report['seconds'], bytes=report['bytes'], engine=report['engine'], hit=report['hit'])
+
+
+def chart_key(name, frames, params):
+    """
+    Computes the cache key of a chart: a content hash of its aggregated input and of its parameters.
+
+    Parameters:
+    - name (str): The name of the chart function.
+    - frames (list): The pandas objects the chart is drawn from (index and column names included).
+    - params (dict): Every other value that changes the image (titles, labels, mode, current week...).
+
+    Returns:
+    - str: A hexadecimal SHA-1 digest.
+    """
+    digest = hashlib.sha1(name.encode('utf-8'))
+    for frame in frames:
+        if isinstance(frame, pd.DataFrame):
+            digest.update(repr(list(frame.columns)).encode('utf-8'))
+        digest.update(repr(getattr(frame, 'name', None)).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(frame, index=True).values.tobytes())
+    digest.update(repr(sorted(params.items())).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def render_chart(name, render, frames, params, image_format="png"):
+    """
+    Returns the rendered image of a chart, drawing it only if the same input and parameters were not rendered before.
+
+    Parameters:
+    - name (str): The name of the chart function.
+    - render (callable): Function without arguments returning the matplotlib Figure; only called on a miss.
+    - frames (list): The pandas objects the chart is drawn from.
+    - params (dict): The other values that change the image.
+    - image_format (str, optional): "png" or "svg". Defaults to "png".
+
+    Returns:
+    - tuple: (bytes, dict) The image and the report of the call: 'chart', 'engine', 'hit', 'seconds' and 'bytes'.
+    """
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    key = (chart_key(name, frames, params), image_format)
+    image = _CHART_CACHE.get(key)
+    hit = image is not None
+    if not hit:
+        fig = render()
+        buffer = BytesIO()
+        fig.savefig(buffer, format=image_format, **SAVEFIG_OPTIONS)
+        # The figure is no longer needed once rendered: free it instead of keeping it in pyplot
+        plt.close(fig)
+        image = buffer.getvalue()
+        _CHART_CACHE.put(key, image)
+
+    report = {'chart': name, 'engine': "matplotlib", 'hit': hit, 'seconds': time.perf_counter() - start, 'bytes': len(image)}
+    _record_report(report)
+    return image, report
+
+
+def build_altair_chart(name, build):
+    """
+    Builds an Altair chart, drawn by the browser from the aggregated table embedded in its specification:
+    the server only serializes that table, there is no image to render or to cache.
+
+    Parameters:
+    - name (str): The name of the chart function.
+    - build (callable): Function without arguments returning the altair Chart.
+
+    Returns:
+    - tuple: (altair.Chart, dict) The chart and the report of the call: 'chart', 'engine', 'hit' (always False),
+      'seconds' and 'bytes' (size of the JSON specification sent to the browser, only measured when profiling
+      is enabled since it serializes the specification a second time; None otherwise).
+    """
+    start = time.perf_counter()
+    chart = build()
+    report = {'chart': name, 'engine': "altair", 'hit': False, 'seconds': time.perf_counter() - start,
+              'bytes': len(chart.to_json()) if profiling_enabled() else None}
+    _record_report(report)
+    return chart, report
+
+
+def recent_chart_reports():
+    """
+    Returns the reports of the last chart calls of the process, oldest first.
+
+    Returns:
+    - list: Dictionaries with 'chart', 'engine', 'hit', 'seconds' and 'bytes'.
+    """
+    return list(_RECENT_REPORTS)
+
+
+def chart_cache_stats():
+    """
+    Returns the counters of the chart cache.
+
+    Returns:
+    - dict: hits, misses, evictions, entries, bytes and max_bytes.
+    """
+    return _CHART_CACHE.stats()
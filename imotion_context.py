@@ -0,0 +1,148 @@
+#####################################################################
+# =========================== LIBRAIRIES ========================== #
+#####################################################################
+
+import collections
+import pandas as pd
+from imotion_storage import CATEGORIES, get_time_store, get_table_store
+from imotion_assignments import STUDY_FILE, get_assignment_index
+from imotion_profiling import span, measure_result
+
+
+#####################################################################
+# ======================== REQUEST CONTEXT ======================== #
+#####################################################################
+
+class RequestContext:
+    """
+    The data of one rerun (or of one batch run) for one ARC. Each shared file, the history of the ARC,
+    its Ongoing file and STUDY.csv, is loaded at most once, on first use, and the callers get filtered
+    copies of it. The loads are counted per file in `reads`, so that a test can check that a rerun
+    reads every file at most once.
+
+    A context must not outlive the rerun that created it: it never sees the writes of other sessions.
+    """
+
+    def __init__(self, arc, time_store=None, table_store=None):
+        self.arc = arc
+        self.time_store = time_store or get_time_store()
+        self.table_store = table_store or get_table_store()
+        self.time_file = f"Time_{arc}.csv"
+        self.ongoing_file = f"Ongoing_{arc}.csv"
+        self.reads = collections.Counter()
+        self._loaded = {}
+
+    def _load(self, file_name, loader):
+        if file_name not in self._loaded:
+            self.reads[file_name] += 1
+            with span(f"read:{file_name}") as current:
+                self._loaded[file_name] = loader()
+                current.record(**measure_result(self._loaded[file_name]))
+        return self._loaded[file_name]
+
+    # ====================================================================================================================================
+    # TIME HISTORY
+    def history(self):
+        """
+        Returns the whole history of the ARC (empty with the CATEGORIES columns if it has none yet).
+
+        Returns:
+        - pandas.DataFrame: The shared DataFrame of this context (do not modify).
+        """
+        def load():
+            try:
+                return self.time_store.load(self.arc)
+            except FileNotFoundError:
+                return pd.DataFrame(columns=CATEGORIES)
+        return self._load(self.time_file, load)
+
+    def time_rows(self, week, year=None):
+        """
+        Returns the history rows of a week, in every year or in one year.
+
+        Parameters:
+        - week (int): The week number.
+        - year (int, optional): The year. Defaults to every year.
+
+        Returns:
+        - pandas.DataFrame: A new DataFrame.
+        """
+        df = self.history()
+        mask = df['WEEK'] == week
+        if year is not None:
+            mask &= df['YEAR'] == year
+        return df[mask].copy()
+
+    # ====================================================================================================================================
+    # ONGOING FILE
+    def ongoing(self):
+        """
+        Returns the content of the Ongoing file of the ARC.
+
+        Returns:
+        - pandas.DataFrame or None: The shared DataFrame of this context (do not modify), None if the file does not exist.
+        """
+        def load():
+            if not self.table_store.exists(self.ongoing_file):
+                return None
+            return self.table_store.read(self.ongoing_file, sep=';', encoding='utf-8', copy=False)
+        return self._load(self.ongoing_file, load)
+
+    def weekly_rows(self, week):
+        """
+        Returns the rows of a week of the Ongoing file.
+
+        Parameters:
+        - week (int): The week number.
+
+        Returns:
+        - pandas.DataFrame: A new DataFrame (empty if the file does not exist).
+        """
+        df = self.ongoing()
+        if df is None:
+            return pd.DataFrame()
+        return df[df['WEEK'] == week].copy()
+
+    def set_ongoing(self, df):
+        """
+        Replaces the Ongoing file content known by the context with the content just written, without reading it back.
+        The read-modify-write that produced it counts as the read of the file.
+
+        Parameters:
+        - df (pandas.DataFrame or None): The content of the file after the write.
+
+        Returns:
+        None
+        """
+        if self.ongoing_file not in self._loaded:
+            self.reads[self.ongoing_file] += 1
+        self._loaded[self.ongoing_file] = df
+
+    # ====================================================================================================================================
+    # STUDY ASSIGNMENTS
+    def assignment_index(self):
+        """
+        Returns the assignment index of STUDY.csv, resolved once for the context.
+
+        Returns:
+        - StudyAssignmentIndex: The index.
+        """
+        return self._load(STUDY_FILE, lambda: get_assignment_index(self.table_store))
+
+    def assigned_studies(self):
+        """
+        Returns the studies assigned to the ARC, in the order of STUDY.csv.
+
+        Returns:
+        - list: The study names.
+        """
+        return self.assignment_index().studies_of(self.arc)
+
+    def assigned_roles(self):
+        """
+        Returns the rows of STUDY.csv assigned to the ARC, with a 'ROLE' column.
+
+        Returns:
+        - pandas.DataFrame: A new DataFrame.
+        """
+        return self.assignment_index().frame_of(self.arc)
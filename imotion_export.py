@@ -0,0 +1,220 @@
+#####################################################################
+# =========================== LIBRAIRIES ========================== #
+#####################################################################
+
+import io
+import os
+import re
+import sys
+import zipfile
+import argparse
+import pandas as pd
+from imotion_storage import CATEGORIES, DATA_FOLDER, get_time_store
+
+
+#####################################################################
+# =========================== CONSTANTS =========================== #
+#####################################################################
+
+EXPORT_COLUMNS = ['ARC'] + CATEGORIES
+EXPORT_FORMATS = ("xlsx", "zip")
+# Excel limits: rows per sheet (header included) and characters per sheet name
+XLSX_MAX_ROWS = 1048576
+XLSX_MAX_SHEET_NAME = 31
+CSV_SEPARATOR = ';'
+# Rows read at a time from a CSV history (the Parquet and SQLite stores are read one year at a time)
+EXPORT_CHUNK_ROWS = 50000
+
+
+#####################################################################
+# ===================== ASSISTANCE FUNCTIONS ====================== #
+#####################################################################
+
+def iter_history_chunks(arcs=None, years=None, studies=None, store=None):
+    """
+    Yields the history one chunk at a time, so that at most one chunk is held in memory by the export,
+    whatever the number of years stored. A chunk is one year of one ARC for the Parquet and SQLite stores,
+    and at most EXPORT_CHUNK_ROWS rows of the CSV file of one ARC for the CSV store.
+
+    Parameters:
+    - arcs (list, optional): The ARCs to export. Defaults to every ARC with a history.
+    - years (tuple, optional): (first, last) years, inclusive. Defaults to every year.
+    - studies (list, optional): The studies to export. Defaults to every study.
+    - store (CsvTimeStore, ParquetTimeStore or SqliteTimeStore, optional): The time store. Defaults to the configured one.
+
+    Yields:
+    - tuple: (arc, pandas.DataFrame) The rows of one chunk of one ARC, with the EXPORT_COLUMNS columns.
+    """
+    store = store or get_time_store()
+    arcs = sorted(store.list_arcs()) if arcs is None else list(arcs)
+    # A single study is filtered by the backend (partition scan or SQL), several studies after loading
+    single_study = studies[0] if studies is not None and len(studies) == 1 else None
+
+    for arc in arcs:
+        try:
+            if hasattr(store, 'iter_chunks'):
+                # CSV files are read in chunks of rows, without going through the shared read cache
+                chunks = store.iter_chunks(arc, EXPORT_CHUNK_ROWS)
+            else:
+                chunks = (store.load(arc, year=year, study=single_study)
+                          for year in ([None] if years is None else range(years[0], years[1] + 1)))
+            for chunk in chunks:
+                if studies is not None:
+                    chunk = chunk[chunk['STUDY'].isin(studies)]
+                if years is not None:
+                    chunk = chunk[pd.to_numeric(chunk['YEAR'], errors='coerce').between(years[0], years[1])]
+                if chunk.empty:
+                    continue
+                chunk = chunk.sort_values(['YEAR', 'WEEK', 'STUDY'], kind='stable')
+                chunk.insert(0, 'ARC', arc)
+                yield arc, chunk[EXPORT_COLUMNS]
+        except FileNotFoundError:
+            continue
+
+
+def sheet_name(arc, part, used_names):
+    """
+    Builds a valid and unique Excel sheet name for an ARC (continuation sheets are suffixed with their number).
+
+    Parameters:
+    - arc (str): The ARC identifier.
+    - part (int): The number of the sheet of this ARC, starting at 1.
+    - used_names (set): The names already used in the workbook (lowercase); the new name is added to it.
+
+    Returns:
+    - str: The sheet name.
+    """
+    suffix = "" if part == 1 else f" ({part})"
+    base = re.sub(r"[\[\]:*?/\\]", "_", str(arc)).strip("'") or "ARC"
+    name = base[:XLSX_MAX_SHEET_NAME - len(suffix)] + suffix
+    counter = 2
+    while name.lower() in used_names:
+        extra = f"~{counter}"
+        name = base[:XLSX_MAX_SHEET_NAME - len(suffix) - len(extra)] + extra + suffix
+        counter += 1
+    used_names.add(name.lower())
+    return name
+
+
+def _cell_rows(chunk):
+    # NaN has no Excel representation: written as an empty cell
+    return chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None)
+
+
+def export_xlsx(output, arcs=None, years=None, studies=None, store=None):
+    """
+    Writes the history into an xlsx workbook with one sheet per ARC, in constant-memory mode: xlsxwriter flushes
+    each row to disk as soon as the next one is written, so memory does not grow with the number of rows.
+
+    Parameters:
+    - output (str): The path of the workbook.
+    - arcs, years, studies, store: The filters and the time store (see iter_history_chunks).
+
+    Returns:
+    - dict: 'rows' and 'sheets' written.
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    header_format = workbook.add_format({'bold': True})
+    used_names = set()
+    rows, sheets = 0, 0
+    worksheet, current_arc, part, row_index = None, None, 0, 0
+    try:
+        for arc, chunk in iter_history_chunks(arcs, years, studies, store):
+            for values in _cell_rows(chunk):
+                # New sheet for a new ARC, or when the current one is full
+                if arc != current_arc or row_index >= XLSX_MAX_ROWS:
+                    part = part + 1 if arc == current_arc else 1
+                    current_arc = arc
+                    worksheet = workbook.add_worksheet(sheet_name(arc, part, used_names))
+                    worksheet.write_row(0, 0, EXPORT_COLUMNS, header_format)
+                    row_index = 1
+                    sheets += 1
+                worksheet.write_row(row_index, 0, values)
+                row_index += 1
+                rows += 1
+        if sheets == 0:
+            workbook.add_worksheet("Export").write_row(0, 0, EXPORT_COLUMNS, header_format)
+    finally:
+        workbook.close()
+    return {'rows': rows, 'sheets': sheets}
+
+
+def export_csv_zip(output, arcs=None, years=None, studies=None, store=None):
+    """
+    Writes the history into a zip archive with one CSV file per ARC (';' separated, UTF-8), each chunk being
+    compressed as soon as it is written.
+
+    Parameters:
+    - output (str): The path of the archive.
+    - arcs, years, studies, store: The filters and the time store (see iter_history_chunks).
+
+    Returns:
+    - dict: 'rows' and 'files' written.
+    """
+    rows, files = 0, 0
+    current_arc, member = None, None
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        try:
+            for arc, chunk in iter_history_chunks(arcs, years, studies, store):
+                if arc != current_arc:
+                    if member is not None:
+                        member.close()
+                    member = io.TextIOWrapper(archive.open(f"Time_{arc}.csv", 'w'), encoding='utf-8', newline='')
+                    current_arc = arc
+                    files += 1
+                    chunk.to_csv(member, sep=CSV_SEPARATOR, index=False)
+                else:
+                    chunk.to_csv(member, sep=CSV_SEPARATOR, index=False, header=False)
+                rows += len(chunk)
+        finally:
+            if member is not None:
+                member.close()
+    return {'rows': rows, 'files': files}
+
+
+def export_history(output, export_format="xlsx", arcs=None, years=None, studies=None, store=None):
+    """
+    Exports the history of the ARCs, filtered on a year range, ARCs and studies, into an xlsx workbook or a zip of CSV files.
+
+    Parameters:
+    - output (str): The path of the file to write.
+    - export_format (str, optional): "xlsx" or "zip". Defaults to "xlsx".
+    - arcs, years, studies, store: The filters and the time store (see iter_history_chunks).
+
+    Returns:
+    - dict: The number of rows and of sheets or files written.
+
+    Raises:
+    - ValueError: If the format is unknown.
+    """
+    if export_format == "xlsx":
+        return export_xlsx(output, arcs, years, studies, store)
+    if export_format == "zip":
+        return export_csv_zip(output, arcs, years, studies, store)
+    raise ValueError(f"Format d'export inconnu : {export_format} (attendu : {', '.join(EXPORT_FORMATS)})")
+
+
+#####################################################################
+# ========================== ALGO LAUNCH ========================== #
+#####################################################################
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export de l'historique des ARCs (xlsx ou zip de CSV).")
+    parser.add_argument("output", help="Fichier à écrire (.xlsx ou .zip)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, help="Format (déduit de l'extension par défaut)")
+    parser.add_argument("--years", nargs=2, type=int, metavar=("DEBUT", "FIN"), help="Années incluses")
+    parser.add_argument("--arc", action="append", help="ARC à exporter (répétable)")
+    parser.add_argument("--study", action="append", help="Étude à exporter (répétable)")
+    parser.add_argument("--folder", default=DATA_FOLDER, help="Dossier des données")
+    args = parser.parse_args()
+
+    export_format = args.format or os.path.splitext(args.output)[1].lstrip('.').lower()
+    try:
+        report = export_history(args.output, export_format, arcs=args.arc, years=args.years, studies=args.study,
+                                store=get_time_store(folder=args.folder))
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    print(f"{args.output} : " + ", ".join(f"{count} {label}" for label, count in report.items()))
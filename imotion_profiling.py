@@ -0,0 +1,332 @@
+#####################################################################
+# =========================== LIBRAIRIES ========================== #
+#####################################################################
+
+import os
+import sys
+import json
+import time
+import uuid
+import inspect
+import datetime
+import functools
+import statistics
+import threading
+import contextlib
+import contextvars
+
+
+#####################################################################
+# =========================== CONSTANTS =========================== #
+#####################################################################
+
+# "1" shows the profiling panel in the sidebar of both apps
+DEBUG_ENV_VAR = "IMOTION_DEBUG"
+# Path of the JSON lines file receiving one line per profiled rerun (no file by default)
+PROFILE_LOG_ENV_VAR = "IMOTION_PROFILE_LOG"
+# Number of chart reports shown in the debug panel
+PANEL_CHART_REPORTS = 10
+
+
+#####################################################################
+# ============================ TRACES ============================= #
+#####################################################################
+
+class Trace:
+    """
+    The timing spans of one rerun, in the order they started. Each span is a dictionary with 'name',
+    'depth' (nesting level), 'seconds' and optionally 'rows', 'bytes' and other attributes.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.id = uuid.uuid4().hex[:12]
+        self.started = datetime.datetime.now().isoformat(timespec='milliseconds')
+        self.start = time.perf_counter()
+        self.seconds = None
+        self.spans = []
+        self.depth = 0
+
+    def to_record(self):
+        return {'ts': self.started, 'app': self.app, 'rerun': self.id, 'seconds': self.seconds, 'spans': self.spans}
+
+
+# The trace of the rerun running in this thread (Streamlit runs each rerun in its own thread): None when profiling is off
+_CURRENT = contextvars.ContextVar("imotion_trace", default=None)
+_LOG_LOCK = threading.Lock()
+
+
+def profiling_enabled():
+    """
+    Returns whether the reruns are profiled: when the debug panel or the JSON lines log is enabled.
+
+    Returns:
+    - bool: True if IMOTION_DEBUG is "1" or IMOTION_PROFILE_LOG is set.
+    """
+    return os.getenv(DEBUG_ENV_VAR) == "1" or bool(os.getenv(PROFILE_LOG_ENV_VAR))
+
+
+def start_rerun(app):
+    """
+    Starts the trace of a rerun, if profiling is enabled. Spans recorded in this thread until finish_rerun belong to it.
+
+    Parameters:
+    - app (str): The name of the app ("employee" or "manager").
+
+    Returns:
+    - Trace or None: The trace, None if profiling is disabled.
+    """
+    trace = Trace(app) if profiling_enabled() else None
+    _CURRENT.set(trace)
+    return trace
+
+
+def finish_rerun(trace):
+    """
+    Closes the trace of a rerun and appends it as one JSON line to the IMOTION_PROFILE_LOG file, if set.
+
+    Parameters:
+    - trace (Trace or None): The trace returned by start_rerun.
+
+    Returns:
+    - Trace or None: The closed trace.
+    """
+    if trace is None:
+        return None
+    trace.seconds = time.perf_counter() - trace.start
+    _CURRENT.set(None)
+    log_path = os.getenv(PROFILE_LOG_ENV_VAR)
+    if log_path:
+        line = json.dumps(trace.to_record(), ensure_ascii=False, default=str)
+        try:
+            with _LOG_LOCK, open(log_path, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+        except OSError as e:
+            print(f"Erreur lors de l'écriture du journal de profilage {log_path} : {e}")
+    return trace
+
+
+def measure_result(result):
+    """
+    Returns the rows and bytes of a value returned by a profiled function: the length and the shallow
+    memory usage of a DataFrame, the length of bytes, the length of a list or a dict.
+
+    Parameters:
+    - result: The returned value.
+
+    Returns:
+    - dict: 'rows' and/or 'bytes', empty for other values.
+    """
+    if hasattr(result, 'memory_usage') and hasattr(result, 'shape'):
+        return {'rows': int(result.shape[0]), 'bytes': int(result.memory_usage(index=True, deep=False).sum())}
+    if isinstance(result, (bytes, bytearray)):
+        return {'bytes': len(result)}
+    if isinstance(result, (list, dict, set, tuple)):
+        return {'rows': len(result)}
+    return {}
+
+
+class _Span(dict):
+    def record(self, **attributes):
+        """
+        Adds attributes (e.g. rows, bytes) to the span.
+        """
+        self.update({key: value for key, value in attributes.items() if value is not None})
+
+
+@contextlib.contextmanager
+def span(name, **attributes):
+    """
+    Times a block as a named span of the current rerun. Nothing is recorded when profiling is disabled.
+
+    Parameters:
+    - name (str): The name of the span, e.g. "load:time" or "save:week".
+    - **attributes: Attributes recorded with the span (rows, bytes, arc, ...).
+
+    Yields:
+    - dict: The span, whose record(**attributes) method adds attributes from inside the block.
+    """
+    trace = _CURRENT.get()
+    current = _Span(name=name, depth=0 if trace is None else trace.depth)
+    current.record(**attributes)
+    if trace is None:
+        yield current
+        return
+    trace.spans.append(current)
+    trace.depth += 1
+    start = time.perf_counter()
+    try:
+        yield current
+    finally:
+        current['seconds'] = time.perf_counter() - start
+        trace.depth -= 1
+
+
+def record_span(name, seconds, **attributes):
+    """
+    Adds an already timed span to the current rerun (e.g. the report of a chart).
+
+    Parameters:
+    - name (str): The name of the span.
+    - seconds (float): Its duration.
+    - **attributes: Attributes recorded with the span.
+
+    Returns:
+    None
+    """
+    trace = _CURRENT.get()
+    if trace is not None:
+        current = _Span(name=name, depth=trace.depth, seconds=seconds)
+        current.record(**attributes)
+        trace.spans.append(current)
+
+
+def profiled(name, argument=None):
+    """
+    Decorator timing every call of a function as a span, with the rows and bytes of its result, or of one of its
+    arguments for the functions returning nothing (e.g. the DataFrame written by a save).
+
+    Parameters:
+    - name (str): The name of the span.
+    - argument (str, optional): The name of the parameter to measure instead of the result. Defaults to None.
+
+    Returns:
+    - callable: The decorator.
+    """
+    def decorator(function):
+        signature = inspect.signature(function) if argument is not None else None
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _CURRENT.get() is None:
+                return function(*args, **kwargs)
+            with span(name) as current:
+                if signature is not None:
+                    current.record(**measure_result(signature.bind_partial(*args, **kwargs).arguments.get(argument)))
+                result = function(*args, **kwargs)
+                if signature is None:
+                    current.record(**measure_result(result))
+                return result
+        return wrapper
+    return decorator
+
+
+@contextlib.contextmanager
+def rerun_trace(app):
+    """
+    Profiles a rerun: starts its trace, then closes and logs it when the block exits, including through
+    st.rerun() or an exception.
+
+    Parameters:
+    - app (str): The name of the app ("employee" or "manager").
+
+    Yields:
+    - Trace or None: The trace of the rerun, None if profiling is disabled.
+    """
+    trace = start_rerun(app)
+    try:
+        yield trace
+    finally:
+        finish_rerun(trace)
+
+
+def span_rows(trace):
+    """
+    Returns the spans of a trace as table rows for the debug panel.
+
+    Parameters:
+    - trace (Trace): The trace.
+
+    Returns:
+    - list: Dictionaries with 'span' (the name indented by the nesting level), 'ms', 'rows' and 'bytes'.
+    """
+    return [{'span': "\u00a0\u00a0" * item['depth'] + item['name'], 'ms': round(item.get('seconds', 0.0) * 1000, 1),
+             'rows': item.get('rows'), 'bytes': item.get('bytes')}
+            for item in trace.spans]
+
+
+#####################################################################
+# ========================== DEBUG PANEL ========================== #
+#####################################################################
+
+def show_profiling_panel(trace):
+    """
+    Displays the spans of the rerun, the last chart reports and the cache counters in the sidebar,
+    when IMOTION_DEBUG is "1".
+
+    Parameters:
+    - trace (Trace or None): The closed trace of the rerun.
+
+    Returns:
+    None
+    """
+    if trace is None or os.getenv(DEBUG_ENV_VAR) != "1":
+        return
+    import streamlit as st
+    import pandas as pd
+    from imotion_cache import cache_stats
+    from imotion_charts import recent_chart_reports, chart_cache_stats
+
+    with st.sidebar.expander(f"Profilage : {trace.seconds * 1000:.0f} ms", expanded=False):
+        st.caption(f"Rerun {trace.id} ({trace.app}), {len(trace.spans)} étapes")
+        st.dataframe(pd.DataFrame(span_rows(trace), columns=['span', 'ms', 'rows', 'bytes']), hide_index=True)
+        reports = recent_chart_reports()[-PANEL_CHART_REPORTS:]
+        if reports:
+            st.markdown("**Derniers graphiques**")
+            st.dataframe(pd.DataFrame(reports), hide_index=True)
+        st.markdown("**Caches**")
+        st.dataframe(pd.DataFrame([dict(cache_stats(), cache="lecture CSV"), dict(chart_cache_stats(), cache="graphiques")]),
+                     hide_index=True)
+
+
+#####################################################################
+# ============================ SUMMARY ============================ #
+#####################################################################
+
+def summarize_log(log_path, app=None):
+    """
+    Aggregates the spans of a JSON lines profiling log by name, to find the slowest phases of the reruns.
+
+    Parameters:
+    - log_path (str): The log file (see IMOTION_PROFILE_LOG).
+    - app (str, optional): Only the reruns of this app. Defaults to every app.
+
+    Returns:
+    - list: One dictionary per span name with 'span', 'count', 'median_ms', 'p95_ms', 'max_ms' and 'total_ms',
+      the slowest in total first. The whole reruns are summarized under the name "rerun".
+    """
+    timings = {}
+    with open(log_path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if app is not None and record.get('app') != app:
+                continue
+            timings.setdefault("rerun", []).append(record['seconds'])
+            for item in record['spans']:
+                if 'seconds' in item:
+                    timings.setdefault(item['name'], []).append(item['seconds'])
+
+    summary = []
+    for name, values in timings.items():
+        values = sorted(values)
+        summary.append({'span': name, 'count': len(values), 'median_ms': statistics.median(values) * 1000,
+                        'p95_ms': values[min(len(values) - 1, int(len(values) * 0.95))] * 1000,
+                        'max_ms': values[-1] * 1000, 'total_ms': sum(values) * 1000})
+    return sorted(summary, key=lambda row: row['total_ms'], reverse=True)
+
+
+#####################################################################
+# ========================== ALGO LAUNCH ========================== #
+#####################################################################
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "summary":
+        app = sys.argv[3] if len(sys.argv) > 3 else None
+        print(f"{'étape':<40} {'nombre':>7} {'médiane (ms)':>13} {'p95 (ms)':>10} {'max (ms)':>10} {'total (ms)':>11}")
+        for row in summarize_log(sys.argv[2], app):
+            print(f"{row['span']:<40} {row['count']:>7} {row['median_ms']:>13.1f} {row['p95_ms']:>10.1f} "
+                  f"{row['max_ms']:>10.1f} {row['total_ms']:>11.1f}")
+    else:
+        print("Usage : python imotion_profiling.py summary <journal.jsonl> [employee|manager]")
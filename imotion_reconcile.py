@@ -0,0 +1,84 @@
+#####################################################################
+# =========================== LIBRAIRIES ========================== #
+#####################################################################
+
+import pandas as pd
+from imotion_storage import CATEGORIES, ACTION_CAT
+from imotion_profiling import profiled
+
+
+#####################################################################
+# =========================== CONSTANTS =========================== #
+#####################################################################
+
+KEY_COLUMNS = ['YEAR', 'WEEK', 'STUDY']
+# TOTAL, the 12 actions, the NB_* quantities and COMMENTAIRE
+VALUE_COLUMNS = CATEGORIES[3:]
+
+
+#####################################################################
+# ===================== ASSISTANCE FUNCTIONS ====================== #
+#####################################################################
+
+def empty_week_rows(studies, year, week):
+    """
+    Builds the blank rows of a week for a list of studies (time at 0, no action, comment "Aucun").
+
+    Parameters:
+    - studies (iterable): The studies for which a row is needed.
+    - year (int): The year of the rows.
+    - week (int): The week number of the rows.
+
+    Returns:
+    - pandas.DataFrame: One row per study, with the CATEGORIES columns.
+    """
+    studies = list(studies)
+    values = {'YEAR': year, 'WEEK': week, 'TOTAL': 0, 'COMMENTAIRE': "Aucun"}
+    values.update({col: False for col in ACTION_CAT})
+    values.update({col: 0 for col in CATEGORIES[-5:-1]})
+    columns = {col: studies if col == 'STUDY' else [values[col]] * len(studies) for col in CATEGORIES}
+    return pd.DataFrame(columns, columns=CATEGORIES)
+
+
+@profiled("aggregate:reconcile_week")
+def reconcile_week(ongoing_df, time_df, assigned_studies, year, week):
+    """
+    Reconciles the Ongoing rows of a week with the rows already saved in the history for the same week.
+    A value of the Ongoing file is replaced by the saved one when it is still 0 (or False) and the history
+    has a value; the studies assigned to the ARC but absent from both sources get a blank row.
+    Everything is done column-wise: one masked selection per column and a single concat for the missing studies.
+
+    Parameters:
+    - ongoing_df (pandas.DataFrame): The rows of the week read from Ongoing_{arc}.csv.
+    - time_df (pandas.DataFrame): The rows of the week read from the history of the ARC.
+    - assigned_studies (iterable): The studies currently assigned to the ARC (principal or backup).
+    - year (int): The year of the blank rows added for the missing studies.
+    - week (int): The week of the blank rows added for the missing studies.
+
+    Returns:
+    - pandas.DataFrame: The reconciled rows, restricted to the assigned studies.
+    """
+    assigned_studies = list(dict.fromkeys(assigned_studies))
+    merged_df = pd.merge(ongoing_df, time_df, on=KEY_COLUMNS, suffixes=('_ongoing', '_time'), how='outer')
+    merged_df = merged_df[merged_df['STUDY'].isin(assigned_studies)]
+
+    # Keep the Ongoing value unless it is still empty (0 / False) and the history has a value
+    columns = {}
+    for col in merged_df.columns:
+        if col.endswith('_time'):
+            continue
+        value_col = col[:-len('_ongoing')] if col.endswith('_ongoing') else col
+        values = merged_df[col]
+        if value_col + '_time' in merged_df.columns:
+            saved = merged_df[value_col + '_time']
+            use_saved = saved.notna() & (values == 0)
+            if use_saved.any():
+                values = values.where(~use_saved, saved)
+        columns[value_col] = values
+    reconciled = pd.DataFrame(columns)
+
+    # Blank rows for the assigned studies missing from both sources, added in one go
+    missing_studies = pd.Index(assigned_studies).difference(reconciled['STUDY'], sort=False)
+    if len(missing_studies):
+        reconciled = pd.concat([reconciled, empty_week_rows(missing_studies, year, week)], ignore_index=True)
+    return reconciled
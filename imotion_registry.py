@@ -0,0 +1,122 @@
+#####################################################################
+# =========================== LIBRAIRIES ========================== #
+#####################################################################
+
+import os
+import threading
+from imotion_storage import DATA_FOLDER, get_table_store
+
+
+#####################################################################
+# =========================== CONSTANTS =========================== #
+#####################################################################
+
+ARC_FILE = "ARC_MDP.csv"
+
+
+#####################################################################
+# ========================== ARC REGISTRY ========================= #
+#####################################################################
+
+class ArcRegistry:
+    """
+    The roster of the ARCs and their passwords (ARC_MDP.csv), shared by every session of the process.
+
+    Each lookup only compares the version stamp of the file (a stat with the CSV backend). When the file
+    changed, the first lookup that notices it starts a reload in a background thread and keeps serving
+    the previous roster until the new one is ready, so a new or archived ARC is taken into account
+    without restarting the application and without blocking the reruns. The writers of the file call
+    refresh() to see their own change immediately.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._version = None
+        self._passwords = None
+        self._reloading = False
+
+    def _read(self):
+        try:
+            df = self.store.read(ARC_FILE, sep=';', encoding='utf-8', copy=False)
+        except UnicodeDecodeError:
+            # Fichier enregistré en Latin1 (ancienne version d'Excel)
+            df = self.store.read(ARC_FILE, sep=';', encoding='latin1', copy=False)
+        if 'ARC' not in df.columns or 'MDP' not in df.columns:
+            return None
+        return dict(zip(df['ARC'], df['MDP']))
+
+    def _version_or_none(self):
+        try:
+            return self.store.version(ARC_FILE)
+        except FileNotFoundError:
+            return None
+
+    def _reload(self, version):
+        try:
+            passwords = self._read()
+            with self._lock:
+                self._version, self._passwords = version, passwords
+        except Exception as e:
+            # The previous roster stays in use; the next lookup tries again
+            print(f"Erreur lors du rechargement de {ARC_FILE} : {e}")
+        finally:
+            with self._lock:
+                self._reloading = False
+
+    def passwords(self):
+        """
+        Returns the passwords of the ARCs.
+
+        Returns:
+        - dict or None: ARC -> password, None if the file does not exist or is missing the ARC and MDP columns.
+        """
+        version = self._version_or_none()
+        if version is None:
+            return None
+        with self._lock:
+            if version == self._version:
+                return self._passwords
+            if self._version is not None:
+                # Already loaded once: reload in the background and serve the current roster meanwhile
+                if not self._reloading:
+                    self._reloading = True
+                    threading.Thread(target=self._reload, args=(version,), daemon=True).start()
+                return self._passwords
+        return self.refresh()
+
+    def refresh(self):
+        """
+        Reloads the roster now, e.g. right after a write of ARC_MDP.csv by this process.
+
+        Returns:
+        - dict or None: The new passwords (see passwords).
+        """
+        version = self._version_or_none()
+        passwords = self._read() if version is not None else None
+        with self._lock:
+            self._version, self._passwords = version, passwords
+        return passwords
+
+
+# Module-level cache: one registry per storage backend and data folder
+_REGISTRIES = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+def get_arc_registry(store=None):
+    """
+    Returns the ARC registry of a storage backend and data folder, created on first use.
+
+    Parameters:
+    - store (CsvTableStore or SqliteTableStore, optional): The table store. Defaults to the configured one.
+
+    Returns:
+    - ArcRegistry: The registry.
+    """
+    store = store or get_table_store(folder=DATA_FOLDER)
+    key = (store.name, os.path.abspath(store.folder))
+    with _REGISTRIES_LOCK:
+        if key not in _REGISTRIES:
+            _REGISTRIES[key] = ArcRegistry(store)
+        return _REGISTRIES[key]
@@ -0,0 +1,232 @@
+#####################################################################
+# =========================== LIBRAIRIES ========================== #
+#####################################################################
+
+import os
+import sys
+import shutil
+import tempfile
+import pandas as pd
+from imotion_cache import read_csv_cached, invalidate
+from imotion_storage import (DATA_FOLDER, CATEGORIES, normalize_time_frame, week_keys, path_lock,
+                             atomic_write_csv, load_all_histories, get_time_store)
+
+
+#####################################################################
+# =========================== CONSTANTS =========================== #
+#####################################################################
+
+ROLLUP_FOLDER = "rollup"
+ROLLUP_KEYS = ['ARC', 'STUDY', 'YEAR', 'WEEK']
+# TOTAL, the action counts (sum of the checkboxes) and the NB_* quantities
+ROLLUP_MEASURES = CATEGORIES[3:-1]
+ROLLUP_COLUMNS = ROLLUP_KEYS + ROLLUP_MEASURES
+
+
+#####################################################################
+# ===================== ASSISTANCE FUNCTIONS ====================== #
+#####################################################################
+
+def rollup_folder(folder=DATA_FOLDER):
+    return os.path.join(folder, ROLLUP_FOLDER)
+
+
+def rollup_path(year, folder=DATA_FOLDER):
+    """
+    Returns the path of the rollup file of a year. The rollup is split by year so that a save
+    only rewrites the small file of the year it touches.
+
+    Parameters:
+    - year (int): The year.
+    - folder (str, optional): The data folder. Defaults to "imotion".
+
+    Returns:
+    - str: The path, e.g. "imotion/rollup/ROLLUP_2024.csv".
+    """
+    return os.path.join(rollup_folder(folder), f"ROLLUP_{int(year)}.csv")
+
+
+def aggregate_rows(arc, df):
+    """
+    Aggregates raw time rows of one ARC by (STUDY, YEAR, WEEK).
+
+    Parameters:
+    - arc (str): The ARC identifier.
+    - df (pandas.DataFrame): Raw time rows (as saved by the apps, types are normalized here).
+
+    Returns:
+    - pandas.DataFrame: The rollup rows, with the ROLLUP_COLUMNS columns.
+    """
+    df = normalize_time_frame(df)
+    if df.empty:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    rollup = df.groupby(['STUDY', 'YEAR', 'WEEK'], as_index=False)[ROLLUP_MEASURES].sum()
+    rollup.insert(0, 'ARC', arc)
+    return rollup[ROLLUP_COLUMNS]
+
+
+def _rollup_years(folder):
+    if not os.path.exists(rollup_folder(folder)):
+        return []
+    return [int(file_name[len("ROLLUP_"):-len(".csv")]) for file_name in os.listdir(rollup_folder(folder))
+            if file_name.startswith("ROLLUP_") and file_name.endswith(".csv")]
+
+
+def _read_year(year, folder):
+    file_path = rollup_path(year, folder)
+    if not os.path.exists(file_path):
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    return read_csv_cached(file_path, sep=';', encoding='utf-8', dtype={'ARC': str, 'STUDY': str})
+
+
+# ========================================================================================================================================
+# INCREMENTAL UPDATE
+def update_weekly_rollup(arc, df_rows, weeks=None, folder=DATA_FOLDER):
+    """
+    Updates the rollup after a save of an ARC. Only the year files touched by the save are rewritten.
+    The rows of the touched weeks are read back from the time store under the rollup lock rather than
+    taken from the caller: the time lock is released before this update, so two saves of the same week
+    can reach the rollup in the opposite order of their writes, and the rollup must still end up with
+    the rows of the last write.
+
+    Parameters:
+    - arc (str): The ARC identifier.
+    - df_rows (pandas.DataFrame): The saved rows, which give the weeks touched by the save.
+    - weeks (set, optional): The (year, week) pairs replaced by the save. None means that df_rows is
+      the complete history of the ARC, so every rollup row of the ARC is replaced.
+    - folder (str, optional): The data folder. Defaults to "imotion".
+
+    Returns:
+    None
+    """
+    # The rollup lock is held across the whole update: a rebuild running meanwhile finishes first,
+    # then this save is applied on top of it instead of being skipped
+    with path_lock(rollup_folder(folder)):
+        if not os.path.exists(rollup_folder(folder)):
+            # Never built: the first read builds it completely from the raw histories
+            return
+        if weeks is not None:
+            weeks = set((int(year), int(week)) for year, week in weeks) | week_keys(df_rows)
+        _update_years(arc, _stored_rows(arc, weeks, folder), weeks, folder)
+
+
+def _stored_rows(arc, weeks, folder):
+    store = get_time_store(folder=folder)
+    try:
+        if weeks is None:
+            return store.load(arc)
+        frames = []
+        for year in sorted({year for year, _ in weeks}):
+            df_year = normalize_time_frame(store.load(arc, year=year))
+            frames.append(df_year[df_year['WEEK'].isin([week for week_year, week in weeks if week_year == year])])
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=CATEGORIES)
+    except FileNotFoundError:
+        return pd.DataFrame(columns=CATEGORIES)
+
+
+def _update_years(arc, df_rows, weeks, folder):
+    new_rows = aggregate_rows(arc, df_rows)
+    if weeks is None:
+        # Full save: every year where the ARC had or now has data is affected
+        years = set(_rollup_years(folder)) | set(new_rows['YEAR'].astype(int))
+    else:
+        years = {year for year, _ in weeks}
+
+    for year in sorted(years):
+        file_path = rollup_path(year, folder)
+        with path_lock(file_path):
+            rollup = _read_year(year, folder)
+            is_arc = rollup['ARC'] == arc
+            if weeks is None:
+                replaced = is_arc
+            else:
+                year_weeks = [week for week_year, week in weeks if week_year == year]
+                replaced = is_arc & rollup['WEEK'].isin(year_weeks)
+            year_rows = new_rows[new_rows['YEAR'] == year]
+            if not replaced.any() and year_rows.empty:
+                continue
+            atomic_write_csv(pd.concat([rollup[~replaced], year_rows], ignore_index=True), file_path)
+
+
+# ========================================================================================================================================
+# READING
+def load_weekly_rollup(years=None, arcs=None, folder=DATA_FOLDER):
+    """
+    Loads the weekly rollup, building it from the raw histories if it does not exist yet.
+
+    Parameters:
+    - years (list, optional): Restrict to these years; only their files are read. Defaults to all years.
+    - arcs (list, optional): Restrict to these ARCs. Defaults to all ARCs.
+    - folder (str, optional): The data folder. Defaults to "imotion".
+
+    Returns:
+    - pandas.DataFrame: One row per (ARC, STUDY, YEAR, WEEK) with the summed measures.
+    """
+    if not os.path.exists(rollup_folder(folder)):
+        with path_lock(rollup_folder(folder)):
+            # Another session may have built it while this one was waiting for the lock
+            if not os.path.exists(rollup_folder(folder)):
+                rebuild_weekly_rollup(folder)
+
+    if years is None:
+        years = _rollup_years(folder)
+    frames = [_read_year(year, folder) for year in sorted(years)]
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+
+    rollup = pd.concat(frames, ignore_index=True)
+    if arcs is not None:
+        rollup = rollup[rollup['ARC'].isin(list(arcs))].reset_index(drop=True)
+    return rollup
+
+
+# ========================================================================================================================================
+# REBUILD
+def rebuild_weekly_rollup(folder=DATA_FOLDER):
+    """
+    Regenerates the whole rollup from the raw histories, which remain the source of truth.
+    Runs under the rollup lock, so that the saves made meanwhile are applied after the swap.
+
+    Parameters:
+    - folder (str, optional): The data folder. Defaults to "imotion".
+
+    Returns:
+    - dict: Number of rollup rows per year.
+    """
+    target = rollup_folder(folder)
+    with path_lock(target):
+        facts, _ = load_all_histories(store=get_time_store(folder=folder))
+        os.makedirs(folder, exist_ok=True)
+        # Private temporary folder: a rebuild from another process never writes into this one
+        tmp_target = tempfile.mkdtemp(prefix=f".{ROLLUP_FOLDER}.rebuild.", dir=folder)
+        os.chmod(tmp_target, 0o755)
+        try:
+            report = {}
+            if not facts.empty:
+                rollup = facts.groupby(ROLLUP_KEYS, as_index=False)[ROLLUP_MEASURES].sum()[ROLLUP_COLUMNS]
+                for year, rollup_year in rollup.groupby('YEAR'):
+                    rollup_year.to_csv(os.path.join(tmp_target, f"ROLLUP_{int(year)}.csv"), index=False, sep=';', encoding='utf-8')
+                    report[int(year)] = len(rollup_year)
+
+            # Swap the new rollup in place of the old one
+            if os.path.exists(target):
+                shutil.rmtree(target)
+            os.replace(tmp_target, target)
+        finally:
+            if os.path.exists(tmp_target):
+                shutil.rmtree(tmp_target)
+        invalidate()
+    return report
+
+
+#####################################################################
+# ========================== ALGO LAUNCH ========================== #
+#####################################################################
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "rebuild":
+        for year, rows in rebuild_weekly_rollup().items():
+            print(f"ROLLUP_{year}.csv : {rows} lignes")
+    else:
+        print("Usage : python imotion_rollup.py rebuild")
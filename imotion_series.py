@@ -0,0 +1,115 @@
+#####################################################################
+# =========================== LIBRAIRIES ========================== #
+#####################################################################
+
+import math
+import numpy as np
+import pandas as pd
+from imotion_profiling import profiled
+
+
+#####################################################################
+# =========================== CONSTANTS =========================== #
+#####################################################################
+
+SERIES_COLUMNS = ['SERIES', 'WEEK', 'VALUE']
+BAND_COLUMNS = ['BAND', 'WEEK', 'LOW', 'HIGH']
+OTHERS_LABEL = "Autres ARCs"
+MEDIAN_LABEL = "Médiane"
+
+
+#####################################################################
+# ===================== ASSISTANCE FUNCTIONS ====================== #
+#####################################################################
+
+@profiled("aggregate:week_matrix")
+def week_matrix(weekly_totals, rows, weeks, row_column='ARC', value_column='Total Time'):
+    """
+    Pivots weekly totals into a (row x week) matrix, in a single pass.
+
+    Parameters:
+    - weekly_totals (pandas.DataFrame): One row per (row_column, WEEK) with the value_column.
+    - rows (list): The rows of the matrix, in display order (e.g. every valid ARC); rows without data are 0.
+    - weeks (list): The week columns of the matrix; weeks without data are 0.
+    - row_column (str, optional): The column giving the rows. Defaults to 'ARC'.
+    - value_column (str, optional): The column giving the values. Defaults to 'Total Time'.
+
+    Returns:
+    - pandas.DataFrame: Floats, indexed by rows, with one column per week.
+    """
+    matrix = weekly_totals.pivot_table(index=row_column, columns='WEEK', values=value_column, aggfunc='sum')
+    return matrix.reindex(index=list(rows), columns=list(weeks)).fillna(0).astype(float)
+
+
+def downsample_weeks(matrix, max_points):
+    """
+    Averages consecutive weeks so that each series has at most max_points points. Each bucket is labelled
+    with its first week.
+
+    Parameters:
+    - matrix (pandas.DataFrame): The (row x week) matrix, weeks in ascending order.
+    - max_points (int or None): The cap; None or 0 keeps every week.
+
+    Returns:
+    - pandas.DataFrame: The matrix, with at most max_points columns.
+    """
+    week_count = matrix.shape[1]
+    if not max_points or week_count <= max_points:
+        return matrix
+    bucket_size = math.ceil(week_count / max_points)
+    starts = np.arange(0, week_count, bucket_size)
+    sums = np.add.reduceat(matrix.to_numpy(), starts, axis=1)
+    counts = np.diff(np.append(starts, week_count))
+    return pd.DataFrame(sums / counts, index=matrix.index, columns=matrix.columns[starts])
+
+
+def _long_series(label, weeks, values):
+    return pd.DataFrame({'SERIES': label, 'WEEK': weeks, 'VALUE': values}, columns=SERIES_COLUMNS)
+
+
+@profiled("aggregate:summarize_series", argument='matrix')
+def summarize_series(matrix, top_n=None, percentiles=None, max_points=None):
+    """
+    Reduces a (row x week) matrix to what is drawn: the lines of the top_n rows with the largest total, one line
+    (mean) and one band (min-max) for all the other rows, and optionally a percentile envelope and the median of
+    every row. Everything is computed with NumPy over the whole matrix, so the size of the result only depends
+    on top_n and on the number of points, not on the number of rows.
+
+    Parameters:
+    - matrix (pandas.DataFrame): The (row x week) matrix, weeks in ascending order.
+    - top_n (int, optional): The number of rows drawn individually. Defaults to None (every row).
+    - percentiles (tuple, optional): (low, high) percentiles of the envelope, e.g. (10, 90). Defaults to None (no envelope).
+    - max_points (int, optional): The maximum number of points per series (see downsample_weeks). Defaults to None.
+
+    Returns:
+    - tuple: (pandas.DataFrame, pandas.DataFrame) The lines (SERIES, WEEK, VALUE), in drawing order, and the
+      bands (BAND, WEEK, LOW, HIGH).
+    """
+    matrix = downsample_weeks(matrix, max_points)
+    weeks = matrix.columns.to_numpy()
+    values = matrix.to_numpy()
+    lines, bands = [], []
+
+    # Top N rows by total over the displayed weeks (stable: ties keep the order of the matrix)
+    order = np.argsort(-values.sum(axis=1), kind='stable')
+    top_n = len(order) if top_n is None else max(0, min(top_n, len(order)))
+    top, others = order[:top_n], order[top_n:]
+    for position in top:
+        lines.append(_long_series(matrix.index[position], weeks, values[position]))
+
+    if len(others):
+        other_values = values[others]
+        label = f"{OTHERS_LABEL} ({len(others)})"
+        lines.append(_long_series(label, weeks, other_values.mean(axis=0)))
+        bands.append(pd.DataFrame({'BAND': label, 'WEEK': weeks, 'LOW': other_values.min(axis=0), 'HIGH': other_values.max(axis=0)},
+                                  columns=BAND_COLUMNS))
+
+    if percentiles and len(values):
+        low, median, high = np.percentile(values, [percentiles[0], 50, percentiles[1]], axis=0)
+        lines.append(_long_series(MEDIAN_LABEL, weeks, median))
+        bands.append(pd.DataFrame({'BAND': f"P{percentiles[0]}-P{percentiles[1]}", 'WEEK': weeks, 'LOW': low, 'HIGH': high},
+                                  columns=BAND_COLUMNS))
+
+    lines = pd.concat(lines, ignore_index=True) if lines else pd.DataFrame(columns=SERIES_COLUMNS)
+    bands = pd.concat(bands, ignore_index=True) if bands else pd.DataFrame(columns=BAND_COLUMNS)
+    return lines, bands
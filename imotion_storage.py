@@ -0,0 +1,1557 @@
+#####################################################################
+# =========================== LIBRAIRIES ========================== #
+#####################################################################
+
+import os
+import sys
+import json
+import shutil
+import time
+import hashlib
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from imotion_cache import read_csv_cached, invalidate, file_version
+
+try:
+    import fcntl
+except ImportError:  # Windows: locks only protect the threads of the current process
+    fcntl = None
+
+
+#####################################################################
+# =========================== CONSTANTS =========================== #
+#####################################################################
+
+DATA_FOLDER = "imotion"
+PARQUET_FOLDER = "parquet"
+MANIFEST_FILE = "_manifest.json"
+BACKEND_ENV_VAR = "IMOTION_BACKEND"
+DEFAULT_BACKEND = "csv"
+SAVE_MODE_ENV_VAR = "IMOTION_SAVE_MODE"
+DEFAULT_SAVE_MODE = "week"
+# Size of a week log beyond which it is folded back into the Time file in the background
+COMPACTION_THRESHOLD_BYTES = 256 * 1024
+LOG_COLUMNS = ['_SEQ', '_OP']
+CATEGORIES = ['YEAR', 'WEEK', 'STUDY', 'TOTAL', 'MISE EN PLACE', 'TRAINING', 'VISITES', 'SAISIE CRF', 'QUERIES', 'MONITORING', 'REMOTE', 'REUNIONS',
+'ARCHIVAGE EMAIL', 'MAJ DOC', 'AUDIT & INSPECTION', 'CLOTURE', 'NB_VISITE', 'NB_PAT_SCR', 'NB_PAT_RAN', 'NB_EOS', 'COMMENTAIRE']
+KEY_CATEGORIES = CATEGORIES[:3]
+ACTION_CAT = CATEGORIES[4:-5]
+NUMBER_CAT = ['TOTAL'] + CATEGORIES[-5:-1]
+
+
+#####################################################################
+# ===================== ASSISTANCE FUNCTIONS ====================== #
+#####################################################################
+
+def time_file_name(arc):
+    """
+    Returns the name of the CSV history file of an ARC.
+
+    Parameters:
+    - arc (str): The ARC identifier.
+
+    Returns:
+    - str: The file name, e.g. "Time_ARC.csv".
+    """
+    return f"Time_{arc}.csv"
+
+
+def normalize_time_frame(df):
+    """
+    Casts a time DataFrame to the typed logical schema (CATEGORIES) used by the columnar backends.
+
+    Parameters:
+    - df (pandas.DataFrame): Rows coming from the apps (YEAR and WEEK may be strings, checkboxes may be 0/1).
+
+    Returns:
+    - pandas.DataFrame: A copy restricted to CATEGORIES with integer keys, boolean actions and float quantities.
+      Rows without a valid YEAR or WEEK are dropped since they cannot be partitioned.
+    """
+    df = df.reindex(columns=CATEGORIES).copy()
+    for col in ['YEAR', 'WEEK']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    df = df.dropna(subset=['YEAR', 'WEEK'])
+    df['YEAR'] = df['YEAR'].astype('int64')
+    df['WEEK'] = df['WEEK'].astype('int64')
+    df['STUDY'] = df['STUDY'].astype(str)
+    for col in NUMBER_CAT:
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype('float64')
+    for col in ACTION_CAT:
+        if df[col].dtype != bool:
+            df[col] = df[col].astype(str).str.lower().isin(['true', '1', '1.0'])
+    df['COMMENTAIRE'] = df['COMMENTAIRE'].where(df['COMMENTAIRE'].notna(), None).astype(object)
+    return df.reset_index(drop=True)
+
+
+def week_keys(df):
+    """
+    Lists the distinct (YEAR, WEEK) pairs of a DataFrame as integers.
+
+    Parameters:
+    - df (pandas.DataFrame): A DataFrame with YEAR and WEEK columns (possibly stored as strings).
+
+    Returns:
+    - set: The (year, week) tuples present in the DataFrame.
+    """
+    if df is None or df.empty:
+        return set()
+    years = pd.to_numeric(df['YEAR'], errors='coerce')
+    weeks = pd.to_numeric(df['WEEK'], errors='coerce')
+    pairs = pd.DataFrame({'YEAR': years, 'WEEK': weeks}).dropna().astype('int64').drop_duplicates()
+    return set(pairs.itertuples(index=False, name=None))
+
+
+def _rows_of_week(df, year, week):
+    years = pd.to_numeric(df['YEAR'], errors='coerce')
+    weeks = pd.to_numeric(df['WEEK'], errors='coerce')
+    return df[(years == int(year)) & (weeks == int(week))]
+
+
+def _frame_digest(df):
+    """
+    Computes a content hash of a DataFrame, used to detect which partitions actually changed.
+
+    Parameters:
+    - df (pandas.DataFrame): The DataFrame to hash.
+
+    Returns:
+    - str: A hexadecimal SHA-1 digest of the row hashes.
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=False).values
+    return hashlib.sha1(row_hashes.tobytes()).hexdigest()
+
+
+# ========================================================================================================================================
+# LOCKS AND DURABLE WRITES
+_PATH_LOCKS = {}
+_PATH_LOCKS_GUARD = threading.Lock()
+# Paths whose lock is already held by the current thread, with their mode (nested acquisitions are free)
+_HELD_LOCKS = threading.local()
+
+
+def _thread_lock(path):
+    with _PATH_LOCKS_GUARD:
+        return _PATH_LOCKS.setdefault(path, threading.RLock())
+
+
+def lock_file_path(path):
+    return os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.lock")
+
+
+@contextmanager
+def path_lock(path, shared=False):
+    """
+    Locks a data file (and its companion files) for the threads of this process and for the other processes:
+    the two Streamlit apps and the batch commands all write to the same folder.
+    The lock is an flock on a hidden ".{name}.lock" file next to the data file; readers take it shared,
+    writers exclusive. Acquiring it again in the same thread is a no-op, except for asking an exclusive
+    lock while holding a shared one: the upgrade would not be atomic, so it is refused.
+
+    Parameters:
+    - path (str): The path of the file.
+    - shared (bool, optional): Take a shared (read) lock instead of an exclusive one. Defaults to False.
+
+    Returns:
+    - contextmanager: The lock is held inside the "with" block.
+
+    Raises:
+    - RuntimeError: If the current thread holds the lock shared and asks for it exclusive.
+    """
+    path = os.path.abspath(path)
+    held = getattr(_HELD_LOCKS, 'paths', None)
+    if held is None:
+        held = _HELD_LOCKS.paths = {}
+    if path in held:
+        if held[path] and not shared:
+            raise RuntimeError(f"Le verrou partagé de {path} ne peut pas être promu en verrou exclusif.")
+        yield
+        return
+
+    if fcntl is None:
+        with _thread_lock(path):
+            held[path] = shared
+            try:
+                yield
+            finally:
+                del held[path]
+        return
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(lock_file_path(path), 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        held[path] = shared
+        try:
+            yield
+        finally:
+            del held[path]
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _fsync_directory(folder):
+    # Makes a rename durable (no-op where directories cannot be opened)
+    try:
+        fd = os.open(folder or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_durable(file_path, data, append=False):
+    """
+    Writes bytes to a file and forces them to disk before returning.
+
+    Parameters:
+    - file_path (str): The destination path.
+    - data (bytes): The content to write.
+    - append (bool, optional): Append to the file (a single write, so concurrent appends never interleave)
+      instead of truncating it. Defaults to False.
+
+    Returns:
+    None
+    """
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if append else os.O_TRUNC)
+    fd = os.open(file_path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_csv(df, file_path, sep=';', encoding='utf-8', tmp_suffix=".tmp"):
+    """
+    Writes a DataFrame to a CSV file through a temporary file, an fsync and an atomic rename, so that readers
+    never see a partially written file and a crash leaves either the old or the new content.
+
+    Parameters:
+    - df (pandas.DataFrame): The DataFrame to write.
+    - file_path (str): The destination path.
+    - sep (str, optional): The column separator. Defaults to ';'.
+    - encoding (str, optional): The encoding. Defaults to 'utf-8'.
+    - tmp_suffix (str, optional): Suffix of the hidden temporary file. Defaults to ".tmp".
+
+    Returns:
+    None
+    """
+    folder = os.path.dirname(file_path)
+    os.makedirs(folder or ".", exist_ok=True)
+    tmp_path = os.path.join(folder, f".{os.path.basename(file_path)}{tmp_suffix}")
+    write_durable(tmp_path, df.to_csv(index=False, sep=sep).encode(encoding))
+    os.replace(tmp_path, file_path)
+    _fsync_directory(folder)
+    invalidate(file_path)
+
+
+# ========================================================================================================================================
+# CSV BACKEND
+def _committed_entries(log):
+    """
+    Keeps the entries of a week journal that are closed by their own commit row. Each entry is a run of 'W' markers
+    with consecutive _SEQ values (and their 'R' rows), ended by a 'C' row carrying the _SEQ of its last marker:
+    an entry cut by a crash has no matching commit row and is ignored, even when later entries were committed after it.
+    Journals written before the commit rows existed have none at all and are kept entirely.
+
+    Parameters:
+    - log (pandas.DataFrame): The content of a journal.
+
+    Returns:
+    - pandas.DataFrame: The committed entries, without the commit rows.
+    """
+    ops = log['_OP'].to_numpy()
+    is_commit = ops == 'C'
+    if not is_commit.any():
+        return log
+    seqs = log['_SEQ'].to_numpy()
+    keep = np.zeros(len(log), dtype=bool)
+    start = 0
+    # Rows after the last commit row belong to an unfinished append and are never kept
+    for end in np.flatnonzero(is_commit):
+        # Walking back from the commit row, the markers of its entry carry _SEQ, _SEQ - 1, ...
+        # The first marker that breaks the sequence belongs to an entry cut by a crash
+        expected = seqs[end]
+        entry_seqs = []
+        for position in range(end - 1, start - 1, -1):
+            if ops[position] != 'W':
+                continue
+            if seqs[position] != expected:
+                break
+            entry_seqs.append(expected)
+            expected -= 1
+        keep[start:end] = np.isin(seqs[start:end], entry_seqs)
+        start = end + 1
+    return log[keep]
+
+
+def _commit_row_suffix():
+    # The end of the line of a commit row: the '_OP' column then the empty CATEGORIES columns
+    return (";C" + ";" * len(CATEGORIES) + "\n").encode('utf-8')
+
+
+def _repair_log(log_path):
+    """
+    Prepares a week journal for an append. It is truncated back to the end of its last commit row, so that
+    an append cut by a crash (possibly in the middle of a line) is never glued to the next entry.
+    A journal written before the commit rows existed gets one commit row per week marker, so that its
+    entries stay valid once committed entries follow them. Must be called under the exclusive lock.
+
+    Parameters:
+    - log_path (str): The path of the journal.
+
+    Returns:
+    None
+    """
+    suffix = _commit_row_suffix()
+    with open(log_path, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - len(suffix)))
+        if f.read() == suffix:
+            return
+        f.seek(0)
+        content = f.read()
+        last_commit = content.rfind(suffix)
+        header_end = content.find(b"\n") + 1
+        if last_commit >= 0:
+            f.truncate(last_commit + len(suffix))
+        elif header_end == 0 or header_end == len(content):
+            # Empty, cut inside the header or header only: the header is written again with the next entry
+            f.truncate(header_end if header_end == len(content) else 0)
+        else:
+            f.truncate(content.rfind(b"\n") + 1)
+        os.fsync(f.fileno())
+    invalidate(log_path)
+    if last_commit >= 0 or header_end == 0 or header_end >= len(content):
+        return
+
+    # Journal without commit rows: each week marker and its rows is a complete replacement on its own
+    log = pd.read_csv(log_path, sep=';', encoding='utf-8', dtype=str, keep_default_na=False)
+    blocks = []
+    for _, rows in log.groupby((log['_OP'] == 'W').cumsum(), sort=False):
+        if rows['_OP'].iloc[0] == 'W':
+            blocks.extend([rows, pd.DataFrame([{'_SEQ': rows['_SEQ'].iloc[0], '_OP': 'C'}])])
+    if blocks:
+        atomic_write_csv(pd.concat(blocks, ignore_index=True).reindex(columns=log.columns).fillna(''), log_path)
+    else:
+        atomic_write_csv(log.iloc[:0], log_path)
+
+
+class CsvTimeStore:
+    """
+    Historical storage: one "Time_{arc}.csv" file per ARC in the "imotion" folder.
+
+    In the "week" save mode, replacing a week appends the new rows of that week to a small
+    "Time_{arc}.log" journal instead of rewriting the whole history: the bytes written per save
+    only depend on the size of the week. Each append is a single fsync'ed write ending with a
+    commit row, made under a short exclusive lock, so concurrent saves never interleave nor lose
+    an update. Readers apply the journal on top of the Time file, and the journal is folded back
+    into the Time file in a background thread once it grows past COMPACTION_THRESHOLD_BYTES:
+    it is first renamed to "Time_{arc}.log.compacting" (new saves start a fresh journal), then the
+    new Time file is written aside and swapped in with an atomic rename.
+    The "full" save mode keeps the historical read-modify-rewrite.
+    """
+    name = "csv"
+
+    def __init__(self, folder=DATA_FOLDER, save_mode=None):
+        self.folder = folder
+        self.save_mode = save_mode or os.getenv(SAVE_MODE_ENV_VAR, DEFAULT_SAVE_MODE)
+
+    def path(self, arc):
+        return os.path.join(self.folder, time_file_name(arc))
+
+    def log_path(self, arc):
+        return os.path.join(self.folder, f"Time_{arc}.log")
+
+    def compacting_path(self, arc):
+        return self.log_path(arc) + ".compacting"
+
+    def _log_paths(self, arc):
+        # Journals in application order: the one being compacted, then the live one
+        return [path for path in (self.compacting_path(arc), self.log_path(arc)) if os.path.exists(path)]
+
+    def exists(self, arc):
+        return any(os.path.exists(path) for path in (self.path(arc), self.log_path(arc), self.compacting_path(arc)))
+
+    def list_arcs(self):
+        """
+        Lists the ARCs that have a history: a Time file, or only a week journal when the first saves of the ARC
+        were not compacted yet.
+
+        Returns:
+        - list: ARC identifiers, in folder order, without duplicates.
+        """
+        if not os.path.exists(self.folder):
+            return []
+        arcs = {}
+        for file_name in os.listdir(self.folder):
+            if not file_name.startswith("Time_"):
+                continue
+            for suffix in (".csv", ".log", ".log.compacting"):
+                if file_name.endswith(suffix):
+                    arcs.setdefault(file_name[len("Time_"):-len(suffix)], None)
+                    break
+        return list(arcs)
+
+    @staticmethod
+    def _read_journal(logs):
+        """
+        Extracts the latest committed replacement of every week present in the week journals.
+
+        Parameters:
+        - logs (list): The contents of the journals, oldest first.
+
+        Returns:
+        - tuple: (pandas.MultiIndex, pandas.DataFrame) The replaced (YEAR, WEEK) pairs and the rows replacing them,
+          or (None, None) if the journals hold no committed entry.
+        """
+        logs = [_committed_entries(log) for log in logs]
+        log = pd.concat(logs, ignore_index=True) if len(logs) > 1 else logs[0]
+        if log.empty:
+            return None, None
+
+        # Each replacement starts with a 'W' marker row carrying its (YEAR, WEEK), followed by its 'R' data rows.
+        # The journal is append-only, so the last marker of a week in file order is the latest replacement.
+        markers = log[log['_OP'] == 'W']
+        last_seq = markers.drop_duplicates(['YEAR', 'WEEK'], keep='last').set_index(['YEAR', 'WEEK'])['_SEQ']
+        rows = log[(log['_OP'] == 'R') & log['_SEQ'].isin(last_seq.values)]
+        # The log mixes marker and data rows, so its columns are parsed as text: restore the typed schema
+        rows = normalize_time_frame(rows.drop(columns=LOG_COLUMNS))
+        replaced = pd.MultiIndex.from_tuples(last_seq.index.tolist(), names=['YEAR', 'WEEK'])
+        return replaced, rows
+
+    @staticmethod
+    def _drop_replaced(df, replaced):
+        keys = pd.MultiIndex.from_arrays([pd.to_numeric(df['YEAR'], errors='coerce'),
+                                          pd.to_numeric(df['WEEK'], errors='coerce')])
+        return df[~keys.isin(replaced)]
+
+    def _apply_log(self, df, log_paths):
+        """
+        Applies the week journals on top of the Time file content: for every week present in the journals,
+        the rows of the last committed replacement of that week (in write order) supersede the rows of the Time file.
+
+        Parameters:
+        - df (pandas.DataFrame): The content of the Time file.
+        - log_paths (list): The paths of the journals, oldest first.
+
+        Returns:
+        - pandas.DataFrame: The merged history.
+        """
+        replaced, rows = self._read_journal([read_csv_cached(log_path, sep=';', encoding='utf-8') for log_path in log_paths])
+        if replaced is None:
+            return df.copy()
+        kept = self._drop_replaced(df, replaced)
+        if rows.empty:
+            return kept.reset_index(drop=True)
+        if kept.empty:
+            return rows
+        return pd.concat([kept, rows], ignore_index=True)
+
+    def iter_chunks(self, arc, chunksize):
+        """
+        Yields the history of an ARC in chunks of at most chunksize rows, read straight from the files instead of
+        through the shared read cache: memory is bounded by the chunk size and the cached files of the
+        interactive sessions are left alone. The rows of the weeks replaced in the journals come last.
+
+        Parameters:
+        - arc (str): The ARC identifier.
+        - chunksize (int): The maximum number of rows per chunk.
+
+        Yields:
+        - pandas.DataFrame: The history rows of the ARC.
+
+        Raises:
+        - FileNotFoundError: If the ARC has no history file.
+        """
+        file_path = self.path(arc)
+        if not self.exists(arc):
+            raise FileNotFoundError(f"Le fichier {time_file_name(arc)} n'existe pas dans le dossier '{self.folder}'.")
+
+        # The Time file is opened and the (small) journals are read under the shared lock: a compaction swapping
+        # the files afterwards does not change what this open handle reads
+        with path_lock(file_path, shared=True):
+            time_file = open(file_path, encoding='utf-8', newline='') if os.path.exists(file_path) else None
+            logs = [pd.read_csv(log_path, sep=';', encoding='utf-8') for log_path in self._log_paths(arc)]
+        try:
+            replaced, rows = self._read_journal(logs) if logs else (None, None)
+            if time_file is not None:
+                for chunk in pd.read_csv(time_file, sep=';', chunksize=chunksize):
+                    if replaced is not None:
+                        chunk = self._drop_replaced(chunk, replaced)
+                    if not chunk.empty:
+                        yield chunk
+        finally:
+            if time_file is not None:
+                time_file.close()
+        if rows is not None:
+            for start in range(0, len(rows), chunksize):
+                yield rows.iloc[start:start + chunksize]
+
+    def load(self, arc, year=None, week=None, study=None):
+        """
+        Loads the history of an ARC, optionally filtered on a year, a week and/or a study.
+
+        Parameters:
+        - arc (str): The ARC identifier.
+        - year (int, optional): Keep only the rows of this year.
+        - week (int, optional): Keep only the rows of this week.
+        - study (str, optional): Keep only the rows of this study.
+
+        Returns:
+        - pandas.DataFrame: The history rows of the ARC.
+
+        Raises:
+        - FileNotFoundError: If the ARC has no history file.
+        """
+        file_path = self.path(arc)
+        if not self.exists(arc):
+            raise FileNotFoundError(f"Le fichier {time_file_name(arc)} n'existe pas dans le dossier '{self.folder}'.")
+
+        # Shared lock: the swap at the end of a compaction cannot happen between the reads of the Time file and the journals
+        with path_lock(file_path, shared=True):
+            if os.path.exists(file_path):
+                df = read_csv_cached(file_path, sep=';', encoding='utf-8')
+            else:
+                df = pd.DataFrame(columns=CATEGORIES)
+            log_paths = self._log_paths(arc)
+            if log_paths:
+                df = self._apply_log(df, log_paths)
+
+        if not log_paths and year is None and week is None and study is None:
+            # The callers add columns to the full history: never hand out the cached DataFrame itself
+            return df.copy()
+
+        if year is not None:
+            df = df[df['YEAR'] == year]
+        if week is not None:
+            df = df[df['WEEK'] == week]
+        if study is not None:
+            df = df[df['STUDY'] == study]
+        return df
+
+    def _write(self, arc, df):
+        atomic_write_csv(df, self.path(arc))
+
+    def save(self, arc, df):
+        """
+        Rewrites the whole history file of an ARC. The week journals, superseded by the new content, are removed.
+
+        Parameters:
+        - arc (str): The ARC identifier.
+        - df (pandas.DataFrame): The complete history of the ARC.
+
+        Returns:
+        None
+        """
+        with path_lock(self.path(arc)):
+            self._write(arc, df)
+            for log_path in self._log_paths(arc):
+                os.remove(log_path)
+                invalidate(log_path)
+
+    def replace_weeks(self, arc, df_rows, weeks):
+        """
+        Replaces the rows of the given (YEAR, WEEK) pairs by new rows, leaving the rest of the history untouched.
+
+        Parameters:
+        - arc (str): The ARC identifier.
+        - df_rows (pandas.DataFrame): The new rows. Their own (YEAR, WEEK) pairs are replaced as well.
+        - weeks (iterable): The (year, week) pairs to replace. Pairs without new rows end up empty.
+
+        Returns:
+        None
+        """
+        weeks = set((int(year), int(week)) for year, week in weeks) | week_keys(df_rows)
+        if self.save_mode == "full":
+            with path_lock(self.path(arc)):
+                df = self.load(arc) if self.exists(arc) else pd.DataFrame(columns=CATEGORIES)
+                keys = pd.MultiIndex.from_arrays([pd.to_numeric(df['YEAR'], errors='coerce'),
+                                                  pd.to_numeric(df['WEEK'], errors='coerce')])
+                df = df[~keys.isin(list(weeks))]
+                self.save(arc, pd.concat([df, df_rows], ignore_index=True))
+            return
+
+        week_rows = []
+        for year, week in sorted(weeks):
+            rows = _rows_of_week(df_rows, year, week).reindex(columns=CATEGORIES).copy()
+            rows['YEAR'] = year
+            rows['WEEK'] = week
+            week_rows.append((year, week, rows))
+
+        # The entry is serialized before taking the lock, which is only held for the fsync'ed append:
+        # its position in the journal gives the order of the saves, the identifiers only group its rows
+        first_seq = time.time_ns()
+        blocks = []
+        for i, (year, week, rows) in enumerate(week_rows):
+            rows.insert(0, '_OP', 'R')
+            rows.insert(0, '_SEQ', first_seq + i)
+            blocks.extend([pd.DataFrame([{'_SEQ': first_seq + i, '_OP': 'W', 'YEAR': year, 'WEEK': week}]), rows])
+        # The commit row closes the entry: an entry cut by a crash has none and is ignored by the readers,
+        # then dropped by the next append
+        blocks.append(pd.DataFrame([{'_SEQ': first_seq + len(week_rows) - 1, '_OP': 'C'}]))
+        block = pd.concat(blocks, ignore_index=True).reindex(columns=LOG_COLUMNS + CATEGORIES)
+        header = block.iloc[:0].to_csv(index=False, sep=';').encode('utf-8')
+        entry = block.to_csv(index=False, header=False, sep=';').encode('utf-8')
+
+        log_path = self.log_path(arc)
+        os.makedirs(self.folder, exist_ok=True)
+        with path_lock(self.path(arc)):
+            if os.path.exists(log_path):
+                _repair_log(log_path)
+            new_log = not os.path.exists(log_path) or os.path.getsize(log_path) == 0
+            write_durable(log_path, header + entry if new_log else entry, append=True)
+            invalidate(log_path)
+            log_size = os.path.getsize(log_path)
+
+        if log_size > COMPACTION_THRESHOLD_BYTES:
+            threading.Thread(target=self.compact, args=(arc,), daemon=True).start()
+
+    def compact(self, arc):
+        """
+        Folds the week journal of an ARC into its Time file. The saves are only blocked for two renames:
+        the journal is set aside, the new Time file is written next to the old one without any lock, then swapped in.
+
+        Parameters:
+        - arc (str): The ARC identifier.
+
+        Returns:
+        - bool: True if a journal was compacted.
+        """
+        file_path, log_path, compacting_path = self.path(arc), self.log_path(arc), self.compacting_path(arc)
+        with path_lock(file_path):
+            # A journal left aside by an interrupted compaction is folded first, the live one on the next pass
+            recovering = os.path.exists(compacting_path)
+            if not recovering:
+                if not os.path.exists(log_path):
+                    return False
+                os.replace(log_path, compacting_path)
+                invalidate(log_path)
+
+        # One compaction at a time per ARC; a concurrent one finds the journal already folded
+        with path_lock(compacting_path):
+            with path_lock(file_path, shared=True):
+                if not os.path.exists(compacting_path):
+                    return False
+                base_version = file_version(file_path) if os.path.exists(file_path) else None
+                df = read_csv_cached(file_path, sep=';', encoding='utf-8') if base_version else pd.DataFrame(columns=CATEGORIES)
+                df = self._apply_log(df, [compacting_path])
+            atomic_tmp = os.path.join(self.folder, f".{os.path.basename(file_path)}.compact.tmp")
+            write_durable(atomic_tmp, df.to_csv(index=False, sep=';').encode('utf-8'))
+
+            with path_lock(file_path):
+                current_version = file_version(file_path) if os.path.exists(file_path) else None
+                if current_version != base_version or not os.path.exists(compacting_path):
+                    # A full save replaced the history meanwhile and already superseded this journal
+                    os.remove(atomic_tmp)
+                    return False
+                os.replace(atomic_tmp, file_path)
+                os.remove(compacting_path)
+                _fsync_directory(self.folder)
+                invalidate(file_path)
+                invalidate(compacting_path)
+        if recovering:
+            self.compact(arc)
+        return True
+
+    def create_empty(self, arc):
+        """
+        Creates an empty history for an ARC if none exists yet.
+
+        Parameters:
+        - arc (str): The ARC identifier.
+
+        Returns:
+        None
+        """
+        if not self.exists(arc):
+            self._write(arc, pd.DataFrame(columns=CATEGORIES))
+
+
+# ========================================================================================================================================
+# PARQUET BACKEND
+def parquet_schema():
+    """
+    Returns the Arrow schema of the time history (the logical schema of normalize_time_frame), used to write
+    every partition and to read the datasets, so that all the files of an ARC share the same column types.
+
+    Returns:
+    - pyarrow.Schema: The CATEGORIES columns, YEAR and WEEK included.
+    """
+    import pyarrow as pa
+
+    types = {col: pa.int64() for col in ['YEAR', 'WEEK']}
+    types.update({col: pa.bool_() for col in ACTION_CAT})
+    types.update({col: pa.float64() for col in NUMBER_CAT})
+    types.update({'STUDY': pa.string(), 'COMMENTAIRE': pa.string()})
+    return pa.schema([pa.field(col, types[col]) for col in CATEGORIES])
+
+
+class ParquetTimeStore:
+    """
+    Columnar storage: the history of each ARC is a Parquet dataset partitioned by YEAR/WEEK
+    (imotion/parquet/Time_{arc}/YEAR=2024/WEEK=5/part-0.parquet).
+
+    Reads prune the partitions that do not match the year/week filter, and a save only rewrites
+    the partitions whose content changed, tracked through a per-ARC manifest of content hashes.
+    """
+    name = "parquet"
+
+    def __init__(self, folder=DATA_FOLDER):
+        self.folder = folder
+        self.root = os.path.join(folder, PARQUET_FOLDER)
+
+    def path(self, arc):
+        return os.path.join(self.root, f"Time_{arc}")
+
+    def partition_path(self, arc, year, week):
+        return os.path.join(self.path(arc), f"YEAR={int(year)}", f"WEEK={int(week)}")
+
+    def exists(self, arc):
+        return os.path.isdir(self.path(arc))
+
+    def list_arcs(self):
+        if not os.path.exists(self.root):
+            return []
+        return [dir_name[len("Time_"):] for dir_name in os.listdir(self.root) if dir_name.startswith("Time_")]
+
+    def _read_manifest(self, arc):
+        manifest_path = os.path.join(self.path(arc), MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return {}
+        with open(manifest_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_manifest(self, arc, manifest):
+        manifest_path = os.path.join(self.path(arc), MANIFEST_FILE)
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
+
+    def load(self, arc, year=None, week=None, study=None):
+        """
+        Loads the history of an ARC, reading only the partitions matching the filters.
+
+        Parameters:
+        - arc (str): The ARC identifier.
+        - year (int, optional): Keep only the partitions of this year.
+        - week (int, optional): Keep only the partitions of this week.
+        - study (str, optional): Keep only the rows of this study (filtered while scanning).
+
+        Returns:
+        - pandas.DataFrame: The history rows of the ARC, with the CATEGORIES columns.
+
+        Raises:
+        - FileNotFoundError: If the ARC has no dataset.
+        """
+        with path_lock(self.path(arc), shared=True):
+            import pyarrow as pa
+            import pyarrow.dataset as ds
+
+            if not self.exists(arc):
+                raise FileNotFoundError(f"Le jeu de données Time_{arc} n'existe pas dans le dossier '{self.root}'.")
+
+            # Explicit schema: otherwise it is guessed from the first file, and a week whose comments are all
+            # empty (null column) makes the files of the other weeks unreadable
+            schema = parquet_schema()
+            partitioning = ds.partitioning(pa.schema([schema.field('YEAR'), schema.field('WEEK')]), flavor="hive")
+            dataset = ds.dataset(self.path(arc), schema=schema, format="parquet", partitioning=partitioning)
+            if not dataset.files:
+                return pd.DataFrame(columns=CATEGORIES)
+
+            expression = None
+            for col, value in (('YEAR', year), ('WEEK', week)):
+                if value is not None:
+                    condition = ds.field(col) == int(value)
+                    expression = condition if expression is None else expression & condition
+            if study is not None:
+                condition = ds.field('STUDY') == str(study)
+                expression = condition if expression is None else expression & condition
+
+            df = dataset.to_table(filter=expression).to_pandas()
+            df['YEAR'] = df['YEAR'].astype('int64')
+            df['WEEK'] = df['WEEK'].astype('int64')
+            df = df.sort_values(['YEAR', 'WEEK'], kind='stable').reset_index(drop=True)
+            return df[CATEGORIES]
+
+    def _write_partition(self, arc, year, week, df_week):
+        partition_path = self.partition_path(arc, year, week)
+        os.makedirs(partition_path, exist_ok=True)
+        file_path = os.path.join(partition_path, "part-0.parquet")
+        # Temporary file prefixed with "." so that readers ignore it until the atomic rename
+        tmp_path = os.path.join(partition_path, ".part-0.parquet.tmp")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = parquet_schema()
+        file_schema = pa.schema([field for field in schema if field.name not in ('YEAR', 'WEEK')])
+        table = pa.Table.from_pandas(df_week[file_schema.names], schema=file_schema, preserve_index=False)
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, file_path)
+
+    def _drop_partition(self, arc, year, week):
+        partition_path = self.partition_path(arc, year, week)
+        if os.path.exists(partition_path):
+            shutil.rmtree(partition_path)
+
+    def replace_week(self, arc, year, week, df_week):
+        """
+        Replaces the rows of a single (YEAR, WEEK) partition, leaving all the other partitions untouched.
+
+        Parameters:
+        - arc (str): The ARC identifier.
+        - year (int): The year of the partition.
+        - week (int): The week of the partition.
+        - df_week (pandas.DataFrame): The new rows of the week. An empty DataFrame removes the partition.
+
+        Returns:
+        None
+        """
+        # The manifest is read, modified and written back: one writer at a time per ARC
+        with path_lock(self.path(arc)):
+            os.makedirs(self.path(arc), exist_ok=True)
+            manifest = self._read_manifest(arc)
+            key = f"{int(year)}/{int(week)}"
+            df_week = normalize_time_frame(df_week)
+            df_week['YEAR'] = int(year)
+            df_week['WEEK'] = int(week)
+
+            if df_week.empty:
+                self._drop_partition(arc, year, week)
+                manifest.pop(key, None)
+            else:
+                digest = _frame_digest(df_week)
+                if manifest.get(key) == digest:
+                    return
+                self._write_partition(arc, year, week, df_week)
+                manifest[key] = digest
+            self._write_manifest(arc, manifest)
+
+    def replace_weeks(self, arc, df_rows, weeks):
+        """
+        Replaces the rows of the given (YEAR, WEEK) pairs, each one being a single partition rewrite.
+
+        Parameters:
+        - arc (str): The ARC identifier.
+        - df_rows (pandas.DataFrame): The new rows. Their own (YEAR, WEEK) pairs are replaced as well.
+        - weeks (iterable): The (year, week) pairs to replace. Pairs without new rows are removed.
+
+        Returns:
+        None
+        """
+        weeks = set((int(year), int(week)) for year, week in weeks) | week_keys(df_rows)
+        for year, week in sorted(weeks):
+            self.replace_week(arc, year, week, _rows_of_week(df_rows, year, week))
+
+    def compact(self, arc):
+        # Partitions are already rewritten in place: nothing to fold
+        return False
+
+    def save(self, arc, df):
+        """
+        Saves the complete history of an ARC, rewriting only the partitions whose content changed
+        and removing the partitions that no longer have rows.
+
+        Parameters:
+        - arc (str): The ARC identifier.
+        - df (pandas.DataFrame): The complete history of the ARC.
+
+        Returns:
+        None
+        """
+        with path_lock(self.path(arc)):
+            os.makedirs(self.path(arc), exist_ok=True)
+            manifest = self._read_manifest(arc)
+            df = normalize_time_frame(df)
+
+            new_manifest = {}
+            for (year, week), df_week in df.groupby(['YEAR', 'WEEK'], sort=True):
+                key = f"{int(year)}/{int(week)}"
+                digest = _frame_digest(df_week.reset_index(drop=True))
+                if manifest.get(key) != digest:
+                    self._write_partition(arc, year, week, df_week)
+                new_manifest[key] = digest
+
+            for key in set(manifest) - set(new_manifest):
+                year, week = key.split("/")
+                self._drop_partition(arc, year, week)
+
+            self._write_manifest(arc, new_manifest)
+
+    def create_empty(self, arc):
+        if not self.exists(arc):
+            os.makedirs(self.path(arc), exist_ok=True)
+            self._write_manifest(arc, {})
+
+
+# ========================================================================================================================================
+# SQLITE BACKEND
+SQLITE_FILE = "imotion.db"
+SQL_TYPES = {col: 'INTEGER' for col in ['YEAR', 'WEEK'] + ACTION_CAT}
+SQL_TYPES.update({col: 'REAL' for col in NUMBER_CAT})
+SQL_TYPES.update({'STUDY': 'TEXT', 'COMMENTAIRE': 'TEXT'})
+
+
+def _quote(identifier):
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def sqlite_connect(folder=DATA_FOLDER):
+    """
+    Opens a connection to the SQLite database of the data folder and creates its schema if needed.
+    The database runs in WAL mode so that several Streamlit sessions can read while one of them writes.
+
+    Parameters:
+    - folder (str, optional): The data folder. Defaults to "imotion".
+
+    Returns:
+    - sqlite3.Connection: A new connection (connections must not be shared between threads).
+    """
+    import sqlite3
+
+    os.makedirs(folder, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(folder, SQLITE_FILE), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    columns = ", ".join(f"{_quote(col)} {SQL_TYPES[col]}" for col in CATEGORIES)
+    with conn:
+        for table in ('time_entries', 'ongoing_entries'):
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (ARC TEXT NOT NULL, {columns})")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_arc_year_week_study ON {table} (ARC, YEAR, WEEK, STUDY)")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_study ON {table} (STUDY)")
+        # Registry of the logical files stored in the database (a history may exist and be empty)
+        # VERSION is bumped on every write of the file, so that in-memory indexes know when to rebuild
+        conn.execute("CREATE TABLE IF NOT EXISTS stored_files (NAME TEXT PRIMARY KEY, VERSION INTEGER NOT NULL DEFAULT 0)")
+        if 'VERSION' not in [row[1] for row in conn.execute("PRAGMA table_info(stored_files)")]:
+            conn.execute("ALTER TABLE stored_files ADD COLUMN VERSION INTEGER NOT NULL DEFAULT 0")
+    return conn
+
+
+_SQLITE_CONNECTIONS = threading.local()
+
+
+def sqlite_connection(folder=DATA_FOLDER):
+    """
+    Returns the connection of the current thread to the SQLite database of the data folder, opened
+    (with its PRAGMAs and schema) on the first call of the thread and reused afterwards.
+
+    Parameters:
+    - folder (str, optional): The data folder. Defaults to "imotion".
+
+    Returns:
+    - sqlite3.Connection: The connection of the current thread, which must not be closed by the caller.
+    """
+    db_path = os.path.abspath(os.path.join(folder, SQLITE_FILE))
+    connections = getattr(_SQLITE_CONNECTIONS, 'by_path', None)
+    if connections is None:
+        connections = _SQLITE_CONNECTIONS.by_path = {}
+    conn = connections.get(db_path)
+    if conn is None or not os.path.exists(db_path):
+        if conn is not None:
+            conn.close()
+        conn = connections[db_path] = sqlite_connect(folder)
+    return conn
+
+
+def _where(filters):
+    filters = {col: value for col, value in filters.items() if value is not None}
+    if not filters:
+        return "", []
+    clause = " AND ".join(f"{_quote(col)} = ?" for col in filters)
+    params = [int(value) if col in ('YEAR', 'WEEK') else value for col, value in filters.items()]
+    return f" WHERE {clause}", params
+
+
+def _sql_rows(df, arc):
+    rows = normalize_time_frame(df)
+    rows.insert(0, 'ARC', arc)
+    for col in ACTION_CAT:
+        rows[col] = rows[col].astype('int64')
+    return rows
+
+
+def _from_sql_rows(df):
+    for col in ACTION_CAT:
+        df[col] = df[col].fillna(0).astype(bool)
+    return df
+
+
+class SqliteTimeStore:
+    """
+    Embedded SQL storage: the histories of all ARCs live in the indexed "time_entries" table of
+    imotion/imotion.db. Year, week and study filters are pushed down to SQL and use the composite
+    (ARC, YEAR, WEEK, STUDY) index or the STUDY index, and every save is a single transaction.
+    """
+    name = "sqlite"
+
+    def __init__(self, folder=DATA_FOLDER):
+        self.folder = folder
+
+    def path(self, arc):
+        return os.path.join(self.folder, SQLITE_FILE)
+
+    def exists(self, arc):
+        conn = sqlite_connection(self.folder)
+        return conn.execute("SELECT 1 FROM stored_files WHERE NAME = ?", (time_file_name(arc),)).fetchone() is not None
+
+    def list_arcs(self):
+        conn = sqlite_connection(self.folder)
+        names = [row[0] for row in conn.execute("SELECT NAME FROM stored_files WHERE NAME LIKE 'Time!_%' ESCAPE '!'")]
+        return [name[len("Time_"):-len(".csv")] for name in names]
+
+    def load(self, arc, year=None, week=None, study=None):
+        """
+        Loads the history of an ARC with the filters evaluated by SQLite.
+
+        Parameters:
+        - arc (str): The ARC identifier.
+        - year (int, optional): Keep only the rows of this year.
+        - week (int, optional): Keep only the rows of this week.
+        - study (str, optional): Keep only the rows of this study.
+
+        Returns:
+        - pandas.DataFrame: The history rows of the ARC, with the CATEGORIES columns.
+
+        Raises:
+        - FileNotFoundError: If the ARC has no history.
+        """
+        if not self.exists(arc):
+            raise FileNotFoundError(f"L'historique de l'ARC {arc} n'existe pas dans la base '{self.path(arc)}'.")
+        where, params = _where({'ARC': arc, 'YEAR': year, 'WEEK': week, 'STUDY': study})
+        columns = ", ".join(_quote(col) for col in CATEGORIES)
+        conn = sqlite_connection(self.folder)
+        df = pd.read_sql_query(f"SELECT {columns} FROM time_entries{where} ORDER BY rowid", conn, params=params)
+        return _from_sql_rows(df)
+
+    def _insert(self, conn, arc, df):
+        rows = _sql_rows(df, arc)
+        if not rows.empty:
+            columns = ", ".join(_quote(col) for col in rows.columns)
+            placeholders = ", ".join("?" for _ in rows.columns)
+            values = rows.astype(object).where(rows.notna(), None).itertuples(index=False, name=None)
+            conn.executemany(f"INSERT INTO time_entries ({columns}) VALUES ({placeholders})", values)
+        conn.execute("INSERT OR IGNORE INTO stored_files (NAME) VALUES (?)", (time_file_name(arc),))
+
+    def save(self, arc, df):
+        """
+        Replaces the whole history of an ARC in one transaction.
+
+        Parameters:
+        - arc (str): The ARC identifier.
+        - df (pandas.DataFrame): The complete history of the ARC.
+
+        Returns:
+        None
+        """
+        conn = sqlite_connection(self.folder)
+        with conn:
+            conn.execute("DELETE FROM time_entries WHERE ARC = ?", (arc,))
+            self._insert(conn, arc, df)
+
+    def replace_weeks(self, arc, df_rows, weeks):
+        """
+        Replaces the rows of the given (YEAR, WEEK) pairs in one transaction.
+
+        Parameters:
+        - arc (str): The ARC identifier.
+        - df_rows (pandas.DataFrame): The new rows. Their own (YEAR, WEEK) pairs are replaced as well.
+        - weeks (iterable): The (year, week) pairs to replace.
+
+        Returns:
+        None
+        """
+        weeks = set((int(year), int(week)) for year, week in weeks) | week_keys(df_rows)
+        conn = sqlite_connection(self.folder)
+        with conn:
+            conn.executemany("DELETE FROM time_entries WHERE ARC = ? AND YEAR = ? AND WEEK = ?",
+                             [(arc, year, week) for year, week in sorted(weeks)])
+            self._insert(conn, arc, df_rows)
+
+    def compact(self, arc):
+        # Writes are already in place: nothing to fold
+        return False
+
+    def create_empty(self, arc):
+        conn = sqlite_connection(self.folder)
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO stored_files (NAME) VALUES (?)", (time_file_name(arc),))
+
+
+# ========================================================================================================================================
+# OTHER TABLES (Ongoing_*, STUDY.csv, ARC_MDP.csv)
+def apply_row_changes(current, key_column, changes):
+    """
+    Applies changed values to the rows of a table identified by a key column. Values are compared as text,
+    so that a password read back as a number is not seen as changed.
+
+    Parameters:
+    - current (pandas.DataFrame): The current content of the table.
+    - key_column (str): The column identifying the rows (e.g. 'ARC').
+    - changes (pandas.DataFrame): The key_column and the new values of the changed columns, one row per changed row.
+
+    Returns:
+    - tuple: (pandas.DataFrame, int) The updated content and the number of rows that actually changed.
+    """
+    keys = current[key_column].astype(str)
+    new_values = changes.assign(**{key_column: changes[key_column].astype(str)}).drop_duplicates(key_column, keep='last').set_index(key_column)
+    changed = pd.Series(False, index=current.index)
+    updated = current
+    for col in new_values.columns:
+        # Object dtype: the unmatched rows (NaN) must not turn an integer password into a float
+        values = keys.map(new_values[col].astype(object))
+        mask = keys.isin(new_values.index) & (current[col].astype(str) != values.astype(str)) if col in current.columns else None
+        if mask is None or not mask.any():
+            continue
+        if updated is current:
+            updated = current.copy()
+        updated[col] = updated[col].astype(object)
+        updated.loc[mask, col] = values[mask]
+        changed |= mask
+    return updated, int(changed.sum())
+
+
+def update_rows_in_place(store, file_name, key_column, changes, sep=';', encoding='utf-8'):
+    """
+    Applies changed values to some rows of a file through the read-modify-write of store.update,
+    which only rewrites the file if a value actually differs from its current content.
+
+    Parameters:
+    - store (CsvTableStore or SqliteTableStore): The table store holding the file.
+    - file_name (str): The name of the file.
+    - key_column (str): The column identifying the rows (e.g. 'ARC').
+    - changes (pandas.DataFrame): The key_column and the new values, one row per changed row.
+    - sep (str, optional): The column separator. Defaults to ';'.
+    - encoding (str, optional): The encoding. Defaults to 'utf-8'.
+
+    Returns:
+    - int: The number of rows updated.
+    """
+    counts = []
+
+    def apply(current):
+        if current is None or changes.empty:
+            return None
+        updated, count = apply_row_changes(current, key_column, changes)
+        counts.append(count)
+        return updated if count else None
+
+    store.update(file_name, apply, sep=sep, encoding=encoding)
+    return sum(counts)
+
+
+class CsvTableStore:
+    """
+    The other files of the "imotion" folder (Ongoing_{arc}.csv, STUDY.csv, ARC_MDP.csv), stored as CSV files
+    read through the process-wide cache.
+    """
+    name = "csv"
+
+    def __init__(self, folder=DATA_FOLDER):
+        self.folder = folder
+
+    def path(self, file_name):
+        return os.path.join(self.folder, file_name)
+
+    def exists(self, file_name):
+        return os.path.exists(self.path(file_name))
+
+    def version(self, file_name):
+        """
+        Returns a cheap version stamp of a file, which changes on every write.
+
+        Raises:
+        - FileNotFoundError: If the file does not exist.
+        """
+        return file_version(self.path(file_name))
+
+    def read(self, file_name, sep=';', encoding='utf-8', copy=True, filters=None):
+        """
+        Reads a file of the data folder.
+
+        Parameters:
+        - file_name (str): The name of the file.
+        - sep (str, optional): The column separator. Defaults to ';'.
+        - encoding (str, optional): The encoding. Defaults to 'utf-8'.
+        - copy (bool, optional): Return a private copy of the cached DataFrame. Defaults to True.
+        - filters (dict, optional): Equality filters {column: value}. Defaults to None.
+
+        Returns:
+        - pandas.DataFrame: The content of the file.
+
+        Raises:
+        - FileNotFoundError: If the file does not exist.
+        """
+        df = read_csv_cached(self.path(file_name), sep=sep, encoding=encoding, copy=copy and not filters)
+        for col, value in (filters or {}).items():
+            if value is not None:
+                df = df[df[col] == value]
+        return df
+
+    def write(self, file_name, df, sep=';', encoding='utf-8'):
+        """
+        Replaces the content of a file through an atomic rename, under the exclusive lock of the file.
+
+        Parameters:
+        - file_name (str): The name of the file.
+        - df (pandas.DataFrame): The new content.
+        - sep (str, optional): The column separator. Defaults to ';'.
+        - encoding (str, optional): The encoding. Defaults to 'utf-8'.
+
+        Returns:
+        None
+        """
+        with path_lock(self.path(file_name)):
+            atomic_write_csv(df, self.path(file_name), sep=sep, encoding=encoding)
+
+    def update(self, file_name, function, sep=';', encoding='utf-8'):
+        """
+        Read-modify-write of a file under its exclusive lock: the function receives the current content,
+        so that concurrent updates from other sessions or processes are never overwritten.
+
+        Parameters:
+        - file_name (str): The name of the file.
+        - function (callable): Receives the current content (None if the file does not exist) and returns
+          the new content, or None to leave the file unchanged.
+        - sep (str, optional): The column separator. Defaults to ';'.
+        - encoding (str, optional): The encoding. Defaults to 'utf-8'.
+
+        Returns:
+        - pandas.DataFrame: The content of the file after the update.
+        """
+        with path_lock(self.path(file_name)):
+            current = self.read(file_name, sep=sep, encoding=encoding) if self.exists(file_name) else None
+            updated = function(current)
+            if updated is None:
+                return current
+            self.write(file_name, updated, sep=sep, encoding=encoding)
+            return updated
+
+    def update_rows(self, file_name, key_column, changes, sep=';', encoding='utf-8'):
+        """
+        Applies changed values to some rows of a file, under its exclusive lock. The file is only rewritten
+        if a value actually differs from its current content.
+
+        Parameters:
+        - file_name (str): The name of the file.
+        - key_column (str): The column identifying the rows (e.g. 'ARC').
+        - changes (pandas.DataFrame): The key_column and the new values, one row per changed row.
+        - sep (str, optional): The column separator. Defaults to ';'.
+        - encoding (str, optional): The encoding. Defaults to 'utf-8'.
+
+        Returns:
+        - int: The number of rows updated.
+        """
+        return update_rows_in_place(self, file_name, key_column, changes, sep=sep, encoding=encoding)
+
+    def delete(self, file_name):
+        """
+        Deletes a file of the data folder.
+
+        Parameters:
+        - file_name (str): The name of the file.
+
+        Returns:
+        - bool: True if the file existed.
+        """
+        with path_lock(self.path(file_name)):
+            if not self.exists(file_name):
+                return False
+            os.remove(self.path(file_name))
+            invalidate(self.path(file_name))
+        return True
+
+
+class SqliteTableStore:
+    """
+    The other files of the "imotion" folder, stored in the SQLite database. The Ongoing_{arc}.csv files
+    share the indexed "ongoing_entries" table (one ARC per file); the other files are one table each.
+    """
+    name = "sqlite"
+
+    def __init__(self, folder=DATA_FOLDER):
+        self.folder = folder
+
+    @staticmethod
+    def _table(file_name):
+        base = file_name[:-len(".csv")] if file_name.endswith(".csv") else file_name
+        if base.startswith("Ongoing_"):
+            return 'ongoing_entries', base[len("Ongoing_"):]
+        return "file_" + "".join(char if char.isalnum() else "_" for char in base).lower(), None
+
+    def path(self, file_name):
+        return os.path.join(self.folder, SQLITE_FILE)
+
+    def exists(self, file_name):
+        conn = sqlite_connection(self.folder)
+        return conn.execute("SELECT 1 FROM stored_files WHERE NAME = ?", (file_name,)).fetchone() is not None
+
+    def version(self, file_name):
+        conn = sqlite_connection(self.folder)
+        row = conn.execute("SELECT VERSION FROM stored_files WHERE NAME = ?", (file_name,)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Le fichier {file_name} n'existe pas dans la base '{self.path(file_name)}'.")
+        return row[0]
+
+    def read(self, file_name, sep=';', encoding='utf-8', copy=True, filters=None):
+        if not self.exists(file_name):
+            raise FileNotFoundError(f"Le fichier {file_name} n'existe pas dans la base '{self.path(file_name)}'.")
+        table, arc = self._table(file_name)
+        conn = sqlite_connection(self.folder)
+        if arc is not None:
+            where, params = _where({'ARC': arc, **(filters or {})})
+            columns = ", ".join(_quote(col) for col in CATEGORIES)
+            return _from_sql_rows(pd.read_sql_query(f"SELECT {columns} FROM ongoing_entries{where} ORDER BY rowid", conn, params=params))
+        where, params = _where(filters or {})
+        return pd.read_sql_query(f"SELECT * FROM {_quote(table)}{where}", conn, params=params)
+
+    def write(self, file_name, df, sep=';', encoding='utf-8'):
+        table, arc = self._table(file_name)
+        conn = sqlite_connection(self.folder)
+        with conn:
+            if arc is not None:
+                conn.execute("DELETE FROM ongoing_entries WHERE ARC = ?", (arc,))
+                rows = _sql_rows(df, arc)
+                if not rows.empty:
+                    columns = ", ".join(_quote(col) for col in rows.columns)
+                    placeholders = ", ".join("?" for _ in rows.columns)
+                    values = rows.astype(object).where(rows.notna(), None).itertuples(index=False, name=None)
+                    conn.executemany(f"INSERT INTO ongoing_entries ({columns}) VALUES ({placeholders})", values)
+            else:
+                df.to_sql(table, conn, if_exists='replace', index=False)
+            conn.execute("INSERT INTO stored_files (NAME, VERSION) VALUES (?, 1) "
+                         "ON CONFLICT(NAME) DO UPDATE SET VERSION = VERSION + 1", (file_name,))
+
+    def update(self, file_name, function, sep=';', encoding='utf-8'):
+        # Same contract as CsvTableStore.update; the lock of the database file serializes the updates
+        with path_lock(self.path(file_name)):
+            current = self.read(file_name) if self.exists(file_name) else None
+            updated = function(current)
+            if updated is None:
+                return current
+            self.write(file_name, updated)
+            return updated
+
+    def update_rows(self, file_name, key_column, changes, sep=';', encoding='utf-8'):
+        # Same contract as CsvTableStore.update_rows, with one UPDATE statement per changed row in a single transaction
+        table, arc = self._table(file_name)
+        if arc is not None or changes.empty or not self.exists(file_name):
+            return update_rows_in_place(self, file_name, key_column, changes)
+        columns = [col for col in changes.columns if col != key_column]
+        assignments = ", ".join(f"{_quote(col)} = ?" for col in columns)
+        differs = " OR ".join(f"CAST({_quote(col)} AS TEXT) IS NOT ?" for col in columns)
+        statement = f"UPDATE {_quote(table)} SET {assignments} WHERE CAST({_quote(key_column)} AS TEXT) = ? AND ({differs})"
+        rows = changes.astype(object).where(changes.notna(), None)
+        with path_lock(self.path(file_name)):
+            conn = sqlite_connection(self.folder)
+            with conn:
+                count = 0
+                for row in rows.to_dict('records'):
+                    values = [row[col] for col in columns]
+                    text_values = [None if value is None else str(value) for value in values]
+                    count += conn.execute(statement, values + [str(row[key_column])] + text_values).rowcount
+                if count:
+                    conn.execute("UPDATE stored_files SET VERSION = VERSION + 1 WHERE NAME = ?", (file_name,))
+        return count
+
+    def delete(self, file_name):
+        if not self.exists(file_name):
+            return False
+        table, arc = self._table(file_name)
+        conn = sqlite_connection(self.folder)
+        with conn:
+            if arc is not None:
+                conn.execute("DELETE FROM ongoing_entries WHERE ARC = ?", (arc,))
+            else:
+                conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+            conn.execute("DELETE FROM stored_files WHERE NAME = ?", (file_name,))
+        return True
+
+
+# ========================================================================================================================================
+# BACKEND SELECTION
+TIME_STORES = {
+    CsvTimeStore.name: CsvTimeStore,
+    ParquetTimeStore.name: ParquetTimeStore,
+    SqliteTimeStore.name: SqliteTimeStore,
+}
+# The Parquet backend only covers the histories: the other files stay in CSV
+TABLE_STORES = {
+    CsvTimeStore.name: CsvTableStore,
+    ParquetTimeStore.name: CsvTableStore,
+    SqliteTimeStore.name: SqliteTableStore,
+}
+
+
+def get_time_store(backend=None, folder=DATA_FOLDER):
+    """
+    Returns the storage backend of the time history.
+
+    Parameters:
+    - backend (str, optional): "csv", "parquet" or "sqlite". Defaults to the IMOTION_BACKEND environment variable, then "csv".
+    - folder (str, optional): The data folder. Defaults to "imotion".
+
+    Returns:
+    - CsvTimeStore, ParquetTimeStore or SqliteTimeStore: The backend instance.
+
+    Raises:
+    - ValueError: If the backend name is unknown.
+    """
+    backend = backend or os.getenv(BACKEND_ENV_VAR, DEFAULT_BACKEND)
+    if backend not in TIME_STORES:
+        raise ValueError(f"Backend de stockage inconnu : {backend}. Valeurs possibles : {', '.join(TIME_STORES)}.")
+    return TIME_STORES[backend](folder)
+
+
+def get_table_store(backend=None, folder=DATA_FOLDER):
+    """
+    Returns the storage backend of the other files of the data folder (Ongoing_*, STUDY.csv, ARC_MDP.csv).
+
+    Parameters:
+    - backend (str, optional): Same values as get_time_store. Defaults to the IMOTION_BACKEND environment variable.
+    - folder (str, optional): The data folder. Defaults to "imotion".
+
+    Returns:
+    - CsvTableStore or SqliteTableStore: The backend instance.
+
+    Raises:
+    - ValueError: If the backend name is unknown.
+    """
+    backend = backend or os.getenv(BACKEND_ENV_VAR, DEFAULT_BACKEND)
+    if backend not in TABLE_STORES:
+        raise ValueError(f"Backend de stockage inconnu : {backend}. Valeurs possibles : {', '.join(TABLE_STORES)}.")
+    return TABLE_STORES[backend](folder)
+
+
+def load_all_histories(arcs=None, max_workers=8, store=None):
+    """
+    Loads the history of several ARCs in parallel and returns a single typed fact table.
+    Each history is read on a thread pool, tagged with its ARC, and all of them are concatenated in one step.
+
+    Parameters:
+    - arcs (list, optional): The ARCs to load. Defaults to every ARC of the store.
+    - max_workers (int, optional): Size of the thread pool. Defaults to 8.
+    - store (optional): The time store to read from. Defaults to get_time_store().
+
+    Returns:
+    - tuple: (pandas.DataFrame, dict)
+        - The fact table with the CATEGORIES columns plus 'ARC', with integer YEAR/WEEK and numeric measures.
+        - A report per ARC: {'seconds': float, 'rows': int, 'error': str or None}.
+    """
+    store = store or get_time_store()
+    arcs = store.list_arcs() if arcs is None else list(arcs)
+
+    def load_one(arc):
+        start = time.perf_counter()
+        try:
+            df = normalize_time_frame(store.load(arc))
+            error = None
+        except Exception as e:
+            df, error = None, str(e)
+        return arc, df, {'seconds': time.perf_counter() - start, 'rows': 0 if df is None else len(df), 'error': error}
+
+    report = {}
+    frames = []
+    if arcs:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(arcs))) as pool:
+            for arc, df, arc_report in pool.map(load_one, arcs):
+                report[arc] = arc_report
+                if df is not None:
+                    frames.append(df.assign(ARC=arc))
+
+    if not frames:
+        return pd.DataFrame(columns=CATEGORIES + ['ARC']), report
+    return pd.concat(frames, ignore_index=True), report
+
+
+# ========================================================================================================================================
+# MIGRATION
+def migrate_csv_to_parquet(folder=DATA_FOLDER):
+    """
+    Converts every "Time_{arc}.csv" file of the data folder into a partitioned Parquet dataset.
+    The CSV files are left in place so that the migration can be replayed or rolled back.
+
+    Parameters:
+    - folder (str, optional): The data folder. Defaults to "imotion".
+
+    Returns:
+    - dict: Number of migrated rows per ARC.
+    """
+    source = CsvTimeStore(folder)
+    target = ParquetTimeStore(folder)
+    report = {}
+    for arc in sorted(source.list_arcs()):
+        df = source.load(arc)
+        target.save(arc, df)
+        report[arc] = len(df)
+        print(f"Time_{arc}.csv : {len(df)} lignes migrées vers {target.path(arc)}")
+    return report
+
+
+def migrate_csv_to_sqlite(folder=DATA_FOLDER):
+    """
+    Copies every CSV file of the data folder (Time_*, Ongoing_*, STUDY.csv, ARC_MDP.csv) into the SQLite database.
+    The CSV files are left in place.
+
+    Parameters:
+    - folder (str, optional): The data folder. Defaults to "imotion".
+
+    Returns:
+    - dict: Number of migrated rows per file.
+    """
+    source_times, target_times = CsvTimeStore(folder), SqliteTimeStore(folder)
+    source_tables, target_tables = CsvTableStore(folder), SqliteTableStore(folder)
+    report = {}
+    for arc in sorted(source_times.list_arcs()):
+        df = source_times.load(arc)
+        target_times.save(arc, df)
+        report[time_file_name(arc)] = len(df)
+    for file_name in sorted(os.listdir(folder)):
+        if file_name.endswith(".csv") and not file_name.startswith("Time_"):
+            df = source_tables.read(file_name)
+            target_tables.write(file_name, df)
+            report[file_name] = len(df)
+    for file_name, rows in report.items():
+        print(f"{file_name} : {rows} lignes migrées vers {os.path.join(folder, SQLITE_FILE)}")
+    return report
+
+
+def compact_all(folder=DATA_FOLDER):
+    """
+    Folds the week logs of every ARC into their Time files.
+
+    Parameters:
+    - folder (str, optional): The data folder. Defaults to "imotion".
+
+    Returns:
+    - list: The ARCs whose log was compacted.
+    """
+    store = get_time_store(folder=folder)
+    compacted = [arc for arc in sorted(store.list_arcs()) if store.compact(arc)]
+    for arc in compacted:
+        print(f"Journal de Time_{arc} compacté.")
+    return compacted
+
+
+#####################################################################
+# ========================== ALGO LAUNCH ========================== #
+#####################################################################
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    folder = sys.argv[2] if len(sys.argv) > 2 else DATA_FOLDER
+    if command == "migrate_to_parquet":
+        migrate_csv_to_parquet(folder)
+    elif command == "migrate_to_sqlite":
+        migrate_csv_to_sqlite(folder)
+    elif command == "compact":
+        compact_all(folder)
+    else:
+        print("Usage : python imotion_storage.py [migrate_to_parquet|migrate_to_sqlite|compact] [dossier]")
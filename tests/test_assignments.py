@@ -0,0 +1,58 @@
+import pandas as pd
+
+from imotion_assignments import STUDY_FILE, StudyAssignmentIndex, get_assignment_index, update_assignment_index
+from imotion_storage import CsvTableStore
+
+
+def baseline_roles(df_study, arc):
+    # The per-row apply of the baseline load_assigned_studies_with_roles
+    df_study = df_study.copy()
+    df_study['ROLE'] = df_study.apply(lambda row: 'Principal' if row['ARC'] == arc else 'Backup' if row['ARC_BACKUP'] == arc else None, axis=1)
+    return df_study[df_study['ROLE'].notnull()]
+
+
+def baseline_studies(df_study, arc):
+    # The filter of the baseline load_assigned_studies
+    return df_study[(df_study['ARC'] == arc) | (df_study['ARC_BACKUP'] == arc)]['STUDY'].tolist()
+
+
+def study_file(tmp_path):
+    store = CsvTableStore(str(tmp_path))
+    store.write(STUDY_FILE, pd.DataFrame({
+        'STUDY': ["S1", "S2", "S3", "S4", "S5"],
+        'ARC': ["A", "B", "A", "C", "B"],
+        'ARC_BACKUP': ["B", "A", "A", None, None],
+    }))
+    return store
+
+
+def test_index_matches_the_baseline_per_row_apply(tmp_path):
+    store = study_file(tmp_path)
+    df_study = store.read(STUDY_FILE)
+    index = StudyAssignmentIndex(df_study)
+
+    for arc in ["A", "B", "C", "UNKNOWN"]:
+        pd.testing.assert_frame_equal(index.frame_of(arc), baseline_roles(df_study, arc))
+        assert index.studies_of(arc) == baseline_studies(df_study, arc)
+    assert index.roles_of("A") == [("S1", "Principal"), ("S2", "Backup"), ("S3", "Principal")]
+    assert index.arcs_of("S4") == ("C", None)
+
+
+def test_index_is_rebuilt_when_the_study_file_changes(tmp_path):
+    store = study_file(tmp_path)
+    first = get_assignment_index(store)
+    assert get_assignment_index(store) is first
+
+    df_study = store.read(STUDY_FILE)
+    df_study.loc[df_study['STUDY'] == "S4", 'ARC_BACKUP'] = "A"
+    store.write(STUDY_FILE, df_study)
+    rebuilt = get_assignment_index(store)
+    assert rebuilt is not first
+    assert rebuilt.studies_of("A") == ["S1", "S2", "S3", "S4"]
+
+    # A save made by the app replaces the index without reading the file back
+    df_study = df_study[df_study['STUDY'] != "S1"]
+    store.write(STUDY_FILE, df_study)
+    updated = update_assignment_index(df_study, store)
+    assert get_assignment_index(store) is updated
+    assert updated.studies_of("A") == ["S2", "S3", "S4"]
@@ -0,0 +1,81 @@
+import os
+import pandas as pd
+import pytest
+
+pytest.importorskip("streamlit")
+import time_entry_online
+from time_entry_online import auto_save_arc, calculate_weeks, main_auto_save_all, main_auto_save_cli
+from imotion_storage import CATEGORIES, DATA_FOLDER, get_table_store, get_time_store
+
+
+def data_folder(tmp_path, monkeypatch, arcs=("A", "B", "C")):
+    # The batch works on the "imotion" folder of the current directory
+    monkeypatch.chdir(tmp_path)
+    folder = tmp_path / DATA_FOLDER
+    folder.mkdir()
+    store = get_table_store()
+    store.write("ARC_MDP.csv", pd.DataFrame({'ARC': list(arcs), 'MDP': ["mdp"] * len(arcs)}))
+    store.write("STUDY.csv", pd.DataFrame({
+        'STUDY': ["S1", "S2", "S3"],
+        'ARC': ["A", "B", "A"],
+        'ARC_BACKUP': ["B", None, None],
+    }))
+    return folder
+
+
+def snapshot(folder):
+    # Lock files (".<name>.lock") and the SQLite shared-memory index are touched by the readers too
+    return {path: open(os.path.join(root, path), 'rb').read()
+            for root, _, files in os.walk(folder) for path in files if not path.endswith((".lock", "-shm"))}
+
+
+def test_a_failing_arc_does_not_stop_the_others(tmp_path, monkeypatch):
+    data_folder(tmp_path, monkeypatch)
+    save_week_data = time_entry_online.save_week_data
+
+    def failing_save(df_week, arc, weeks):
+        if arc == "B":
+            raise OSError("disque plein")
+        save_week_data(df_week, arc, weeks)
+
+    monkeypatch.setattr(time_entry_online, "save_week_data", failing_save)
+    reports = {report['arc']: report for report in main_auto_save_all(workers=3)}
+
+    _, _, week, _, year = calculate_weeks()
+    assert reports["A"]['error'] is None
+    assert "disque plein" in reports["B"]['error']
+    # C has no study assigned
+    assert reports["C"]['error'] is not None
+    saved = get_time_store().load("A", year=year, week=week)
+    assert sorted(saved['STUDY']) == ["S1", "S3"]
+    assert list(saved.columns) == CATEGORIES
+
+
+def test_dry_run_writes_nothing(tmp_path, monkeypatch):
+    folder = data_folder(tmp_path, monkeypatch, arcs=("A", "B"))
+    before = snapshot(folder)
+
+    reports = main_auto_save_all(workers=2, dry_run=True)
+
+    assert [(report['arc'], report['error'], report['rows'], report['added']) for report in reports] == [
+        ("A", None, 2, 2), ("B", None, 2, 2)]
+    assert snapshot(folder) == before
+
+
+def test_dry_run_reports_the_changes_of_an_existing_week(tmp_path, monkeypatch):
+    data_folder(tmp_path, monkeypatch, arcs=("A",))
+    _, _, week, _, year = calculate_weeks()
+    assert auto_save_arc("A", year, week)['added'] == 2
+
+    report = auto_save_arc("A", year, week, dry_run=True)
+    assert (report['error'], report['added'], report['removed'], report['modified']) == (None, 0, 0, 0)
+
+
+def test_exit_code_is_non_zero_when_an_arc_fails(tmp_path, monkeypatch):
+    data_folder(tmp_path, monkeypatch, arcs=("A", "B"))
+    assert main_auto_save_cli(["--workers", "2"]) == 0
+
+    # C has no study assigned
+    get_table_store().write("ARC_MDP.csv", pd.DataFrame({'ARC': ["A", "C"], 'MDP': ["mdp", "mdp"]}))
+    time_entry_online.get_arc_registry().refresh()
+    assert main_auto_save_cli(["--dry-run"]) == 1
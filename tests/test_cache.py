@@ -0,0 +1,61 @@
+import pandas as pd
+
+from imotion_cache import read_csv_cached, cache_stats, invalidate
+from imotion_storage import CATEGORIES, CsvTableStore, CsvTimeStore
+
+
+def write(path, df):
+    df.to_csv(path, sep=';', index=False)
+
+
+def test_repeated_read_is_a_hit(tmp_path):
+    path = str(tmp_path / "STUDY.csv")
+    write(path, pd.DataFrame({'STUDY': ["S1", "S2"]}))
+
+    first = read_csv_cached(path)
+    hits = cache_stats()['hits']
+    assert read_csv_cached(path) is first
+    assert cache_stats()['hits'] == hits + 1
+
+
+def test_rewritten_file_is_a_miss(tmp_path):
+    path = str(tmp_path / "STUDY.csv")
+    write(path, pd.DataFrame({'STUDY': ["S1"]}))
+    assert list(read_csv_cached(path)['STUDY']) == ["S1"]
+
+    write(path, pd.DataFrame({'STUDY': ["S1", "S2"]}))
+    misses = cache_stats()['misses']
+    assert list(read_csv_cached(path)['STUDY']) == ["S1", "S2"]
+    assert cache_stats()['misses'] == misses + 1
+
+
+def test_invalidate_forces_a_new_read(tmp_path):
+    path = str(tmp_path / "STUDY.csv")
+    write(path, pd.DataFrame({'STUDY': ["S1"]}))
+    first = read_csv_cached(path)
+    invalidate(path)
+    assert read_csv_cached(path) is not first
+
+
+def test_callers_cannot_change_the_cached_frame(tmp_path):
+    path = str(tmp_path / "STUDY.csv")
+    write(path, pd.DataFrame({'STUDY': ["S1"], 'ARC': ["A"]}))
+
+    copy = read_csv_cached(path, copy=True)
+    copy.loc[0, 'STUDY'] = "CHANGED"
+    copy['NEW'] = 1
+    cached = read_csv_cached(path)
+    assert list(cached['STUDY']) == ["S1"] and 'NEW' not in cached.columns
+
+    # The store readers hand out copies by default
+    table = CsvTableStore(str(tmp_path)).read("STUDY.csv")
+    table.loc[0, 'ARC'] = "B"
+    assert list(read_csv_cached(path)['ARC']) == ["A"]
+
+    times = CsvTimeStore(str(tmp_path))
+    times.save("A", pd.DataFrame([{'YEAR': 2024, 'WEEK': 1, 'STUDY': "S1", 'TOTAL': 1.0}]).reindex(columns=CATEGORIES))
+    history = times.load("A")
+    history['ARC'] = "A"
+    history.loc[0, 'TOTAL'] = 99.0
+    assert 'ARC' not in times.load("A").columns
+    assert list(times.load("A")['TOTAL']) == [1.0]
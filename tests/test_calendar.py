@@ -0,0 +1,43 @@
+import datetime
+import pandas as pd
+
+from imotion_calendar import (week_key, weeks_in_year, week_dates, iso_week, shift_week, last_weeks,
+                              month_week_keys, filter_month)
+
+
+def test_weeks_in_long_and_short_years():
+    assert weeks_in_year(2020) == 53
+    assert weeks_in_year(2021) == 52
+    assert weeks_in_year(2026) == 53
+    # Outside the precomputed calendar
+    assert weeks_in_year(2200) == datetime.date(2200, 12, 28).isocalendar()[1]
+
+
+def test_week_53_belongs_to_december():
+    assert list(month_week_keys(2020, 12)) == [202049, 202050, 202051, 202052, 202053]
+    assert week_dates(2020, 53) == (datetime.date(2020, 12, 28), datetime.date(2021, 1, 3))
+
+
+def test_first_weeks_of_january_after_a_long_year():
+    assert list(month_week_keys(2021, 1)) == [202101, 202102, 202103, 202104]
+    assert iso_week(datetime.date(2021, 1, 2)) == (2020, 53)
+    assert iso_week(datetime.date(2021, 1, 4)) == (2021, 1)
+
+
+def test_shift_week_across_the_year_boundary():
+    assert shift_week(2020, 53, 1) == (2021, 1)
+    assert shift_week(2021, 1, -1) == (2020, 53)
+    assert shift_week(2021, 52, 1) == (2022, 1)
+    assert shift_week(2022, 1, -1) == (2021, 52)
+
+
+def test_last_weeks_across_the_year_boundary():
+    assert last_weeks(2021, 2, 4) == [(2020, 52), (2020, 53), (2021, 1), (2021, 2)]
+    assert last_weeks(2022, 1, 2) == [(2021, 52), (2022, 1)]
+
+
+def test_filter_month_keeps_the_weeks_of_the_month_only():
+    df = pd.DataFrame({'YEAR': [2020, 2020, 2021, 2021, 2021], 'WEEK': [48, 53, 1, 4, 5], 'TOTAL': [1, 2, 3, 4, 5]})
+    assert list(filter_month(df, 2020, 12)['TOTAL']) == [2]
+    assert list(filter_month(df, 2021, 1)['TOTAL']) == [3, 4]
+    assert week_key(2020, 53) == 202053
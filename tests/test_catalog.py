@@ -0,0 +1,37 @@
+import threading
+import pandas as pd
+import pytest
+
+import imotion_catalog
+from imotion_catalog import catalog_study_names, load_study_catalog, update_study_catalog
+from imotion_storage import CATEGORIES, CsvTimeStore, SqliteTimeStore
+
+
+def week_rows(year, week, study):
+    return pd.DataFrame([{'YEAR': year, 'WEEK': week, 'STUDY': study, 'TOTAL': 1.0}]).reindex(columns=CATEGORIES)
+
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite"])
+def test_save_during_lazy_rebuild_is_merged(tmp_path, monkeypatch, backend):
+    folder = str(tmp_path)
+    monkeypatch.setenv("IMOTION_BACKEND", backend)
+    store = CsvTimeStore(folder) if backend == "csv" else SqliteTimeStore(folder)
+    store.save("A", week_rows(2024, 5, "S1"))
+    saves = []
+    original = imotion_catalog.load_all_histories
+
+    def load_then_save(**kwargs):
+        # A session saves a new study right after the rebuild has read the histories
+        facts = original(**kwargs)
+        store.replace_weeks("B", week_rows(2024, 6, "S2"), [(2024, 6)])
+        saves.append(threading.Thread(target=update_study_catalog, args=("B", week_rows(2024, 6, "S2"), folder)))
+        saves[-1].start()
+        return facts
+
+    monkeypatch.setattr(imotion_catalog, "load_all_histories", load_then_save)
+    catalog_study_names(folder)
+    saves[0].join()
+
+    catalog = load_study_catalog(folder)
+    assert list(catalog['STUDY']) == ["S1", "S2"]
+    assert list(catalog['ARCS']) == ["A", "B"]
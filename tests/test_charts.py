@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+
+import imotion_charts
+from imotion_cache import LRUCache
+from imotion_charts import chart_key, render_chart
+
+
+def weekly_totals():
+    return pd.DataFrame({'WEEK': [1, 2, 3], 'Total Time': [7.5, 8.0, 6.25]}).set_index('WEEK')
+
+
+def test_same_content_gives_the_same_key():
+    params = {'title': "Temps total", 'week': 3}
+    # A rebuilt frame with the same content, and the same parameters in another order
+    assert chart_key("plot", [weekly_totals()], params) == chart_key("plot", [weekly_totals().copy()], {'week': 3, 'title': "Temps total"})
+    assert chart_key("other_plot", [weekly_totals()], params) != chart_key("plot", [weekly_totals()], params)
+
+
+@pytest.mark.parametrize("change", [
+    lambda frame, params: (frame.assign(**{'Total Time': [7.5, 8.0, 6.5]}), params),
+    lambda frame, params: (frame.rename(index={3: 4}), params),
+    lambda frame, params: (frame.rename(columns={'Total Time': "Temps"}), params),
+    lambda frame, params: (frame, {**params, 'week': 4}),
+])
+def test_changed_data_or_parameters_give_another_key(change):
+    frame, params = weekly_totals(), {'title': "Temps total", 'week': 3}
+    changed_frame, changed_params = change(frame, params)
+    assert chart_key("plot", [changed_frame], changed_params) != chart_key("plot", [frame], params)
+
+
+def test_render_is_only_called_on_a_miss(monkeypatch):
+    plt = pytest.importorskip("matplotlib.pyplot")
+    monkeypatch.setattr(imotion_charts, "_CHART_CACHE", LRUCache(1024 * 1024))
+    calls = []
+
+    def render(frame):
+        def draw():
+            calls.append(frame)
+            fig, ax = plt.subplots()
+            ax.plot(frame.index, frame['Total Time'])
+            return fig
+        return draw
+
+    frame = weekly_totals()
+    first, report = render_chart("plot", render(frame), [frame], {'week': 3})
+    assert not report['hit'] and len(calls) == 1
+
+    again = weekly_totals()
+    second, report = render_chart("plot", render(again), [again], {'week': 3})
+    assert report['hit'] and second == first and len(calls) == 1
+
+    changed = frame.assign(**{'Total Time': [1.0, 2.0, 3.0]})
+    _, report = render_chart("plot", render(changed), [changed], {'week': 3})
+    assert not report['hit'] and len(calls) == 2
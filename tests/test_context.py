@@ -0,0 +1,39 @@
+import collections
+import pandas as pd
+
+from imotion_context import RequestContext
+from imotion_storage import CATEGORIES, CsvTimeStore, CsvTableStore
+
+
+def counting(calls, name, method):
+    def wrapper(file_name, *args, **kwargs):
+        calls[f"{name}:{file_name}"] += 1
+        return method(file_name, *args, **kwargs)
+    return wrapper
+
+
+def test_one_rerun_reads_each_shared_file_once(tmp_path):
+    folder = str(tmp_path)
+    time_store, table_store = CsvTimeStore(folder), CsvTableStore(folder)
+    time_store.save("A", pd.DataFrame([{'YEAR': 2024, 'WEEK': week, 'STUDY': "S1", 'TOTAL': 1.0} for week in (4, 5)]).reindex(columns=CATEGORIES))
+    table_store.write("Ongoing_A.csv", pd.DataFrame([{'YEAR': 2024, 'WEEK': 5, 'STUDY': "S1"}]).reindex(columns=CATEGORIES))
+    table_store.write("STUDY.csv", pd.DataFrame({'STUDY': ["S1", "S2"], 'ARC': ["A", "B"], 'ARC_BACKUP': ["B", "A"]}))
+
+    calls = collections.Counter()
+    time_store.load = counting(calls, "load", time_store.load)
+    table_store.read = counting(calls, "read", table_store.read)
+    context = RequestContext("A", time_store=time_store, table_store=table_store)
+
+    # The calls of one rerun of the time entry page: current week, assignments, Ongoing file, history view
+    context.time_rows(5)
+    context.assigned_studies()
+    context.weekly_rows(5)
+    context.assigned_roles()
+    context.time_rows(4, year=2024)
+    context.time_rows(5, year=2024)
+    context.weekly_rows(5)
+
+    assert context.reads == {"Time_A.csv": 1, "Ongoing_A.csv": 1, "STUDY.csv": 1}
+    assert calls == {"load:A": 1, "read:Ongoing_A.csv": 1, "read:STUDY.csv": 1}
+    assert context.assigned_studies() == ["S1", "S2"]
+    assert list(context.assigned_roles()['ROLE']) == ["Principal", "Backup"]
@@ -0,0 +1,42 @@
+import io
+import zipfile
+import pandas as pd
+
+import imotion_export
+import imotion_storage
+from imotion_export import export_csv_zip, iter_history_chunks
+from imotion_storage import CATEGORIES, CsvTimeStore, SqliteTimeStore
+
+
+def history(years, rows_per_year):
+    rows = [{'YEAR': year, 'WEEK': 1 + i % 52, 'STUDY': f"S{i % 3}", 'TOTAL': 1.0} for year in years for i in range(rows_per_year)]
+    return pd.DataFrame(rows).reindex(columns=CATEGORIES)
+
+
+def test_csv_history_is_read_in_chunks_without_the_read_cache(tmp_path, monkeypatch):
+    store = CsvTimeStore(str(tmp_path), save_mode="week")
+    store.save("A", history([2022, 2023, 2024], 20))
+    replacement = history([2024], 1).assign(WEEK=1, STUDY="NEW")
+    store.replace_weeks("A", replacement, [(2024, 1)])
+
+    monkeypatch.setattr(imotion_export, "EXPORT_CHUNK_ROWS", 7)
+    monkeypatch.setattr(imotion_storage, "read_csv_cached", lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("cache used")))
+    chunks = [chunk for _, chunk in iter_history_chunks(["A"], years=(2023, 2024), store=store)]
+
+    assert max(len(chunk) for chunk in chunks) <= 7
+    exported = pd.concat(chunks, ignore_index=True)
+    assert set(exported['YEAR']) == {2023, 2024}
+    week_1_2024 = exported[(exported['YEAR'] == 2024) & (exported['WEEK'] == 1)]
+    assert list(week_1_2024['STUDY']) == ["NEW"]
+    assert len(exported) == 20 + 20 - 1 + 1
+
+
+def test_backends_export_the_same_rows(tmp_path):
+    outputs = []
+    for store in [CsvTimeStore(str(tmp_path / "csv")), SqliteTimeStore(str(tmp_path / "sqlite"))]:
+        store.save("A", history([2023, 2024], 10))
+        output = tmp_path / f"{store.name}.zip"
+        assert export_csv_zip(str(output), ["A"], years=(2024, 2024), studies=["S1", "S2"], store=store)['rows'] == 6
+        with zipfile.ZipFile(output) as archive:
+            outputs.append(pd.read_csv(io.BytesIO(archive.read("Time_A.csv")), sep=';')[['ARC', 'YEAR', 'WEEK', 'STUDY']])
+    pd.testing.assert_frame_equal(outputs[0], outputs[1])
@@ -0,0 +1,86 @@
+import pandas as pd
+
+from imotion_reconcile import reconcile_week, empty_week_rows
+from imotion_storage import CATEGORIES, ACTION_CAT, normalize_time_frame
+
+YEAR, WEEK = 2026, 42
+
+
+def baseline_reconcile(ongoing_df, time_df, assigned_studies, year, week):
+    # The row-wise reconciliation of the baseline time_entry_online.main, kept as the reference semantics
+    merged_df = pd.merge(ongoing_df, time_df, on=['YEAR', 'WEEK', 'STUDY'], suffixes=('_ongoing', '_time'), how='outer')
+    assigned_studies = set(assigned_studies)
+    merged_df = merged_df[merged_df['STUDY'].isin(assigned_studies)]
+    columns_to_update = CATEGORIES[3:]
+    for col in columns_to_update:
+        merged_df[col + '_ongoing'] = merged_df.apply(
+            lambda row: row[col + '_time'] if not pd.isna(row[col + '_time']) and row[col + '_ongoing'] == 0 else row[col + '_ongoing'], axis=1)
+    for study in assigned_studies:
+        if study not in merged_df['STUDY'].tolist():
+            new_row_data = {'YEAR': year, 'WEEK': week, 'STUDY': study}
+            new_row_data.update({col + '_ongoing': 0 for col in columns_to_update})
+            new_row_data['COMMENTAIRE_ongoing'] = "Aucun"
+            merged_df = pd.concat([merged_df, pd.DataFrame([new_row_data])], ignore_index=True)
+    filtered_columns = [col for col in merged_df.columns if '_time' not in col]
+    return merged_df[filtered_columns].rename(columns={col + '_ongoing': col for col in columns_to_update})
+
+
+def row(year, study, total=0.0, actions=False, visits=0, comment="Aucun"):
+    values = {'YEAR': year, 'WEEK': WEEK, 'STUDY': study, 'TOTAL': total, 'NB_VISITE': visits, 'COMMENTAIRE': comment}
+    values.update({col: actions for col in ACTION_CAT})
+    values.update({col: 0 for col in ['NB_PAT_SCR', 'NB_PAT_RAN', 'NB_EOS']})
+    return values
+
+
+def canonical(df):
+    return normalize_time_frame(df).sort_values(['YEAR', 'WEEK', 'STUDY']).reset_index(drop=True)
+
+
+def fixture():
+    ongoing = pd.DataFrame([
+        row(YEAR, "EMPTY_IN_ONGOING"),                                  # already saved: the saved values fill it
+        row(YEAR, "FILLED_IN_BOTH", total=2.5, actions=True, visits=1, comment="en cours"),
+        row(YEAR, "ONLY_ONGOING", total=1.0),
+        row(YEAR, "NOT_ASSIGNED", total=3.0),
+    ], columns=CATEGORIES)
+    history = pd.DataFrame([
+        row(YEAR, "EMPTY_IN_ONGOING", total=4.0, actions=True, visits=2, comment="saisi"),
+        row(YEAR, "FILLED_IN_BOTH", total=7.0, actions=True, visits=5, comment="ancien"),
+        row(YEAR, "ONLY_TIME", total=6.0, visits=3),
+        row(YEAR - 1, "ONLY_ONGOING", total=8.0),                       # same week number, earlier year
+    ], columns=CATEGORIES)
+    assigned = ["EMPTY_IN_ONGOING", "FILLED_IN_BOTH", "ONLY_ONGOING", "ONLY_TIME", "NEW_STUDY"]
+    return ongoing, history, assigned
+
+
+def test_reconcile_week_matches_the_baseline_semantics():
+    ongoing, history, assigned = fixture()
+    expected = canonical(baseline_reconcile(ongoing, history, assigned, YEAR, WEEK))
+    result = canonical(reconcile_week(ongoing, history, assigned, YEAR, WEEK))
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_reconcile_week_cases():
+    ongoing, history, assigned = fixture()
+    result = canonical(reconcile_week(ongoing, history, assigned, YEAR, WEEK)).set_index(['YEAR', 'STUDY'])
+
+    assert "NOT_ASSIGNED" not in result.index.get_level_values('STUDY')
+    # Values still empty in the Ongoing file are taken from the saved week, the filled ones are kept
+    assert result.loc[(YEAR, "EMPTY_IN_ONGOING"), 'TOTAL'] == 4.0
+    assert result.loc[(YEAR, "EMPTY_IN_ONGOING"), 'VISITES']
+    assert result.loc[(YEAR, "FILLED_IN_BOTH"), 'TOTAL'] == 2.5
+    assert result.loc[(YEAR, "FILLED_IN_BOTH"), 'COMMENTAIRE'] == "en cours"
+    assert result.loc[(YEAR, "ONLY_ONGOING"), 'TOTAL'] == 1.0
+    # As in the baseline, a study only in the history keeps the empty values of the Ongoing side
+    raw = reconcile_week(ongoing, history, assigned, YEAR, WEEK)
+    assert raw.loc[raw['STUDY'] == "ONLY_TIME", 'TOTAL'].isna().all()
+    assert result.loc[(YEAR, "NEW_STUDY"), 'COMMENTAIRE'] == "Aucun"
+
+
+def test_reconcile_week_without_history_gives_blank_rows():
+    ongoing, _, assigned = fixture()
+    empty_history = pd.DataFrame(columns=CATEGORIES)
+    expected = canonical(baseline_reconcile(ongoing, empty_history, assigned, YEAR, WEEK))
+    result = canonical(reconcile_week(ongoing, empty_history, assigned, YEAR, WEEK))
+    pd.testing.assert_frame_equal(result, expected)
+    assert len(empty_week_rows(["A", "B"], YEAR, WEEK)) == 2
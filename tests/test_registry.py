@@ -0,0 +1,39 @@
+import time
+import pandas as pd
+import pytest
+
+from imotion_registry import ARC_FILE, ArcRegistry, get_arc_registry
+from imotion_storage import CsvTableStore, SqliteTableStore
+
+
+def wait_for(registry, expected, timeout=5.0):
+    # The reload runs in a background thread: the previous roster is served until it is done
+    deadline = time.monotonic() + timeout
+    passwords = registry.passwords()
+    while passwords != expected and time.monotonic() < deadline:
+        time.sleep(0.01)
+        passwords = registry.passwords()
+    return passwords
+
+
+@pytest.mark.parametrize("store_class", [CsvTableStore, SqliteTableStore])
+def test_an_edited_roster_is_picked_up_without_restarting(tmp_path, store_class):
+    store = store_class(str(tmp_path))
+    store.write(ARC_FILE, pd.DataFrame({'ARC': ["A", "B"], 'MDP': ["mdp_a", "mdp_b"]}))
+    registry = get_arc_registry(store)
+    assert registry.passwords() == {"A": "mdp_a", "B": "mdp_b"}
+
+    # Edited outside of the application: a new ARC, an archived one and a changed password
+    store.write(ARC_FILE, pd.DataFrame({'ARC': ["A", "C"], 'MDP': ["nouveau_mdp", "mdp_c"]}))
+
+    assert wait_for(registry, {"A": "nouveau_mdp", "C": "mdp_c"}) == {"A": "nouveau_mdp", "C": "mdp_c"}
+    assert get_arc_registry(store) is registry
+
+
+def test_missing_roster_or_columns(tmp_path):
+    store = CsvTableStore(str(tmp_path))
+    registry = ArcRegistry(store)
+    assert registry.passwords() is None
+
+    store.write(ARC_FILE, pd.DataFrame({'NOM': ["A"]}))
+    assert registry.passwords() is None
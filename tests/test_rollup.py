@@ -0,0 +1,84 @@
+import threading
+import pandas as pd
+
+import imotion_rollup
+from imotion_rollup import load_weekly_rollup, update_weekly_rollup
+from imotion_storage import CATEGORIES, get_time_store
+
+
+def week_rows(year, week, study, total):
+    rows = pd.DataFrame([{'YEAR': year, 'WEEK': week, 'STUDY': study}]).reindex(columns=CATEGORIES)
+    rows['TOTAL'] = total
+    return rows
+
+
+def test_save_during_lazy_rebuild_is_applied(tmp_path, monkeypatch):
+    folder = str(tmp_path)
+    store = get_time_store(folder=folder)
+    store.save("A", week_rows(2024, 5, "S1", 1.0))
+    saves = []
+    original = imotion_rollup.load_all_histories
+
+    def load_then_save(**kwargs):
+        # A session saves right after the rebuild has read the histories
+        facts = original(**kwargs)
+        store.replace_weeks("A", week_rows(2024, 6, "S2", 2.0), [(2024, 6)])
+        saves.append(threading.Thread(target=update_weekly_rollup, args=("A", week_rows(2024, 6, "S2", 2.0), {(2024, 6)}, folder)))
+        saves[-1].start()
+        return facts
+
+    monkeypatch.setattr(imotion_rollup, "load_all_histories", load_then_save)
+    load_weekly_rollup(folder=folder)
+    saves[0].join()
+
+    rollup = load_weekly_rollup(folder=folder).sort_values('WEEK')
+    assert list(zip(rollup['WEEK'], rollup['STUDY'], rollup['TOTAL'])) == [(5, "S1", 1.0), (6, "S2", 2.0)]
+
+
+def test_concurrent_first_reads_build_the_rollup_once(tmp_path, monkeypatch):
+    folder = str(tmp_path)
+    get_time_store(folder=folder).save("A", week_rows(2024, 5, "S1", 1.0))
+    builds = []
+    original = imotion_rollup.load_all_histories
+    monkeypatch.setattr(imotion_rollup, "load_all_histories", lambda **kwargs: builds.append(1) or original(**kwargs))
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(load_weekly_rollup(folder=folder))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert [len(result) for result in results] == [1, 1, 1, 1]
+
+
+def test_updates_applied_out_of_order_keep_the_last_write(tmp_path):
+    folder = str(tmp_path)
+    store = get_time_store(folder=folder)
+    store.save("A", week_rows(2024, 5, "S1", 1.0))
+    load_weekly_rollup(folder=folder)
+
+    # Two sessions save the same week; the first one reaches the rollup after the second one
+    first, second = week_rows(2024, 6, "S1", 2.0), week_rows(2024, 6, "S1", 3.0)
+    store.replace_weeks("A", first, [(2024, 6)])
+    store.replace_weeks("A", second, [(2024, 6)])
+    update_weekly_rollup("A", second, {(2024, 6)}, folder)
+    update_weekly_rollup("A", first, {(2024, 6)}, folder)
+
+    rollup = load_weekly_rollup(folder=folder).sort_values('WEEK')
+    assert list(zip(rollup['WEEK'], rollup['TOTAL'])) == [(5, 1.0), (6, 3.0)]
+
+
+def test_full_save_update_reads_the_stored_history(tmp_path):
+    folder = str(tmp_path)
+    store = get_time_store(folder=folder)
+    store.save("A", pd.concat([week_rows(2023, 50, "S1", 1.0), week_rows(2024, 5, "S1", 2.0)]))
+    load_weekly_rollup(folder=folder)
+
+    history = week_rows(2024, 5, "S2", 4.0)
+    store.save("A", history)
+    update_weekly_rollup("A", history, folder=folder)
+
+    rollup = load_weekly_rollup(folder=folder)
+    assert list(zip(rollup['YEAR'], rollup['STUDY'], rollup['TOTAL'])) == [(2024, "S2", 4.0)]
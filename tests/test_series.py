@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from imotion_series import MEDIAN_LABEL, OTHERS_LABEL, downsample_weeks, summarize_series, week_matrix
+
+
+def matrix(arcs=20, weeks=52):
+    # ARC_i logs i hours every week, so the largest totals are the last ARCs
+    return pd.DataFrame(np.arange(arcs, dtype=float)[:, None].repeat(weeks, axis=1),
+                        index=[f"ARC_{i}" for i in range(arcs)], columns=range(1, weeks + 1))
+
+
+def test_top_n_lines_plus_one_others_line_and_band():
+    lines, bands = summarize_series(matrix(), top_n=5)
+
+    series = list(dict.fromkeys(lines['SERIES']))
+    assert series == ["ARC_19", "ARC_18", "ARC_17", "ARC_16", "ARC_15", f"{OTHERS_LABEL} (15)"]
+    others = lines[lines['SERIES'] == series[-1]]
+    assert (others['VALUE'] == 7.0).all()
+    assert list(bands['BAND'].unique()) == [series[-1]]
+    assert (bands['LOW'] == 0.0).all() and (bands['HIGH'] == 14.0).all()
+
+
+def test_size_does_not_depend_on_the_number_of_rows():
+    small, _ = summarize_series(matrix(arcs=10), top_n=3, percentiles=(10, 90))
+    large, large_bands = summarize_series(matrix(arcs=500), top_n=3, percentiles=(10, 90))
+
+    assert len(small) == len(large) == (3 + 2) * 52
+    assert large['SERIES'].nunique() == 5 and MEDIAN_LABEL in set(large['SERIES'])
+    assert len(large_bands) == 2 * 52
+
+
+def test_every_row_is_drawn_without_top_n():
+    lines, bands = summarize_series(matrix(arcs=4))
+    assert lines['SERIES'].nunique() == 4
+    assert bands.empty
+
+
+def test_points_cap():
+    lines, bands = summarize_series(matrix(), top_n=2, max_points=10)
+
+    points = lines.groupby('SERIES')['WEEK'].count()
+    assert (points <= 10).all()
+    # Weeks are averaged by buckets labelled with their first week
+    assert list(lines[lines['SERIES'] == "ARC_19"]['WEEK']) == [1, 7, 13, 19, 25, 31, 37, 43, 49]
+    assert (bands.groupby('BAND')['WEEK'].count() <= 10).all()
+
+
+def test_downsampling_averages_consecutive_weeks():
+    weeks = pd.DataFrame([[1.0, 3.0, 5.0, 7.0, 9.0]], index=["A"], columns=[1, 2, 3, 4, 5])
+    assert downsample_weeks(weeks, 2).to_dict('split') == {'index': ["A"], 'columns': [1, 4], 'data': [[3.0, 8.0]]}
+    assert downsample_weeks(weeks, None) is weeks
+
+
+def test_week_matrix_fills_missing_rows_and_weeks():
+    totals = pd.DataFrame({'ARC': ["A", "A", "B"], 'WEEK': [1, 3, 3], 'Total Time': [2.0, 4.0, 1.0]})
+    result = week_matrix(totals, ["A", "B", "C"], [1, 2, 3])
+    assert result.to_dict('split') == {'index': ["A", "B", "C"], 'columns': [1, 2, 3],
+                                       'data': [[2.0, 0.0, 4.0], [0.0, 0.0, 1.0], [0.0, 0.0, 0.0]]}
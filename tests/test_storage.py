@@ -0,0 +1,231 @@
+import os
+import pandas as pd
+import pytest
+
+from imotion_storage import (CATEGORIES, CsvTimeStore, ParquetTimeStore, SqliteTimeStore, CsvTableStore, SqliteTableStore,
+                             normalize_time_frame, path_lock, sqlite_connection, load_all_histories)
+
+
+def week_rows(year, week, studies, total=1.0):
+    rows = pd.DataFrame([{'YEAR': year, 'WEEK': week, 'STUDY': study} for study in studies]).reindex(columns=CATEGORIES)
+    rows['TOTAL'] = total
+    return rows
+
+
+def history(store, arc):
+    return store.load(arc).sort_values(['YEAR', 'WEEK', 'STUDY']).reset_index(drop=True)
+
+
+# ========================================================================================================================================
+# BACKENDS
+def sample_history():
+    df = pd.concat([week_rows(2023, 52, ["S1", "S2"], total=1.5), week_rows(2024, 1, ["S1"], total=2.0),
+                    week_rows(2024, 5, ["S1", "S3"], total=0.5)], ignore_index=True)
+    df['VISITES'] = [True, False, True, False, True]
+    df['NB_VISITE'] = [1, 0, 2, 0, 3]
+    df['COMMENTAIRE'] = ["ok", None, "", "a;b", None]
+    return df
+
+
+@pytest.mark.parametrize("filters", [{}, {'year': 2024}, {'week': 5}, {'year': 2024, 'week': 5}, {'study': "S1"}])
+def test_backends_load_the_same_rows(tmp_path, filters):
+    stores = [CsvTimeStore(str(tmp_path / "csv")), ParquetTimeStore(str(tmp_path / "parquet")), SqliteTimeStore(str(tmp_path / "sqlite"))]
+    results = []
+    for store in stores:
+        store.save("A", sample_history())
+        store.replace_weeks("A", week_rows(2024, 1, ["S4"], total=3.0), [(2024, 1)])
+        df = normalize_time_frame(store.load("A", **filters))
+        results.append(df.sort_values(['YEAR', 'WEEK', 'STUDY']).reset_index(drop=True))
+
+    assert not results[0].empty
+    for store, df in zip(stores[1:], results[1:]):
+        pd.testing.assert_frame_equal(df, results[0], obj=store.name)
+
+
+def test_parquet_reads_a_null_comment_week_then_a_commented_week(tmp_path):
+    store = ParquetTimeStore(str(tmp_path))
+    store.replace_weeks("A", week_rows(2024, 1, ["S1"]).assign(COMMENTAIRE=None), [(2024, 1)])
+    store.replace_weeks("A", week_rows(2024, 2, ["S1"]).assign(COMMENTAIRE="hello"), [(2024, 2)])
+
+    df = history(store, "A")
+    assert list(df['COMMENTAIRE']) == [None, "hello"]
+    assert list(store.load("A", week=2)['COMMENTAIRE']) == ["hello"]
+
+
+def test_backends_list_arcs_and_missing_history(tmp_path):
+    for store in [CsvTimeStore(str(tmp_path / "csv")), ParquetTimeStore(str(tmp_path / "parquet")), SqliteTimeStore(str(tmp_path / "sqlite"))]:
+        store.create_empty("A_1")
+        store.save("B", sample_history())
+        assert sorted(store.list_arcs()) == ["A_1", "B"], store.name
+        assert store.load("A_1").empty, store.name
+        with pytest.raises(FileNotFoundError):
+            store.load("C")
+
+
+@pytest.mark.parametrize("store_class", [CsvTableStore, SqliteTableStore])
+def test_table_stores_update_only_changed_rows(tmp_path, store_class):
+    store = store_class(str(tmp_path))
+    store.write("ARC_MDP.csv", pd.DataFrame({'ARC': ["A", "B"], 'MDP': ["1234", "abcd"]}))
+    version = store.version("ARC_MDP.csv")
+
+    assert store.update_rows("ARC_MDP.csv", 'ARC', pd.DataFrame({'ARC': ["A"], 'MDP': [1234]})) == 0
+    assert store.version("ARC_MDP.csv") == version
+    assert store.update_rows("ARC_MDP.csv", 'ARC', pd.DataFrame({'ARC': ["A", "B"], 'MDP': ["1234", "new"]})) == 1
+    assert store.read("ARC_MDP.csv")['MDP'].astype(str).tolist() == ["1234", "new"]
+
+
+def test_sqlite_connection_is_reused_per_thread(tmp_path):
+    folder = str(tmp_path)
+    assert sqlite_connection(folder) is sqlite_connection(folder)
+    store = SqliteTimeStore(folder)
+    store.create_empty("A")
+    assert store.exists("A") and store.list_arcs() == ["A"]
+
+
+# ========================================================================================================================================
+# WEEK REPLACEMENT
+@pytest.mark.parametrize("save_mode", ["week", "full"])
+def test_replace_weeks_keeps_other_years_and_weeks(tmp_path, save_mode):
+    store = CsvTimeStore(str(tmp_path), save_mode=save_mode)
+    store.save("A", pd.concat([week_rows(2023, 5, ["S1"]), week_rows(2024, 4, ["S1"]), week_rows(2024, 5, ["S1", "S2"])],
+                              ignore_index=True))
+    store.replace_weeks("A", week_rows(2024, 5, ["S3"], total=4.0), [(2024, 5)])
+
+    df = history(store, "A")
+    assert list(zip(df['YEAR'], df['WEEK'], df['STUDY'])) == [(2023, 5, "S1"), (2024, 4, "S1"), (2024, 5, "S3")]
+    assert df.loc[df['STUDY'] == "S3", 'TOTAL'].tolist() == [4.0]
+
+
+def test_arc_with_only_a_journal_is_listed(tmp_path):
+    store = CsvTimeStore(str(tmp_path), save_mode="week")
+    store.save("OLD", week_rows(2024, 4, ["S1"]))
+    store.replace_weeks("OLD", week_rows(2024, 5, ["S1"]), [(2024, 5)])
+    store.replace_weeks("NEW", week_rows(2024, 5, ["S2"]), [(2024, 5)])
+
+    assert store.exists("NEW")
+    assert sorted(store.list_arcs()) == ["NEW", "OLD"]
+    facts, _ = load_all_histories(store=store)
+    assert sorted(zip(facts['ARC'], facts['STUDY'])) == [("NEW", "S2"), ("OLD", "S1"), ("OLD", "S1")]
+
+    # A compaction set aside but not finished still lists the ARC once
+    os.replace(store.log_path("NEW"), store.compacting_path("NEW"))
+    assert sorted(store.list_arcs()) == ["NEW", "OLD"]
+
+
+def test_replace_weeks_with_no_rows_empties_the_week(tmp_path):
+    store = CsvTimeStore(str(tmp_path), save_mode="week")
+    store.save("A", pd.concat([week_rows(2023, 5, ["S1"]), week_rows(2024, 5, ["S1"])], ignore_index=True))
+    store.replace_weeks("A", pd.DataFrame(columns=CATEGORIES), [(2024, 5)])
+
+    df = history(store, "A")
+    assert list(zip(df['YEAR'], df['WEEK'])) == [(2023, 5)]
+
+
+# ========================================================================================================================================
+# WEEK JOURNAL
+def test_journal_replay_keeps_last_committed_replacement(tmp_path):
+    store = CsvTimeStore(str(tmp_path), save_mode="week")
+    store.create_empty("A")
+    store.replace_weeks("A", week_rows(2024, 5, ["S1"], total=1.0), [(2024, 5)])
+    store.replace_weeks("A", week_rows(2024, 5, ["S1", "S2"], total=2.0), [(2024, 5)])
+    store.replace_weeks("A", week_rows(2024, 6, ["S3"]), [(2024, 6)])
+
+    df = history(store, "A")
+    assert list(df['STUDY']) == ["S1", "S2", "S3"]
+    assert list(df['TOTAL']) == [2.0, 2.0, 1.0]
+
+
+def test_journal_ignores_cut_entry_followed_by_committed_entries(tmp_path):
+    store = CsvTimeStore(str(tmp_path), save_mode="week")
+    store.create_empty("A")
+    store.replace_weeks("A", week_rows(2024, 5, ["S1"]), [(2024, 5)])
+
+    # A crash cuts the next entry before its commit row, in the middle of a line
+    with open(store.log_path("A"), 'ab') as f:
+        f.write(b"1;W;2024;7;;;;;;;;;;;;;;;;;;;\n1;R;2024;7;CUT;3.0;Tr")
+    store.replace_weeks("A", week_rows(2024, 6, ["S2"]), [(2024, 6)])
+
+    df = history(store, "A")
+    assert list(df['STUDY']) == ["S1", "S2"]
+    assert 7 not in set(df['WEEK'])
+
+
+def test_journal_ignores_complete_but_uncommitted_entry(tmp_path):
+    store = CsvTimeStore(str(tmp_path), save_mode="week")
+    store.create_empty("A")
+    store.replace_weeks("A", week_rows(2024, 5, ["S1"]), [(2024, 5)])
+    with open(store.log_path("A"), 'ab') as f:
+        f.write(b"1;W;2024;5;;;;;;;;;;;;;;;;;;;\n1;R;2024;5;CUT;3.0;;;;;;;;;;;;;;;;\n")
+
+    # Readers skip the entry even before the next append truncates it
+    assert list(history(store, "A")['STUDY']) == ["S1"]
+    store.replace_weeks("A", week_rows(2024, 6, ["S2"]), [(2024, 6)])
+    assert list(history(store, "A")['STUDY']) == ["S1", "S2"]
+    with open(store.log_path("A"), 'rb') as f:
+        assert b"CUT" not in f.read()
+
+
+def test_journal_without_commit_rows_is_kept_and_closed(tmp_path):
+    store = CsvTimeStore(str(tmp_path), save_mode="week")
+    store.create_empty("A")
+    header = ";".join(['_SEQ', '_OP'] + CATEGORIES)
+    empty = ";" * (len(CATEGORIES) - 3)
+    with open(store.log_path("A"), 'w') as f:
+        f.write(f"{header}\n10;W;2024;5{empty};\n10;R;2024;5;OLD{empty}\n11;W;2024;6{empty};\n11;R;2024;6;OLD6{empty}\n")
+
+    assert list(history(store, "A")['STUDY']) == ["OLD", "OLD6"]
+    store.replace_weeks("A", week_rows(2024, 6, ["NEW"]), [(2024, 6)])
+    assert list(history(store, "A")['STUDY']) == ["OLD", "NEW"]
+
+
+def test_compaction_folds_journal_into_time_file(tmp_path):
+    store = CsvTimeStore(str(tmp_path), save_mode="week")
+    store.save("A", week_rows(2023, 5, ["OLD"]))
+    store.replace_weeks("A", week_rows(2024, 5, ["S1"]), [(2024, 5)])
+    store.replace_weeks("A", week_rows(2024, 5, ["S2"]), [(2024, 5)])
+    before = history(store, "A")
+
+    assert store.compact("A")
+    assert not os.path.exists(store.log_path("A"))
+    assert not os.path.exists(store.compacting_path("A"))
+    after = history(store, "A")
+    assert list(after['STUDY']) == ["OLD", "S2"]
+    pd.testing.assert_frame_equal(after[['YEAR', 'WEEK', 'STUDY']], before[['YEAR', 'WEEK', 'STUDY']], check_dtype=False)
+    assert not store.compact("A")
+
+
+def test_compaction_recovers_a_journal_left_aside(tmp_path):
+    store = CsvTimeStore(str(tmp_path), save_mode="week")
+    store.create_empty("A")
+    store.replace_weeks("A", week_rows(2024, 5, ["S1"]), [(2024, 5)])
+    # A compaction interrupted after setting the journal aside, then a new save
+    os.replace(store.log_path("A"), store.compacting_path("A"))
+    store.replace_weeks("A", week_rows(2024, 6, ["S2"]), [(2024, 6)])
+
+    assert store.compact("A")
+    assert list(history(store, "A")['STUDY']) == ["S1", "S2"]
+    assert not os.path.exists(store.log_path("A"))
+
+
+# ========================================================================================================================================
+# LOCKS
+def test_path_lock_nested_acquisitions(tmp_path):
+    path = str(tmp_path / "Time_A.csv")
+    with path_lock(path):
+        with path_lock(path):
+            with path_lock(path, shared=True):
+                pass
+    with path_lock(path, shared=True):
+        with path_lock(path, shared=True):
+            pass
+
+
+def test_path_lock_refuses_shared_to_exclusive_upgrade(tmp_path):
+    path = str(tmp_path / "Time_A.csv")
+    with path_lock(path, shared=True):
+        with pytest.raises(RuntimeError):
+            with path_lock(path):
+                pass
+    # The lock is released and can be taken exclusive afterwards
+    with path_lock(path):
+        pass
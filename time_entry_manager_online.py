@@ -7,11 +7,20 @@ import pandas as pd
 import os
 import datetime
 import locale
-import seaborn as sns
-import matplotlib.pyplot as plt
 import numpy as np
 from io import StringIO, BytesIO
 import math
+import tempfile
+from imotion_storage import get_time_store, get_table_store, load_all_histories
+from imotion_rollup import load_weekly_rollup
+from imotion_assignments import update_assignment_index
+from imotion_charts import render_chart, build_altair_chart, chart_engine
+from imotion_series import week_matrix, summarize_series, OTHERS_LABEL, MEDIAN_LABEL
+from imotion_export import export_history
+from imotion_catalog import CATALOG_FILE, catalog_study_names, load_study_catalog, sync_study_status
+from imotion_registry import get_arc_registry
+from imotion_profiling import profiled, span, rerun_trace, show_profiling_panel
+from imotion_calendar import iso_week, shift_week, last_weeks, weeks_in_year, week_key, filter_weeks, filter_month
 
 
 #####################################################################
@@ -28,6 +37,16 @@ CATEGORIES = ['YEAR', 'WEEK', 'STUDY', 'TOTAL', 'MISE EN PLACE', 'TRAINING', 'VI
 INT_CATEGORIES = CATEGORIES[3:-1]
 TIME_INT_CAT = CATEGORIES[3:-5]
 ACTION_CAT = CATEGORIES[4:-5]
+# "sidebar" (default): only the selected view runs; "tabs": every view runs in st.tabs on each rerun
+NAVIGATION = os.getenv('IMOTION_NAVIGATION', 'sidebar')
+EXPORT_FORMAT_LABELS = {"xlsx": "Excel (une feuille par ARC)", "zip": "CSV compressés (un fichier par ARC)"}
+EXPORT_MIME_TYPES = {"xlsx": 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', "zip": 'application/zip'}
+# Yearly per-ARC series: ARCs drawn individually, caps on the points per line and percentiles of the envelope
+TOP_ARCS = 8
+SERIES_POINTS_OPTIONS = [13, 26, 53]
+ENVELOPE_PERCENTILES = (10, 90)
+# Number of study pies drawn per page in the "Dashboard - par ARC" view
+PIE_PAGE_SIZE = 6
 MONTHS = ["Janvier", "Février", "Mars", "Avril", "Mai", "Juin", "Juillet", "Août", "Septembre", "Octobre", "Novembre", "Décembre"]
 SHAPE_BOX = {
     "ha": 'center', 
@@ -41,55 +60,61 @@ SHAPE_BOX = {
 # ========================= GENERAL INFO ========================== #
 #####################################################################
 
-def load_csv_from_local(file_name, sep=';', encoding='utf-8'):
+def load_csv_from_local(file_name, sep=';', encoding='utf-8', copy=True):
     """
-    Loads a CSV file from the local "imotion" folder and converts it into a pandas DataFrame.
+    Loads a CSV file from the local "imotion" folder and converts it into a pandas DataFrame, through the
+    configured storage backend. With the CSV backend, parsed files are kept in a process-wide cache keyed by
+    (path, mtime, size); with the SQLite backend the file is a table of imotion/imotion.db.
 
     Parameters:
     - file_name (str): The name of the file to load.
     - sep (str, optional): The column separator in the CSV file. Defaults to ';'.
     - encoding (str, optional): The encoding of the CSV file. Defaults to 'utf-8'.
+    - copy (bool, optional): Return a private copy. Read-only callers can pass False to share the cached
+                             DataFrame. Defaults to True.
 
     Returns:
     - pandas.DataFrame: A DataFrame containing the data from the loaded CSV file.
     """
-    file_path = os.path.join("imotion", file_name)
     try:
-        return pd.read_csv(file_path, encoding=encoding, sep=sep)
-    except UnicodeDecodeError:
-        return pd.read_csv(file_path, encoding='latin1', sep=sep)
+        return get_table_store().read(file_name, sep=sep, encoding=encoding, copy=copy)
     except FileNotFoundError:
         return None
         
 
-# Creating a "viridis" palette with the appropriate number of colors
-viridis_palette = sns.color_palette("viridis", len(TIME_INT_CAT))
+@st.cache_resource(show_spinner=False)
+def get_category_colors():
+    """
+    Maps each time category to a color of the "viridis" palette. Built once per process: seaborn is only
+    imported when the first chart is drawn.
+
+    Returns:
+    - dict: The color of each category of TIME_INT_CAT.
+    """
+    import seaborn as sns
 
-# Mapping categories to "viridis" palette colors
-category_colors = {category: color for category, color in zip(TIME_INT_CAT, viridis_palette)}
+    # Creating a "viridis" palette with the appropriate number of colors
+    viridis_palette = sns.color_palette("viridis", len(TIME_INT_CAT))
 
+    # Mapping categories to "viridis" palette colors
+    return {category: color for category, color in zip(TIME_INT_CAT, viridis_palette)}
+
+
+@profiled("load:arc_passwords")
 def load_arc_passwords():
     """
-    Loads ARC passwords from a CSV file stored in an S3 bucket.
+    Loads ARC passwords from the shared ARC registry: each call only checks the version of ARC_MDP.csv,
+    and the file is reloaded in the background after a change, so a new or archived ARC appears
+    in every view without restarting the application.
 
     Returns:
     - dict: A dictionary where the keys are ARC names and the values are their corresponding passwords.
     """
-    try:
-        # Try loading the file with UTF-8 encoding
-        df = load_csv_from_local(ARC_PASSWORDS_FILE, sep=';', encoding='utf-8')
-    except UnicodeDecodeError:
-        # If an encoding error occurs, try loading with Latin1 encoding
-        df = load_csv_from_local(ARC_PASSWORDS_FILE, sep=';', encoding='latin1')
-
-    # Verify if df is not None and has the expected columns
-    if df is not None and 'ARC' in df.columns and 'MDP' in df.columns:
-        return dict(zip(df['ARC'], df['MDP']))
-    else:
+    passwords = get_arc_registry().passwords()
+    if passwords is None:
         st.write("Error: The DataFrame is empty or missing required columns.")
         return {}  # Return an empty dictionary if df is None or missing columns
-
-ARC_PASSWORDS = load_arc_passwords()
+    return passwords
 
 
 #####################################################################
@@ -98,52 +123,78 @@ ARC_PASSWORDS = load_arc_passwords()
 
 # ========================================================================================================================================
 # DATA LOADING
+@profiled("load:history")
 def load_data(arc):
     """
-    Loads data for a specific ARC from a CSV file stored in an S3 bucket.
+    Loads data for a specific ARC from the configured time storage backend (CSV, Parquet or SQLite).
 
     Parameters:
     - arc (str): The ARC identifier for which data should be loaded.
 
     Returns:
-    - pandas.DataFrame: A DataFrame containing the loaded data for the specified ARC. If an encoding error
-                         occurs, tries to reload the data with a different encoding.
+    - pandas.DataFrame: A DataFrame containing the loaded data for the specified ARC, or None if the ARC
+                         has no history yet.
     """
-    file_name = f"Time_{arc}.csv"
     try:
-        # Try loading the file with UTF-8 encoding
-        return load_csv_from_local(file_name, sep=';', encoding='utf-8')
-    except UnicodeDecodeError:
-        # If an encoding error occurs, try loading with Latin1 encoding
-        return load_csv_from_local(file_name, sep=';', encoding='latin1')
+        return get_time_store().load(arc)
+    except FileNotFoundError:
+        return None
 
-def load_all_study_names():
+def is_valid_arc(arc):
+    """
+    Checks that an ARC identifier read from ARC_MDP.csv is usable (not None nor NaN).
+
+    Parameters:
+    - arc: The ARC identifier.
+
+    Returns:
+    - bool: True if the identifier can be used to load data.
     """
-    Lists all unique study names from CSV files prefixed with "Time_" in the local "imotion" folder.
+    return arc is not None and not (isinstance(arc, float) and math.isnan(arc))
+
+def load_all_arcs(arcs=None, max_workers=8):
+    """
+    Loads the history of every ARC in parallel and returns a single typed fact table, tagged with the ARC.
+
+    Parameters:
+    - arcs (list, optional): The ARCs to load. Defaults to all the ARCs of ARC_MDP.csv.
+    - max_workers (int, optional): Size of the thread pool. Defaults to 8.
 
     Returns:
-    - list: A sorted list of unique study names.
+    - tuple: (pandas.DataFrame, dict) The fact table and the loading report per ARC
+      ({'seconds': float, 'rows': int, 'error': str or None}).
     """
-    folder_path = "imotion"  # Chemin du dossier contenant les fichiers CSV
-    unique_studies = set()
+    arcs = [arc for arc in (load_arc_passwords().keys() if arcs is None else arcs) if is_valid_arc(arc)]
+    return load_all_histories(arcs, max_workers=max_workers)
 
-    # Vérifier que le dossier existe
-    if not os.path.exists(folder_path):
-        return []
+@profiled("load:study_names")
+def load_all_study_names():
+    """
+    Lists all study names (active and archived) from the study catalog, which every save keeps up to date.
 
-    # Parcourir tous les fichiers du dossier
-    for file_name in os.listdir(folder_path):
-        if file_name.startswith("Time_") and file_name.endswith(".csv"):
-            file_path = os.path.join(folder_path, file_name)
+    Returns:
+    - list: A sorted list of unique study names.
+    """
+    return catalog_study_names()
 
-            # Charger le fichier CSV
-            df = pd.read_csv(file_path, sep=';', encoding='utf-8')
+@st.cache_data(show_spinner=False)
+def study_list_excel(backend, folder, version):
+    """
+    Builds the Excel file of the "Liste des études en cours et archivées" button from one version of the study catalog.
+    Cached by Streamlit: the workbook is only built again when the catalog changed.
 
-            if not df.empty and "STUDY" in df.columns:
-                unique_studies.update(df['STUDY'].dropna().unique())
+    Parameters:
+    - backend (str): The name of the storage backend.
+    - folder (str): The data folder.
+    - version: The version stamp of the catalog in this backend.
 
-    return sorted(list(unique_studies))
+    Returns:
+    - bytes: The Excel file.
+    """
+    catalog = load_study_catalog().rename(columns={'STUDY': 'Study Name'})
+    return convert_df_to_excel(catalog).getvalue()
 
+@profiled("load:arc_info")
 def load_arc_info():
     """
     Loads ARC information from a CSV file stored in S3.
@@ -153,6 +204,7 @@ def load_arc_info():
     """
     return load_csv_from_local(ARC_PASSWORDS_FILE, sep=';', encoding='utf-8')
 
+@profiled("load:study_info")
 def load_study_info():
     """
     Loads study information from a specific CSV file in S3.
@@ -165,6 +217,7 @@ def load_study_info():
 
 # ========================================================================================================================================
 # SAVE
+@profiled("save:table", argument='df')
 def save_data_to_local(file_name, df):
     """
     Saves a DataFrame to a CSV file in the local "imotion" folder.
@@ -173,8 +226,7 @@ def save_data_to_local(file_name, df):
     - file_name (str): The name under which the file will be saved.
     - df (pandas.DataFrame): The DataFrame to be saved.
     """
-    file_path = os.path.join("imotion", file_name)
-    df.to_csv(file_path, index=False, sep=';', encoding='utf-8')
+    get_table_store().write(file_name, df, sep=';', encoding='utf-8')
 
 
 def convert_df_to_excel(df):
@@ -197,7 +249,7 @@ def convert_df_to_excel(df):
 # GRAPH AND DISPLAY
 def create_bar_chart(data, title, week_or_month, y='Total Time', y_axis="Nombre d'heure(s)"):
     """
-    Creates and displays a bar chart from the provided data.
+    Creates and displays a bar chart from the provided data, with Altair or with matplotlib (see chart_engine).
 
     Parameters:
     - data (pandas.DataFrame): The data to be displayed in the chart.
@@ -207,28 +259,56 @@ def create_bar_chart(data, title, week_or_month, y='Total Time', y_axis="Nombre
     - y_axis (str, optional): The title of the y-axis. Default to "Hours".
 
     Returns:
-    None
+    - dict: The report of the chart ('engine', 'hit', 'seconds', 'bytes').
     """
-    fig, ax = plt.subplots(figsize=(10, 4))
-
-    # Defining the order of categories and corresponding colors
-    category_order = data.index.tolist()
-    color_palette = sns.color_palette("viridis", len(category_order))
-
-    # Mapping colors to categories
-    color_mapping = dict(zip(category_order, color_palette))
-
-    # Creating the bar chart with the defined color order
-    sns.barplot(x=data.index, y=y, data=data, ax=ax, palette=color_mapping)
-    ax.set_title(f'{title} pour {week_or_month}')
-    ax.set_xlabel('')
-    ax.set_ylabel(y_axis)
-    ax.set_ylim(0, None)  # None means the upper limit will be set automatically based on the data
-    ax.xaxis.set_ticks_position('none') 
-    ax.yaxis.set_ticks_position('none')
-    sns.despine(left=False, bottom=False)
-    plt.xticks(rotation=45, ha='right')
-    st.pyplot(fig)
+    data = data[[y]]
+
+    if chart_engine() == "altair":
+        def build():
+            import altair as alt
+
+            # One row per study: the only data sent to the browser
+            table = data.rename_axis('STUDY').reset_index()
+            return alt.Chart(table).mark_bar().encode(
+                x=alt.X('STUDY', type='nominal', sort=None, title=None, axis=alt.Axis(labelAngle=-45)),
+                y=alt.Y(y, type='quantitative', title=y_axis),
+                color=alt.Color('STUDY', type='nominal', sort=None, scale=alt.Scale(scheme='viridis'), legend=None),
+                tooltip=[alt.Tooltip('STUDY', type='nominal', title='Étude'), alt.Tooltip(y, type='quantitative', title=y_axis or y)]
+            ).properties(title=f'{title} pour {week_or_month}', height=320)
+
+        chart, report = build_altair_chart('create_bar_chart', build)
+        st.altair_chart(chart, use_container_width=True)
+        return report
+
+    def render():
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        fig, ax = plt.subplots(figsize=(10, 4))
+
+        # Defining the order of categories and corresponding colors
+        category_order = data.index.tolist()
+        color_palette = sns.color_palette("viridis", len(category_order))
+
+        # Mapping colors to categories
+        color_mapping = dict(zip(category_order, color_palette))
+
+        # Creating the bar chart with the defined color order
+        sns.barplot(x=data.index, y=y, data=data, ax=ax, palette=color_mapping)
+        ax.set_title(f'{title} pour {week_or_month}')
+        ax.set_xlabel('')
+        ax.set_ylabel(y_axis)
+        ax.set_ylim(0, None)  # None means the upper limit will be set automatically based on the data
+        ax.xaxis.set_ticks_position('none') 
+        ax.yaxis.set_ticks_position('none')
+        sns.despine(left=False, bottom=False)
+        plt.xticks(rotation=45, ha='right')
+        return fig
+
+    # The image is only drawn again when the data or the labels change
+    image, report = render_chart('create_bar_chart', render, [data], {'title': title, 'period': week_or_month, 'y': y, 'y_axis': y_axis})
+    st.image(image, use_column_width=True)
+    return report
 
 def plot_pie_chart_on_ax(df_study_sum, title, ax):
     """
@@ -242,6 +322,7 @@ def plot_pie_chart_on_ax(df_study_sum, title, ax):
     Returns:
     None
     """
+    category_colors = get_category_colors()
     colors = [category_colors[cat] for cat in df_study_sum.index if cat in category_colors]
     
     wedges, texts, autotexts = ax.pie(df_study_sum, labels=df_study_sum.index, autopct=lambda p: '{:.0f}'.format(p * df_study_sum.sum() / 100), startangle=140, colors=colors)
@@ -252,9 +333,36 @@ def plot_pie_chart_on_ax(df_study_sum, title, ax):
     
     ax.set_title(title)
 
+def altair_pie_chart(df_sums, title, facet=None):
+    """
+    Builds the Altair equivalent of plot_pie_chart_on_ax: one pie of the number of actions per task category,
+    or a grid of pies (two per row) when a facet column is given.
+
+    Parameters:
+    - df_sums (pandas.DataFrame): Long table with a 'CATEGORIE' and an 'ACTIONS' column (and the facet column).
+    - title (str): The title of the chart.
+    - facet (str, optional): The column with one pie per value (e.g. 'STUDY'). Defaults to None.
+
+    Returns:
+    - altair.Chart: The chart.
+    """
+    import altair as alt
+
+    base = alt.Chart().encode(
+        theta=alt.Theta('ACTIONS', type='quantitative', stack=True),
+        color=alt.Color('CATEGORIE', type='nominal', title='Catégorie', scale=alt.Scale(domain=TIME_INT_CAT, scheme='viridis')),
+        tooltip=[alt.Tooltip('CATEGORIE', type='nominal', title='Catégorie'), alt.Tooltip('ACTIONS', type='quantitative', title='Actions')])
+    pie = alt.layer(base.mark_arc(outerRadius=90),
+                    base.mark_text(radius=108).encode(text=alt.Text('ACTIONS', type='quantitative', format='.0f')),
+                    data=df_sums).properties(width=220, height=220)
+    if facet is not None:
+        pie = pie.facet(facet=alt.Facet(facet, type='nominal', title=None), columns=2)
+    return pie.properties(title=title)
+
 def generate_charts_for_time_period(df, studies, period, period_label):
     """
-    Generates pie charts for each selected study over a given period.
+    Generates pie charts for each selected study over a given period, with Altair or with matplotlib. The action counts of every study are
+    computed in a single groupby, and the grid is paginated: only the PIE_PAGE_SIZE pies of the visible page are drawn.
 
     Parameters:
     - df (pandas.DataFrame): DataFrame containing the data to be displayed.
@@ -263,36 +371,70 @@ def generate_charts_for_time_period(df, studies, period, period_label):
     - period_label (str): A string describing the period (e.g., "Week" or "Month").
 
     Returns:
-    None
+    - dict or None: The report of the chart cache ('hit', 'seconds', 'bytes'), None if no study is selected.
     """
     st.write(f"Données pour {period_label} {period}")
     
     if len(studies) > 0:
-        nrows = (len(studies) + 1) // 2 if len(studies) % 2 else len(studies) // 2
-        fig, axs = plt.subplots(nrows=nrows, ncols=2, figsize=(10, 5 * nrows))
-        axs = axs.flatten()  # Flatten the axes array for easy access
+        # Actions per category of every selected study, in one pass over the rows (0 for a study without rows)
+        study_sums = df[df['STUDY'].isin(studies)].groupby('STUDY')[ACTION_CAT].sum().reindex(studies, fill_value=0)
+
+        # Pagination: the page is chosen with its own widget for each period, so the two grids are independent
+        page_count = math.ceil(len(studies) / PIE_PAGE_SIZE)
+        page = 1
+        if page_count > 1:
+            page = st.number_input(f"Page ({page_count} pages)", min_value=1, max_value=page_count, value=1, step=1,
+                                   key=f"pie_page_{period_label}")
+        page_sums = study_sums.iloc[(page - 1) * PIE_PAGE_SIZE:page * PIE_PAGE_SIZE]
+        if page_count > 1:
+            st.caption(f"Études {(page - 1) * PIE_PAGE_SIZE + 1} à {(page - 1) * PIE_PAGE_SIZE + len(page_sums)} sur {len(studies)}")
+
+        if chart_engine() == "altair":
+            # Long table (study, category, actions) of the page, without the empty slices
+            long_sums = page_sums.rename_axis('STUDY').reset_index().melt(id_vars='STUDY', var_name='CATEGORIE', value_name='ACTIONS')
+            long_sums = long_sums[long_sums['ACTIONS'] > 0]
+            empty_studies = [study for study in page_sums.index if study not in set(long_sums['STUDY'])]
+            report = None
+            if not long_sums.empty:
+                chart, report = build_altair_chart('generate_charts_for_time_period',
+                                                   lambda: altair_pie_chart(long_sums, "Actions par Tâche", facet='STUDY'))
+                st.altair_chart(chart)
+            if empty_studies:
+                st.caption(f"Aucune donnée disponible pour : {', '.join(map(str, empty_studies))}")
+            return report
+
+        def render():
+            import matplotlib.pyplot as plt
+
+            nrows = math.ceil(len(page_sums) / 2)
+            fig, axs = plt.subplots(nrows=nrows, ncols=2, figsize=(10, 5 * nrows))
+            axs = axs.flatten()  # Flatten the axes array for easy access
+
+            for i, (study, df_study_sum) in enumerate(page_sums.iterrows()):
+                df_study_sum = df_study_sum[df_study_sum > 0]
+
+                if df_study_sum.sum() > 0:
+                    plot_pie_chart_on_ax(df_study_sum, f'Actions par Tâche pour {study}', axs[i])
+                else:
+                    # Add text with rounded box
+                    axs[i].text(0.5, 0.5, f"Aucune donnée disponible\npour {study}", **SHAPE_BOX)
+                    axs[i].set_axis_off()  # Hide axes if no data
 
-        for i, study in enumerate(studies):
-            df_study = df[df['STUDY'] == study]
-            df_study_sum = df_study[ACTION_CAT].fillna(0).sum()
-            df_study_sum = df_study_sum[df_study_sum > 0]
+            # Hide extra axes if not used
+            for j in range(len(page_sums), len(axs)):
+                axs[j].axis('off')
 
-            if df_study_sum.sum() > 0:
-                plot_pie_chart_on_ax(df_study_sum, f'Actions par Tâche pour {study}', axs[i])
-            else:
-                # Add text with rounded box
-                axs[i].text(0.5, 0.5, f"Aucune donnée disponible\npour {study}", **SHAPE_BOX)
-                axs[i].set_axis_off()  # Hide axes if no data
+            plt.tight_layout()
+            return fig
 
-        # Hide extra axes if not used
-        for j in range(i + 1, len(axs)):
-            axs[j].axis('off')
-
-        plt.tight_layout()
-        st.pyplot(fig) 
+        # One image per page, drawn again only when the sums of its studies change
+        image, report = render_chart('generate_charts_for_time_period', render, [page_sums], {})
+        st.image(image, use_column_width=True)
+        return report
     else:
         st.warning("Aucune étude sélectionnée ou aucune donnée disponible pour les études sélectionnées.")
 
+@profiled("aggregate:period_summary", argument='df')
 def process_and_display_data(df, period_label, period_value):
     """
     Processes the provided data and displays a summary and charts.
@@ -321,47 +463,96 @@ def process_and_display_data(df, period_label, period_value):
     with visit:
         st.metric(label="Nombre total de visites", value=f"{total_visits}")
 
-def generate_time_series_chart(data_dict, title_prefix, mode='year'):
+def generate_time_series_chart(matrix, title_prefix, mode='year', top_n=None, percentiles=None, max_points=None):
     """
-    Generates a time series chart for the provided data, either by ARC or by study.
+    Generates a time series chart of the weekly totals of every ARC, with Altair or with matplotlib. Only the
+    top_n ARCs are drawn individually, the others are summarized by one line and one band (see summarize_series),
+    so the drawing cost depends on what is displayed and not on the number of ARCs.
 
     Parameters:
-    - data_dict (dict): A dictionary containing the data to plot, with ARC or study names as keys.
+    - matrix (pandas.DataFrame): The (ARC x week) matrix of the weekly totals (see week_matrix).
     - title_prefix (str): Prefix for the chart title.
     - mode (str): Indicates whether the chart should be generated for 'year' or 'last_5_weeks'.
+    - top_n (int, optional): Number of ARCs drawn individually. Defaults to None (every ARC).
+    - percentiles (tuple, optional): (low, high) percentiles of an envelope of every ARC, e.g. (10, 90). Defaults to None.
+    - max_points (int, optional): Maximum number of points per line; consecutive weeks are averaged beyond it. Defaults to None.
 
     Returns:
-    None
+    - dict or None: The report of the chart ('engine', 'hit', 'seconds', 'bytes'), None if there is no data.
     """
-    if not data_dict:
+    if matrix.empty:
         st.error("Aucune donnée disponible pour l'affichage du graphique.")
         return
 
     _, current_week, _, current_year, _ = calculate_weeks()
     if mode == 'year':
-        total_weeks = 52 if datetime.date(current_year, 12, 31).isocalendar()[1] == 1 else 53
+        total_weeks = weeks_in_year(current_year)
+        matrix = matrix.loc[:, matrix.columns <= current_week]  # For the year, stops at the current week
     else:
         total_weeks = current_week  # Stops at the current week for 'last_5_weeks' mode
-    
-    fig, ax = plt.subplots(figsize=(12, 6))
-    for arc, data in data_dict.items():
+        # The weeks are in chronological order and can cross a year boundary (e.g. 52, 53, 1): drawn as categories
+
+    lines, bands = summarize_series(matrix, top_n=top_n, percentiles=percentiles, max_points=max_points)
+    title = f"{title_prefix} du Temps Total Passé par Chaque ARC"
+
+    def weeks_axis(data):
+        return data['WEEK'] if mode == 'year' else data['WEEK'].astype(str)
+
+    def render():
+        import matplotlib.pyplot as plt
+
+        fig, ax = plt.subplots(figsize=(12, 6))
+        for band, band_data in bands.groupby('BAND', sort=False):
+            ax.fill_between(weeks_axis(band_data), band_data['LOW'], band_data['HIGH'], alpha=0.15, color='grey', label=band)
+        for label, line_data in lines.groupby('SERIES', sort=False):
+            summary = str(label).startswith(OTHERS_LABEL) or label == MEDIAN_LABEL
+            ax.plot(weeks_axis(line_data), line_data['VALUE'], label=label, linestyle='--' if summary else '-', color='grey' if summary else None)
+
+        plt.title(title)
+        plt.xlabel('Semaines')
+        plt.ylabel('Temps Total (Heures)')
+        
         if mode == 'year':
-            filtered_data = data[data['WEEK'] <= current_week]  # For the year, stops at the current week
-        else:
-            filtered_data = data  # For the last 5 weeks, uses all available data
-        sns.lineplot(ax=ax, x='WEEK', y='Total Time', data=filtered_data, label=arc)
+            plt.xlim(1, total_weeks)
+            ax.xaxis.set_major_locator(plt.MaxNLocator(integer=True))
+        
+        plt.legend()
+        return fig
 
-    plt.title(f"{title_prefix} du Temps Total Passé par Chaque ARC")
-    plt.xlabel('Semaines')
-    plt.ylabel('Temps Total (Heures)')
-    
-    if mode == 'year':
-        plt.xlim(1, total_weeks)
-        ax.set_xticks(np.arange(1, total_weeks + 1))
-    ax.xaxis.set_major_locator(plt.MaxNLocator(integer=True))
-    
-    plt.legend()
-    st.pyplot(fig)
+    if chart_engine() == "altair":
+        def build():
+            import altair as alt
+
+            # One row per displayed line and point (and per band and point); zoom and hover are handled by the browser
+            if mode == 'year':
+                x = alt.X('WEEK', type='quantitative', title='Semaines', scale=alt.Scale(domain=[1, total_weeks]), axis=alt.Axis(format='d', tickMinStep=1))
+            else:
+                x = alt.X('WEEK', type='ordinal', title='Semaines', sort=None)
+            chart = alt.Chart(lines).mark_line(point=True).encode(
+                x=x,
+                y=alt.Y('VALUE', type='quantitative', title='Temps Total (Heures)'),
+                color=alt.Color('SERIES', type='nominal', title='ARC', sort=None),
+                tooltip=[alt.Tooltip('SERIES', type='nominal', title='ARC'), alt.Tooltip('WEEK', type='quantitative', title='Semaine'),
+                         alt.Tooltip('VALUE', type='quantitative', title='Heures', format='.2f')])
+            if not bands.empty:
+                envelope = alt.Chart(bands).mark_area(opacity=0.15, color='grey').encode(
+                    x=x, y=alt.Y('LOW', type='quantitative'), y2=alt.Y2('HIGH'),
+                    detail=alt.Detail('BAND', type='nominal'),
+                    tooltip=[alt.Tooltip('BAND', type='nominal', title='Bande'), alt.Tooltip('WEEK', type='quantitative', title='Semaine'),
+                             alt.Tooltip('LOW', type='quantitative', title='Min.', format='.2f'),
+                             alt.Tooltip('HIGH', type='quantitative', title='Max.', format='.2f')])
+                chart = alt.layer(envelope, chart)
+            return chart.properties(title=title, height=400).interactive()
+
+        chart, report = build_altair_chart('generate_time_series_chart', build)
+        st.altair_chart(chart, use_container_width=True)
+        return report
+
+    # The labels of the series are part of the data: the same values for another ARC are another chart
+    params = {'title_prefix': title_prefix, 'mode': mode, 'total_weeks': total_weeks}
+    image, report = render_chart('generate_time_series_chart', render, [lines, bands], params)
+    st.image(image, use_column_width=True)
+    return report
 
 # ========================================================================================================================================
 # CALCULATIONS
@@ -372,11 +563,11 @@ def calculate_weeks():
     Returns:
     - tuple: Contains the numbers of the previous, current, and next week, the current year, and month.
     """
-    current_date = datetime.datetime.now()
-    current_week = current_date.isocalendar()[1]
-    previous_week = current_week - 1 if current_week > 1 else 52
-    next_week = current_week + 1 if current_week < 52 else 1
-    current_year = current_date.year
+    current_date = datetime.date.today()
+    # ISO year and week: the first days of January can belong to the last week of the previous year (52 or 53)
+    current_year, current_week = iso_week(current_date)
+    previous_week = shift_week(current_year, current_week, -1)[1]
+    next_week = shift_week(current_year, current_week, 1)[1]
     current_month = current_date.month
     return previous_week, current_week, next_week, current_year, current_month
 
@@ -384,7 +575,7 @@ def calculate_weeks():
 # CREATION AND MODIFICATION
 def create_time_files_for_arcs(df):
     """
-    Checks and creates, if necessary, an empty CSV file for each ARC mentioned in a DataFrame, in the local "imotion" folder.
+    Checks and creates, if necessary, an empty history for each ARC mentioned in a DataFrame, in the time storage backend.
 
     Parameters:
     - df (pandas.DataFrame): DataFrame containing at least one 'ARC' column with ARC names.
@@ -392,14 +583,10 @@ def create_time_files_for_arcs(df):
     Returns:
     None
     """
-    os.makedirs("imotion", exist_ok=True)  # Assure que le dossier existe
+    store = get_time_store()
 
     for arc_name in df['ARC'].dropna().unique():  # Filtrer les valeurs NaN et obtenir des noms uniques
-        file_path = os.path.join("imotion", f"Time_{arc_name}.csv")
-        
-        if not os.path.exists(file_path):  # Vérifie si le fichier existe déjà
-            new_df = pd.DataFrame(columns=CATEGORIES)  # Crée un nouveau DataFrame avec les colonnes souhaitées
-            new_df.to_csv(file_path, index=False, sep=';', encoding='utf-8')  # Sauvegarde en local
+        store.create_empty(arc_name)  # Ne fait rien si l'historique existe déjà
 
 def create_ongoing_files_for_arcs(df):
     """
@@ -411,67 +598,615 @@ def create_ongoing_files_for_arcs(df):
     Returns:
     None
     """
-    os.makedirs("imotion", exist_ok=True)  # S'assurer que le dossier "imotion" existe
+    store = get_table_store()
 
     for arc_name in df['ARC'].dropna().unique():  # Filtrer les valeurs NaN et obtenir des noms uniques
-        file_path = os.path.join("imotion", f"Ongoing_{arc_name}.csv")
+        file_name = f"Ongoing_{arc_name}.csv"
         
-        if not os.path.exists(file_path):  # Vérifier si le fichier existe déjà
+        if not store.exists(file_name):  # Vérifier si le fichier existe déjà
             new_df = pd.DataFrame(columns=CATEGORIES)  # Créer un nouveau DataFrame avec les colonnes souhaitées
-            new_df.to_csv(file_path, index=False, sep=';', encoding='utf-8')  # Sauvegarde locale
+            store.write(file_name, new_df, sep=';', encoding='utf-8')  # Sauvegarde locale
 
 
+@profiled("save:add_row")
 def add_row_to_df_local(file_name, df, **kwargs):
     """
-    Adds a new row to a DataFrame and saves the updated DataFrame to a CSV file locally in the "imotion" folder.
+    Adds a new row to a CSV file locally in the "imotion" folder. The row is appended to the current content
+    of the file, read again under its lock, so that rows added meanwhile by another session are kept.
 
     Parameters:
     - file_name (str): The name of the CSV file.
-    - df (pandas.DataFrame): The DataFrame to which the new row will be added.
+    - df (pandas.DataFrame): The DataFrame displayed when the row was entered (used if the file does not exist).
     - **kwargs: The values of the new row to add.
 
     Returns:
     - pandas.DataFrame: The updated DataFrame.
     """
-    file_path = os.path.join("imotion", file_name)
-
-    # S'assurer que le dossier "imotion" existe
-    os.makedirs("imotion", exist_ok=True)
-
     # Créer une nouvelle ligne à partir des kwargs
     new_row = pd.DataFrame([kwargs])
 
-    # Ajouter la nouvelle ligne au DataFrame existant
-    df = pd.concat([df, new_row], ignore_index=True)
+    # Ajouter la nouvelle ligne au contenu actuel du fichier et sauvegarder en local
+    return get_table_store().update(
+        file_name, lambda current: pd.concat([df if current is None else current, new_row], ignore_index=True),
+        sep=';', encoding='utf-8')
 
-    # Sauvegarder le DataFrame mis à jour en local
-    df.to_csv(file_path, index=False, sep=';', encoding='utf-8')
 
-    return df
+@profiled("save:update_rows", argument='changes')
+def update_rows_local(file_name, changes, key_column):
+    """
+    Updates some rows of a CSV file locally in the "imotion" folder. Only the given rows are applied, on the current
+    content of the file read again under its lock, so that the other rows changed meanwhile by another session are kept.
+
+    Parameters:
+    - file_name (str): The name of the CSV file.
+    - changes (pandas.DataFrame): The key_column and the new values of the changed rows.
+    - key_column (str): The column identifying the rows (e.g. 'ARC').
+
+    Returns:
+    - int: The number of rows updated.
+    """
+    if changes.empty:
+        return 0
+    return get_table_store().update_rows(file_name, key_column, changes, sep=';', encoding='utf-8')
 
 
+@profiled("save:delete_rows")
 def delete_row_local(file_name, df, row_to_delete):
     """
-    Deletes a specific row from a DataFrame and updates the corresponding CSV file locally in the "imotion" folder.
+    Deletes specific rows from a CSV file locally in the "imotion" folder. The rows are identified by their
+    content in the displayed DataFrame and removed from the current content of the file, read again under its lock.
 
     Parameters:
     - file_name (str): The name of the CSV file.
-    - df (pandas.DataFrame): The DataFrame from which to delete the row.
-    - row_to_delete (int): The index of the row to delete in the DataFrame.
+    - df (pandas.DataFrame): The DataFrame displayed when the deletion was requested.
+    - row_to_delete (int or list-like): The index label(s) of the row(s) to delete in the DataFrame.
 
     Returns:
-    - pandas.DataFrame: The DataFrame after deleting the row.
+    - pandas.DataFrame: The DataFrame after deleting the rows.
     """
-    file_path = os.path.join("imotion", file_name)
-
+    labels = [label for label in pd.Index(np.atleast_1d(row_to_delete)) if label in df.index]
     # Vérifier que l'index existe dans le DataFrame avant de le supprimer
-    if row_to_delete in df.index:
-        df = df.drop(row_to_delete).reset_index(drop=True)  # Supprime la ligne et réindexe proprement
+    if not labels:
+        return df
 
-        # Sauvegarder le DataFrame mis à jour en local
-        df.to_csv(file_path, index=False, sep=';', encoding='utf-8')
+    rows = df.loc[labels]
 
-    return df
+    def drop_rows(current):
+        if current is None:
+            return None
+        columns = [col for col in rows.columns if col in current.columns]
+        matches = pd.MultiIndex.from_frame(current[columns].astype(str)).isin(
+            pd.MultiIndex.from_frame(rows[columns].astype(str)))
+        if not matches.any():
+            return None
+        return current[~matches].reset_index(drop=True)  # Supprime les lignes et réindexe proprement
+
+    # Sauvegarder le DataFrame mis à jour en local
+    updated = get_table_store().update(file_name, drop_rows, sep=';', encoding='utf-8')
+    return df.drop(labels).reset_index(drop=True) if updated is None else updated
+
+
+#####################################################################
+# ============================= VIEWS ============================= #
+#####################################################################
+
+@profiled("load:dashboard_rollup")
+def load_dashboard_data():
+    """
+    Loads the weekly rollup of every valid ARC (one row per ARC, study and week), shared by the dashboards.
+    Only the dashboard views call it, so the management views never read the histories.
+
+    Returns:
+    - pandas.DataFrame: The rollup rows of the valid ARCs.
+    """
+    return load_weekly_rollup(arcs=[arc for arc in load_arc_passwords().keys() if is_valid_arc(arc)])
+
+
+def show_arc_management():
+    """
+    Displays the "Gestion - ARCs" view: creation, archiving and passwords of the ARCs.
+
+    Returns:
+    None
+    """
+    arc_df = load_arc_info()
+
+    col_add, _, col_delete, _, col_modify = st.columns([3, 1, 3, 1, 3])
+    with col_add:
+        st.markdown("#### Ajout d'un nouvel ARC")
+        new_arc_name = st.text_input("Nom du nouvel ARC", key="new_arc_name")
+        new_arc_password = st.text_input("Mot de passe pour le nouvel ARC", key="new_arc_mdp")
+        if st.button("Ajouter l'ARC"):
+            if new_arc_name and new_arc_password:  # Check if fields are not empty
+                arc_df = add_row_to_df_local(ARC_PASSWORDS_FILE, arc_df, ARC=new_arc_name, MDP=new_arc_password)
+                get_arc_registry().refresh()
+                create_time_files_for_arcs(arc_df)
+                create_ongoing_files_for_arcs(arc_df) 
+                st.success(f"Nouvel ARC '{new_arc_name}' ajouté avec succès.")
+                st.rerun()
+            else:
+                st.error("Veuillez remplir le nom de l'ARC et le mot de passe.")
+
+    with col_delete:
+        st.markdown("#### Archivage d'un ARC")
+        arc_options = arc_df['ARC'].dropna().astype(str).tolist()
+        arc_to_delete = st.selectbox("Choisir un ARC à archiver", sorted(arc_options))
+        if st.button("Archiver l'ARC sélectionné"):
+            arc_df = delete_row_local(ARC_PASSWORDS_FILE, arc_df, arc_df[arc_df['ARC'] == arc_to_delete].index)
+            get_arc_registry().refresh()
+            st.success(f"ARC '{arc_to_delete}' archivé avec succès.")
+            st.rerun()
+
+    with col_modify:
+        st.markdown("#### Gestion des mots de passe")
+        # One grid for every ARC instead of one expander and one text input per ARC; only the passwords are editable
+        passwords_df = arc_df[['ARC', 'MDP']].fillna('').astype(str)
+        edited_df = st.data_editor(
+            passwords_df,
+            key="arc_passwords_grid",
+            hide_index=True,
+            use_container_width=True,
+            disabled=['ARC'],
+            column_config={
+                'ARC': st.column_config.TextColumn("ARC"),
+                'MDP': st.column_config.TextColumn("Mot de passe", required=True),
+            })
+        # Button to save changes: only the rows whose password changed are written
+        if st.button('Sauvegarder les modifications'):
+            changes = edited_df[edited_df['MDP'] != passwords_df['MDP']]
+            updated = update_rows_local(ARC_PASSWORDS_FILE, changes, 'ARC')
+            if updated:
+                get_arc_registry().refresh()
+            st.success(f'Modifications sauvegardées avec succès ({updated} mot(s) de passe modifié(s)).')
+            st.rerun()
+
+
+def show_study_management():
+    """
+    Displays the "Gestion - Etudes" view: creation, archiving and assignment of the studies.
+
+    Returns:
+    None
+    """
+    arc_df = load_arc_info()
+    study_df = load_study_info()
+    arc_options = arc_df['ARC'].dropna().astype(str).tolist()
+    arc_options = sorted(arc_options) + ['Aucun']  # Replace 'nan' with 'Aucun'
+
+    col_add, _, col_delete, _, col_modify = st.columns([3, 1, 3, 1, 3])
+    with col_add:
+        st.markdown("#### Ajout d'une nouvelle étude")
+        new_study_name = st.text_input("Nom de l'étude", key="new_study_name")
+        new_study_primary_arc = st.selectbox(f"ARC Principal", arc_options, key="new_study_arc_principal")
+        new_study_backup_arc = st.selectbox("ARC de backup (optionnel)", arc_options, key=f"new_study_arc_backup", help="Optionnel")
+
+        col_add, col_list = st.columns(2)
+        with col_add:
+            if st.button("Ajouter l'étude"):
+                if new_study_name and new_study_primary_arc:  # Minimal validation
+                    # Adding the new study
+                    study_df = add_row_to_df_local(STUDY_INFO_FILE, study_df,
+                                             STUDY=new_study_name, 
+                                             ARC=new_study_primary_arc, 
+                                             ARC_BACKUP=new_study_backup_arc if new_study_backup_arc else "")
+                    sync_study_status(study_df)
+                    st.success(f"Nouvelle étude '{new_study_name}' ajoutée avec succès.")
+                    st.rerun()
+                else:
+                    st.error("Le nom de l'étude et l'ARC principal sont requis.")
+        with col_list:
+            # Served from the study catalog, the workbook is only rebuilt when the catalog changed
+            load_all_study_names()  # Builds the catalog on first use
+            catalog_store = get_table_store()
+            excel_data = study_list_excel(catalog_store.name, catalog_store.folder, catalog_store.version(CATALOG_FILE))
+            st.download_button(
+                label="Liste des études en cours et archivées",
+                data=excel_data,
+                file_name='liste_etudes.xlsx',
+                mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            )
+
+
+    with col_delete:
+        st.markdown("#### Archivage d'une étude")
+        study_options = study_df['STUDY'].dropna().astype(str).tolist()
+        study_to_delete = st.selectbox("Choisir une étude à archiver", sorted(study_options))
+        if st.button("Archiver l'étude sélectionnée"):
+            study_df = delete_row_local(STUDY_INFO_FILE ,study_df, study_df[study_df['STUDY'] == study_to_delete].index)
+            sync_study_status(study_df)
+            st.success(f"L'étude '{study_to_delete}' est archivée avec succès.")
+            st.rerun()
+
+    with col_modify:
+        st.markdown("#### Affectation des études")
+        # One grid for every study instead of one expander and two selectboxes per study ('Aucun' for no ARC)
+        assignments_df = study_df[['STUDY', 'ARC', 'ARC_BACKUP']].copy()
+        assignments_df[['ARC', 'ARC_BACKUP']] = assignments_df[['ARC', 'ARC_BACKUP']].where(
+            assignments_df[['ARC', 'ARC_BACKUP']].isin(arc_options), 'Aucun')
+        edited_df = st.data_editor(
+            assignments_df,
+            key="study_assignments_grid",
+            hide_index=True,
+            use_container_width=True,
+            disabled=['STUDY'],
+            column_config={
+                'STUDY': st.column_config.TextColumn("Étude"),
+                'ARC': st.column_config.SelectboxColumn("ARC Principal", options=arc_options, required=True),
+                'ARC_BACKUP': st.column_config.SelectboxColumn("ARC Backup", options=arc_options, required=True, help="Optionnel"),
+            })
+
+        # Global button to save the modifications: only the rows whose assignment changed are written
+        if st.button('Sauvegarder les modifications', key=19):
+            changed = (edited_df['ARC'] != assignments_df['ARC']) | (edited_df['ARC_BACKUP'] != assignments_df['ARC_BACKUP'])
+            # Before saving, replace 'Aucun' with np.nan
+            changes = edited_df[changed].replace('Aucun', np.nan)
+            if update_rows_local(STUDY_INFO_FILE, changes, 'STUDY'):
+                # Rebuild the ARC -> studies index from the saved assignments
+                update_assignment_index(load_study_info())
+            st.success('Modifications sauvegardées avec succès.')
+            st.rerun()
+
+
+def show_arc_dashboard():
+    """
+    Displays the "Dashboard - par ARC" view: weekly and monthly activity of one ARC.
+
+    Returns:
+    None
+    """
+    all_arcs_df = load_dashboard_data()
+    study_df = load_study_info()
+    col_arc, col_year, _, _ = st.columns(4)
+
+    with col_arc:
+        arc = st.selectbox("Choix de l'ARC", list(load_arc_passwords().keys()), key=2)
+
+    with col_year:
+        year_choice = st.selectbox("Année", YEARS, key=3, index=YEARS.index(datetime.datetime.now().year))
+
+    # I. Data Loading (rows of the selected ARC in the weekly rollup)
+    df_data = all_arcs_df[all_arcs_df['ARC'] == arc]
+    previous_week, current_week, next_week, current_year, current_month = calculate_weeks()
+
+    associated_studies = df_data['STUDY'].unique().tolist()
+    filtered_studies_df = study_df[study_df['STUDY'].isin(associated_studies)]
+    associated_studies = filtered_studies_df['STUDY'].unique().tolist()
+
+    # List of month names
+    month_names = MONTHS
+
+    # II. User Interface for Year, Month, and Week selection
+    col_week, _, col_month = st.columns([1, 0.25, 1])
+    with col_week:
+        week_count = weeks_in_year(year_choice)
+        week_choice = st.slider("Semaine", 1, week_count, min(current_week, week_count), key=4)
+    with col_month:
+        # Ensure month choice uses a different key
+        selected_month_name = st.select_slider("Mois", options=month_names, 
+                        value=month_names[current_month - 1], key=6)
+        # Convert selected month name to number
+        month_choice = month_names.index(selected_month_name) + 1
+
+    # Data filtering for Week table
+    filtered_week_df = df_data[(df_data['YEAR'] == year_choice) & (df_data['WEEK'] == week_choice)]
+
+    # Data filtering for Month table (weeks of the month looked up in the ISO calendar)
+    filtered_month_df = filter_month(df_data, year_choice, month_choice)
+
+    # Convert some columns to integers for both tables
+    filtered_week_df[TIME_INT_CAT] = filtered_week_df[TIME_INT_CAT].astype(int)
+    filtered_month_df[TIME_INT_CAT] = filtered_month_df[TIME_INT_CAT].astype(int)
+
+    # Using the function for weekly data
+    with col_week:
+        process_and_display_data(filtered_week_df, "semaine", week_choice)
+
+    # Using the function for monthly data
+    with col_month:
+        process_and_display_data(filtered_month_df, "mois", selected_month_name)
+
+    st.write("---")
+
+    # Study selection with multiselect
+    sel_studies = st.multiselect("Choisir une ou plusieurs études", options=associated_studies, default=associated_studies, key=10)
+    num_studies = len(sel_studies)
+
+    # Calculate the number of rows needed for two columns
+    nrows = (num_studies + 1) // 2 if num_studies % 2 else num_studies // 2
+
+    # Create main columns for weeks and months
+    col_week, col_month = st.columns(2)
+
+    # Generate charts for the week in the left column
+    with col_week:
+        generate_charts_for_time_period(filtered_week_df, sel_studies, week_choice, "la semaine")
+
+    # Repeat the same structure for the month in the right column
+    with col_month:
+        generate_charts_for_time_period(filtered_month_df, sel_studies, selected_month_name, "")
+
+
+def show_all_arcs_dashboard():
+    """
+    Displays the "Dashboard - tous ARCs" view: weekly totals of every ARC.
+
+    Returns:
+    None
+    """
+    all_arcs_df = load_dashboard_data()
+    arcs = list(load_arc_passwords().keys())
+
+    previous_week, current_week, next_week, current_year, current_month = calculate_weeks()
+
+    # Last 5 weeks (possibly across the year boundary) and all the weeks of the current year (52 or 53)
+    last_5_weeks = [week_key(year, week) for year, week in last_weeks(current_year, current_week, 5)]
+    all_weeks_current_year = np.arange(1, weeks_in_year(current_year) + 1)
+
+    valid_arcs = []
+    for arc in arcs:
+        if is_valid_arc(arc):
+            valid_arcs.append(arc)
+        else:
+            st.error(f"Le dataframe pour {arc} n'a pas pu être chargé.")
+
+    # Weekly totals of every ARC for the current year, pivoted once into an ARC x week matrix (0 for the weeks without data)
+    current_year_df = all_arcs_df[all_arcs_df['YEAR'] == current_year]
+    weekly_totals = current_year_df.groupby(['ARC', 'WEEK'])['TOTAL'].sum().rename('Total Time').reset_index()
+    year_matrix = week_matrix(weekly_totals, valid_arcs, all_weeks_current_year)
+
+    # Same for the last 5 weeks, keyed by (year, week) then labelled with the week numbers in chronological order
+    recent_df = filter_weeks(all_arcs_df, last_5_weeks)
+    recent_totals = (recent_df.assign(WEEK=week_key(recent_df['YEAR'], recent_df['WEEK']))
+                     .groupby(['ARC', 'WEEK'])['TOTAL'].sum().rename('Total Time').reset_index())
+    recent_matrix = week_matrix(recent_totals, valid_arcs, last_5_weeks)
+    recent_matrix.columns = [key % 100 for key in last_5_weeks]
+
+    # Display options: the number of lines drawn does not grow with the number of ARCs
+    col_top, col_points, col_envelope = st.columns(3)
+    with col_top:
+        top_n = st.number_input("Nombre d'ARCs affichés", min_value=1, max_value=max(1, len(valid_arcs)),
+                                value=max(1, min(TOP_ARCS, len(valid_arcs))), step=1, key="series_top_n")
+    with col_points:
+        max_points = st.select_slider("Points max. par courbe (année)", options=SERIES_POINTS_OPTIONS, value=SERIES_POINTS_OPTIONS[-1], key="series_max_points")
+    with col_envelope:
+        show_envelope = st.checkbox(f"Enveloppe P{ENVELOPE_PERCENTILES[0]}-P{ENVELOPE_PERCENTILES[1]} de tous les ARCs", key="series_envelope")
+    percentiles = ENVELOPE_PERCENTILES if show_envelope else None
+
+    col_month, col_year = st.columns(2)
+    
+    # For the chart of the last 5 weeks
+    with col_month:
+        generate_time_series_chart(recent_matrix, "Évolution Hebdomadaire", mode='last_5_weeks', top_n=top_n, percentiles=percentiles)
+
+    # For the chart of the current year
+    with col_year:
+        generate_time_series_chart(year_matrix, f"Évolution Hebdomadaire en {current_year}", mode='year', top_n=top_n,
+                                   percentiles=percentiles, max_points=max_points)
+
+
+def show_study_dashboard():
+    """
+    Displays the "Dashboard - par Etude" view: actions, time per ARC and patients of one study.
+
+    Returns:
+    None
+    """
+    all_arcs_df = load_dashboard_data()
+    # Study selection
+    study_names = load_all_study_names()
+    study_choice = st.selectbox("Choisissez votre étude (en cours et archivées)", study_names)
+
+    # Filtering data by selected study (the rollup is already typed, no numeric conversion needed)
+    filtered_df_by_study = all_arcs_df[all_arcs_df['STUDY'] == study_choice]
+
+    # Calculate total time spent by activity category for the selected study
+    total_time_by_category = filtered_df_by_study[ACTION_CAT].sum()
+
+    # Using st.columns to divide display space
+    col_table, _, col_graph = st.columns([1.5, 0.2, 2])
+
+    with col_table:
+        st.write(f"Temps passé sur l'étude {study_choice}, par catégorie d'activité :")
+        
+        # Start with a Markdown header for the table
+        markdown_table = "Catégorie | Actions réalisées\n:- | -:\n"
+        
+        # Add each category and corresponding time in Markdown format
+        for category, hours in total_time_by_category.items():
+            if category != "TOTAL":
+                markdown_table += f"{category} | {int(hours)}\n"
+        
+        # Display the formatted table in Markdown
+        st.markdown(markdown_table)
+
+    with col_graph:
+        # Preparation and display of pie chart in the second column
+        # Ensure total_time_by_category is defined before this line
+        total_time_by_category = total_time_by_category[total_time_by_category > 0]
+
+        if chart_engine() == "altair":
+            if total_time_by_category.sum() > 0:
+                long_sums = total_time_by_category.rename_axis('CATEGORIE').reset_index(name='ACTIONS')
+                chart, _ = build_altair_chart('plot_pie_chart_on_ax', lambda: altair_pie_chart(
+                    long_sums, f"Répartition des actions par catégorie pour l'étude {study_choice}"))
+                st.altair_chart(chart)
+            else:
+                st.info(f"Aucune donnée disponible pour {study_choice}")
+        else:
+            def render_study_pie():
+                import matplotlib.pyplot as plt
+
+                fig, ax = plt.subplots()
+                if total_time_by_category.sum() > 0:
+                    plot_pie_chart_on_ax(total_time_by_category, f"Répartition des actions par catégorie pour l'étude {study_choice}", ax)
+                else:
+                    ax.text(0.5, 0.5, f"Aucune donnée disponible\npour {study_choice}", ha='center', va='center', transform=ax.transAxes) # Correct reference to study choice variable and positioning
+                    ax.set_axis_off()  # Hide axes if no data
+                return fig
+
+            image, _ = render_chart('plot_pie_chart_on_ax', render_study_pie, [total_time_by_category], {'study': study_choice})
+            st.image(image, use_column_width=True)
+        
+    st.write("---")
+    col_arc, col_scr, col_rand, col_eos, col_calc= st.columns([2, 1, 1, 1, 1])
+
+    with col_arc:
+        st.write(f"Temps total passé par ARC sur l'étude {study_choice} :")
+        
+        # Group data by ARC and calculate total
+        total_time_by_arc = filtered_df_by_study.groupby('ARC')['TOTAL'].sum()
+        
+        # Check if DataFrame is not empty
+        if not total_time_by_arc.empty:
+            # Option 1: Display as table using Markdown
+            markdown_table = "ARC | Heures Totales\n:- | -:\n"
+            for arc, total_hours in total_time_by_arc.items():
+                markdown_table += f"{arc} | {total_hours:.2f}\n"
+            st.markdown(markdown_table)
+        else:
+            st.write("Aucune donnée disponible pour cette étude.")
+    with col_scr:
+        screened_pat = int(filtered_df_by_study['NB_PAT_SCR'].sum())
+        st.metric(label="Nombre total de patients inclus", value=screened_pat)
+
+    with col_rand:
+        rando_pat = int(filtered_df_by_study['NB_PAT_RAN'].sum())
+        st.metric(label="Nombre total de patients randomisés", value=rando_pat)
+
+    with col_eos:
+        eos_pat = int(filtered_df_by_study['NB_EOS'].sum())
+        st.metric(label="Nombre total de patients EOS", value=eos_pat)
+
+    with col_calc:
+        calc_pat = rando_pat - eos_pat
+        st.metric(label="Nombre total de patients en cours de suivi", value=calc_pat)
+
+
+def show_all_studies_dashboard():
+    """
+    Displays the "Dashboard - toutes Etudes" view: hours and inclusions of every study for a month.
+
+    Returns:
+    None
+    """
+    all_arcs_df = load_dashboard_data()
+    month_names = MONTHS
+    previous_week, current_week, next_week, current_year, current_month = calculate_weeks()
+
+    col_year, col_month, _ = st.columns([1, 3, 3])
+    with col_year:
+        year_choice = st.selectbox("Année", YEARS, key=13, index=YEARS.index(datetime.datetime.now().year))
+    with col_month:
+        # Ensure the month choice uses a different key
+        selected_month_name = st.select_slider("Mois", options=month_names, 
+                        value=month_names[current_month - 1], key=16)
+        # Convert selected month name to number
+        month_choice = month_names.index(selected_month_name) + 1
+
+    # Filtering data for the month table (weeks of the month looked up in the ISO calendar)
+    filtered_month_df = filter_month(all_arcs_df, year_choice, month_choice)
+
+    df_activities_month = filtered_month_df.groupby('STUDY')[TIME_INT_CAT].sum()
+    df_activities_month['Total Time'] = df_activities_month['TOTAL']
+    df_activities_month_sorted = df_activities_month.sort_values('Total Time', ascending=False)
+
+    filtered_year_df = all_arcs_df[(all_arcs_df['YEAR'] == year_choice)]
+    df_patient_included_year = filtered_year_df.groupby('STUDY')[INT_CATEGORIES].sum()
+
+    col_graph1, col_graph2 = st.columns([3, 3])
+    with col_graph1:
+        create_bar_chart(df_activities_month_sorted, 'Heures Passées par Étude', selected_month_name)
+    with col_graph2:
+        df_patient_included_month = filtered_month_df.groupby('STUDY')[INT_CATEGORIES].sum()
+        create_bar_chart(df_patient_included_month, "Nombre d'inclusions", selected_month_name, 'NB_PAT_SCR', y_axis="")
+    
+    metrics_year, metrics_month, metrics_suivi = st.columns([3, 3, 3])
+    with metrics_year:
+        nb_incl = int(df_patient_included_year['NB_PAT_SCR'].sum())
+        st.metric(label=f"Nombre total de patients inclus en {year_choice}", value=nb_incl)
+
+    with metrics_month: 
+        nb_incl = int(df_patient_included_month['NB_PAT_SCR'].sum())
+        st.metric(label=f"Nombre total de patients inclus en {selected_month_name} {year_choice}", value=nb_incl)
+
+    with metrics_suivi:
+        nb_incl = int(df_patient_included_month['NB_PAT_SCR'].sum())
+        nb_eos = int(df_patient_included_month['NB_EOS'].sum())
+        st.metric(label=f"Nombre total de patients suivi en {selected_month_name} {year_choice}", value=nb_incl-nb_eos)
+
+
+def show_export():
+    """
+    Displays the "Export" view: the history of the selected ARCs, years and studies, written chunk by chunk
+    (see imotion_export.iter_history_chunks) into a temporary file, offered for download then deleted.
+    Only the export itself runs in bounded memory: st.download_button has no streamed mode, it reads the
+    whole file and keeps it in the Streamlit media storage of the session, so the download step holds one
+    copy of the exported file in the server memory.
+
+    Returns:
+    None
+    """
+    previous_week, current_week, next_week, current_year, current_month = calculate_weeks()
+    arc_options = [arc for arc in load_arc_passwords().keys() if is_valid_arc(arc)]
+
+    st.markdown("#### Export de l'historique")
+    col_years, col_format = st.columns([3, 1])
+    with col_years:
+        years = st.select_slider("Années", options=YEARS, value=(YEARS[0], current_year if current_year in YEARS else YEARS[-1]), key="export_years")
+    with col_format:
+        export_format = st.radio("Format", ["xlsx", "zip"], format_func=lambda f: EXPORT_FORMAT_LABELS[f], key="export_format")
+
+    col_arcs, col_studies = st.columns(2)
+    with col_arcs:
+        arcs = st.multiselect("ARCs (tous si vide)", sorted(arc_options), key="export_arcs")
+    with col_studies:
+        studies = st.multiselect("Études (toutes si vide)", load_all_study_names(), key="export_studies")
+
+    if st.button("Préparer l'export"):
+        with tempfile.NamedTemporaryFile(prefix="imotion_export_", suffix="." + export_format, delete=False) as f:
+            export_path = f.name
+        try:
+            with st.spinner("Export en cours..."):
+                report = export_history(export_path, export_format, arcs=arcs or arc_options, years=years, studies=studies or None)
+            st.success(f"{report['rows']} lignes exportées.")
+            # The download button reads the whole file into memory when it is created: the temporary file is no longer needed afterwards
+            with open(export_path, 'rb') as f:
+                st.download_button(label="Télécharger l'export", data=f, file_name=f"historique_imotion.{export_format}",
+                                   mime=EXPORT_MIME_TYPES[export_format])
+        finally:
+            os.remove(export_path)
+
+
+# Label and function of each view, in the order of the navigation
+VIEWS = {
+    "👥 Gestion - ARCs": show_arc_management,
+    "📚 Gestion - Etudes": show_study_management,
+    "📈 Dashboard - par ARC": show_arc_dashboard,
+    "📊 Dashboard - tous ARCs": show_all_arcs_dashboard,
+    "📈 Dashboard - par Etude": show_study_dashboard,
+    "📊 Dashboard - toutes Etudes": show_all_studies_dashboard,
+    "📤 Export": show_export,
+}
+
+
+def show_views():
+    """
+    Displays the views of the application. By default a selector in the sidebar chooses the view and only
+    that view is executed, so a widget change only reloads the data and charts of the visible dashboard.
+    With IMOTION_NAVIGATION=tabs, every view is rendered in st.tabs on each rerun, as before.
+
+    Returns:
+    None
+    """
+    if NAVIGATION == "tabs":
+        for tab, show_view in zip(st.tabs(list(VIEWS)), VIEWS.values()):
+            with tab, span(f"view:{show_view.__name__}"):
+                show_view()
+        return
+
+    view = st.sidebar.radio("Navigation", list(VIEWS), key="navigation")
+    with span(f"view:{VIEWS[view].__name__}"):
+        VIEWS[view]()
 
 
 #####################################################################
@@ -480,7 +1215,20 @@ def delete_row_local(file_name, df, row_to_delete):
 
 def main():
     """
-    Main function running the Streamlit application. Configures the page, handles authentication, and displays different dashboards.
+    Main function running the Streamlit application. Each rerun is profiled when IMOTION_DEBUG or IMOTION_PROFILE_LOG
+    is set (see imotion_profiling): its timing spans are appended to the log file and, with IMOTION_DEBUG=1, displayed in the sidebar.
+
+    Returns:
+    None
+    """
+    with rerun_trace("manager") as trace:
+        show_app()
+    show_profiling_panel(trace)
+
+
+def show_app():
+    """
+    Configures the page, handles authentication, and displays the selected view.
 
     Returns:
     None
@@ -517,399 +1265,7 @@ def main():
                 st.rerun()
         st.write("---")
 
-        # Selection tab
-        tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["👥 Gestion - ARCs", "📚 Gestion - Etudes", "📈 Dashboard - par ARC", "📊 Dashboard - tous ARCs",  "📈 Dashboard - par Etude", "📊 Dashboard - toutes Etudes"])
-
-    # ----------------------------------------------------------------------------------------------------------
-        with tab1:
-            arc_df = load_arc_info()
-
-            col_add, _, col_delete, _, col_modify = st.columns([3, 1, 3, 1, 3])
-            with col_add:
-                st.markdown("#### Ajout d'un nouvel ARC")
-                new_arc_name = st.text_input("Nom du nouvel ARC", key="new_arc_name")
-                new_arc_password = st.text_input("Mot de passe pour le nouvel ARC", key="new_arc_mdp")
-                if st.button("Ajouter l'ARC"):
-                    if new_arc_name and new_arc_password:  # Check if fields are not empty
-                        arc_df = add_row_to_df_local(ARC_PASSWORDS_FILE, arc_df, ARC=new_arc_name, MDP=new_arc_password)
-                        create_time_files_for_arcs(arc_df)
-                        create_ongoing_files_for_arcs(arc_df) 
-                        st.success(f"Nouvel ARC '{new_arc_name}' ajouté avec succès.")
-                        st.rerun()
-                    else:
-                        st.error("Veuillez remplir le nom de l'ARC et le mot de passe.")
-
-            with col_delete:
-                st.markdown("#### Archivage d'un ARC")
-                arc_options = arc_df['ARC'].dropna().astype(str).tolist()
-                arc_to_delete = st.selectbox("Choisir un ARC à archiver", sorted(arc_options))
-                if st.button("Archiver l'ARC sélectionné"):
-                    arc_df = delete_row_local(arc_df, arc_df[arc_df['ARC'] == arc_to_delete].index)
-                    st.success(f"ARC '{arc_to_delete}' archivé avec succès.")
-                    st.rerun()
-
-            with col_modify:
-                st.markdown("#### Gestion des mots de passe")
-                for i, row in arc_df.iterrows():
-                    with st.expander(f"{row['ARC']}"):
-                        new_password = st.text_input("New password", value=row['MDP'], key=f"password_{i}")
-                        # Update the DataFrame in session_state if the password changes
-                        if new_password != row['MDP']:
-                            arc_df.at[i, 'MDP'] = new_password
-                # Button to save changes
-                if st.button('Sauvegarder les modifications'):
-                    save_data_to_local(ARC_PASSWORDS_FILE, arc_df)
-                    st.success('Modifications sauvegardées avec succès.')
-                    st.rerun()
-
-    # ----------------------------------------------------------------------------------------------------------
-        with tab2:
-            study_df = load_study_info()
-            arc_options = arc_df['ARC'].dropna().astype(str).tolist()
-            arc_options = sorted(arc_options) + ['Aucun']  # Replace 'nan' with 'Aucun'
-
-            col_add, _, col_delete, _, col_modify = st.columns([3, 1, 3, 1, 3])
-            with col_add:
-                st.markdown("#### Ajout d'une nouvelle étude")
-                new_study_name = st.text_input("Nom de l'étude", key="new_study_name")
-                new_study_primary_arc = st.selectbox(f"ARC Principal", arc_options, key="new_study_arc_principal")
-                new_study_backup_arc = st.selectbox("ARC de backup (optionnel)", arc_options, key=f"new_study_arc_backup", help="Optionnel")
-
-                col_add, col_list = st.columns(2)
-                with col_add:
-                    if st.button("Ajouter l'étude"):
-                        if new_study_name and new_study_primary_arc:  # Minimal validation
-                            # Adding the new study
-                            study_df = add_row_to_df_local(STUDY_INFO_FILE, study_df,
-                                                     STUDY=new_study_name, 
-                                                     ARC=new_study_primary_arc, 
-                                                     ARC_BACKUP=new_study_backup_arc if new_study_backup_arc else "")
-                            st.success(f"Nouvelle étude '{new_study_name}' ajoutée avec succès.")
-                            st.rerun()
-                        else:
-                            st.error("Le nom de l'étude et l'ARC principal sont requis.")
-                with col_list:
-                    study_names = load_all_study_names()
-                    study_names_df = pd.DataFrame(study_names, columns=['Study Name'])
-                    excel_data = convert_df_to_excel(study_names_df)
-                    st.download_button(
-                        label="Liste des études en cours et archivées",
-                        data=excel_data,
-                        file_name='liste_etudes.xlsx',
-                        mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-                    )
-
-
-            with col_delete:
-                st.markdown("#### Archivage d'une étude")
-                study_options = study_df['STUDY'].dropna().astype(str).tolist()
-                study_to_delete = st.selectbox("Choisir une étude à archiver", sorted(study_options))
-                if st.button("Archiver l'étude sélectionnée"):
-                    study_df = delete_row_local(STUDY_INFO_FILE ,study_df, study_df[study_df['STUDY'] == study_to_delete].index)
-                    st.success(f"L'étude '{study_to_delete}' est archivée avec succès.")
-                    st.rerun()
-
-            with col_modify:
-                st.markdown("#### Affectation des études")
-                for i, row in study_df.iterrows():
-                    with st.expander(f"{row['STUDY']}"):
-                        # Find the index of the current primary ARC in the options, treating 'nan' as 'None'
-                        current_primary_arc = 'Aucun' if pd.isna(row['ARC']) else row['ARC']
-                        primary_arc_index = arc_options.index(current_primary_arc) if current_primary_arc in arc_options else len(arc_options) - 1
-                        # Select the primary ARC with the found index
-                        new_primary_arc = st.selectbox(f"ARC Principal pour {row['STUDY']}", arc_options, index=primary_arc_index, key=f"primary_{i}")
-                        
-                        # Find the index of the current backup ARC in the options, treating 'nan' as 'None'
-                        current_backup_arc = 'Aucun' if pd.isna(row['ARC_BACKUP']) else row['ARC_BACKUP']
-                        backup_arc_index = arc_options.index(current_backup_arc) if current_backup_arc in arc_options else len(arc_options) - 1
-                        # Select the backup ARC with the found index
-                        new_backup_arc = st.selectbox(f"ARC Backup pour {row['STUDY']}", arc_options, index=backup_arc_index, key=f"backup_{i}", help="Optionnel")
-
-                        # Before saving, replace 'None' with np.nan
-                        study_df.at[i, 'ARC'] = np.nan if new_primary_arc == 'Aucun' else new_primary_arc
-                        study_df.at[i, 'ARC_BACKUP'] = np.nan if new_backup_arc == 'Aucun' else new_backup_arc
-
-                # Global button to save all modifications
-                if st.button('Sauvegarder les modifications', key=19):
-                    save_data_to_local(STUDY_INFO_FILE, study_df)
-                    st.success('Modifications sauvegardées avec succès.')
-                    st.rerun() 
-
-    # ----------------------------------------------------------------------------------------------------------
-        with tab3:
-            col_arc, col_year, _, _ = st.columns(4)
-
-            with col_arc:
-                arc = st.selectbox("Choix de l'ARC", list(ARC_PASSWORDS.keys()), key=2)
-
-            with col_year:
-                year_choice = st.selectbox("Année", YEARS, key=3, index=YEARS.index(datetime.datetime.now().year))
-
-            # I. Data Loading
-            df_data = load_data(arc)
-            previous_week, current_week, next_week, current_year, current_month = calculate_weeks()
-
-            associated_studies = df_data['STUDY'].unique().tolist()
-            filtered_studies_df = study_df[study_df['STUDY'].isin(associated_studies)]
-            associated_studies = filtered_studies_df['STUDY'].unique().tolist()
-
-            # List of month names
-            month_names = MONTHS
-
-            # II. User Interface for Year, Month, and Week selection
-            col_week, _, col_month = st.columns([1, 0.25, 1])
-            with col_week:
-                week_choice = st.slider("Semaine", 1, 52, current_week, key=4)
-            with col_month:
-                # Ensure month choice uses a different key
-                selected_month_name = st.select_slider("Mois", options=month_names, 
-                                value=month_names[current_month - 1], key=6)
-                # Convert selected month name to number
-                month_choice = month_names.index(selected_month_name) + 1
-
-            # Data filtering for Week table
-            filtered_week_df = df_data[(df_data['YEAR'] == year_choice) & (df_data['WEEK'] == week_choice)]
-
-            # Data filtering for Month table
-            first_day_of_month = datetime.datetime(year_choice, month_choice, 1)
-            last_day_of_month = datetime.datetime(year_choice, month_choice + 1, 1) - datetime.timedelta(days=1)
-            start_week = first_day_of_month.isocalendar()[1]
-            end_week = last_day_of_month.isocalendar()[1]
-            filtered_month_df = df_data[(df_data['YEAR'].astype(int) == year_choice) & 
-                                (df_data['WEEK'].astype(int) >= start_week) & 
-                                (df_data['WEEK'].astype(int) <= end_week)]
-
-            # Convert some columns to integers for both tables
-            filtered_week_df[TIME_INT_CAT] = filtered_week_df[TIME_INT_CAT].astype(int)
-            filtered_month_df[TIME_INT_CAT] = filtered_month_df[TIME_INT_CAT].astype(int)
-
-            # Using the function for weekly data
-            with col_week:
-                process_and_display_data(filtered_week_df, "semaine", week_choice)
-
-            # Using the function for monthly data
-            with col_month:
-                process_and_display_data(filtered_month_df, "mois", selected_month_name)
-
-            st.write("---")
-
-            # Study selection with multiselect
-            sel_studies = st.multiselect("Choisir une ou plusieurs études", options=associated_studies, default=associated_studies, key=10)
-            num_studies = len(sel_studies)
-
-            # Calculate the number of rows needed for two columns
-            nrows = (num_studies + 1) // 2 if num_studies % 2 else num_studies // 2
-
-            # Create main columns for weeks and months
-            col_week, col_month = st.columns(2)
-
-            # Generate charts for the week in the left column
-            with col_week:
-                generate_charts_for_time_period(filtered_week_df, sel_studies, week_choice, "la semaine")
-
-            # Repeat the same structure for the month in the right column
-            with col_month:
-                generate_charts_for_time_period(filtered_month_df, sel_studies, selected_month_name, "")
-
-    # ----------------------------------------------------------------------------------------------------------
-        with tab4:
-            arcs = list(ARC_PASSWORDS.keys())
-
-            previous_week, current_week, next_week, current_year, current_month = calculate_weeks()
-
-            # Use current_year instead of directly using 2024
-            last_5_weeks = [(current_week - i - 1) % 52 + 1 for i in range(5)]
-            all_weeks_current_year = np.arange(1, 53)  # All weeks for the current year
-            dfs = {}  # To store the DataFrames
-
-            for arc in arcs:
-                if arc is not None and not (isinstance(arc, float) and math.isnan(arc)):
-                    try:
-                        df_arc = load_data(arc)
-                        df_arc['Total Time'] = df_arc['TOTAL']
-                        df_arc = df_arc.groupby(['YEAR', 'WEEK'])['Total Time'].sum().reset_index()
-                        
-                        # Prepare a DataFrame with all weeks for the last 5 weeks with default values as 0
-                        df_all_last_5_weeks = pd.DataFrame({'YEAR': current_year, 'WEEK': last_5_weeks, 'Total Time': 0}).merge(
-                            df_arc[(df_arc['YEAR'] == current_year) & (df_arc['WEEK'].isin(last_5_weeks))],
-                            on=['YEAR', 'WEEK'], how='left', suffixes=('', '_y')).fillna(0)
-                        df_all_last_5_weeks['Total Time'] = df_all_last_5_weeks[['Total Time', 'Total Time_y']].max(axis=1)
-                        df_all_last_5_weeks.drop(columns=['Total Time_y'], inplace=True)
-                        
-                        # Prepare a DataFrame for all weeks of the current year with default values as 0
-                        df_all_current_year = pd.DataFrame({'YEAR': current_year, 'WEEK': all_weeks_current_year, 'Total Time': 0}).merge(
-                            df_arc[df_arc['YEAR'] == current_year],
-                            on=['YEAR', 'WEEK'], how='left', suffixes=('', '_y')).fillna(0)
-                        df_all_current_year['Total Time'] = df_all_current_year[['Total Time', 'Total Time_y']].max(axis=1)
-                        df_all_current_year.drop(columns=['Total Time_y'], inplace=True)
-                        
-                        dfs[arc] = {'last_5_weeks': df_all_last_5_weeks, 'current_year': df_all_current_year}
-                    except:
-                        pass
-                else:
-                    st.error(f"Le dataframe pour {arc} n'a pas pu être chargé.")
-
-            col_month, col_year = st.columns(2)
-            
-            # For the chart of the last 5 weeks
-            with col_month:
-                generate_time_series_chart({arc: data['last_5_weeks'] for arc, data in dfs.items()}, "Évolution Hebdomadaire", mode='last_5_weeks')
-
-            # For the chart of the current year
-            with col_year:
-                generate_time_series_chart({arc: data['current_year'] for arc, data in dfs.items()}, f"Évolution Hebdomadaire en {current_year}", mode='year')
-
-    # ----------------------------------------------------------------------------------------------------------
-        with tab5:
-            # Study selection
-            study_names = load_all_study_names()
-            study_choice = st.selectbox("Choisissez votre étude (en cours et archivées)", study_names)
-
-            # Loading and combining data from all ARCs
-            all_arcs_df = pd.DataFrame()
-            for arc in ARC_PASSWORDS.keys():
-                if arc is not None and not (isinstance(arc, float) and math.isnan(arc)):
-                    try:
-                        df_arc = load_data(arc)
-                        df_arc['ARC'] = arc
-                        all_arcs_df = pd.concat([all_arcs_df, df_arc], ignore_index=True)
-                    except:
-                        pass
-
-            # Filtering data by selected study
-            filtered_df_by_study = all_arcs_df[all_arcs_df['STUDY'] == study_choice]
-
-            # Ensure that columns of interest are of numeric type for calculation
-            filtered_df_by_study[TIME_INT_CAT] = filtered_df_by_study[TIME_INT_CAT].apply(pd.to_numeric, errors='coerce')
-
-            # Calculate total time spent by activity category for the selected study
-            total_time_by_category = filtered_df_by_study[ACTION_CAT].sum()
-
-            # Using st.columns to divide display space
-            col_table, _, col_graph = st.columns([1.5, 0.2, 2])
-
-            with col_table:
-                st.write(f"Temps passé sur l'étude {study_choice}, par catégorie d'activité :")
-                
-                # Start with a Markdown header for the table
-                markdown_table = "Catégorie | Actions réalisées\n:- | -:\n"
-                
-                # Add each category and corresponding time in Markdown format
-                for category, hours in total_time_by_category.items():
-                    if category != "TOTAL":
-                        markdown_table += f"{category} | {int(hours)}\n"
-                
-                # Display the formatted table in Markdown
-                st.markdown(markdown_table)
-
-            with col_graph:
-                # Preparation and display of pie chart in the second column
-                fig, ax = plt.subplots()
-                # Ensure total_time_by_category is defined before this line
-                total_time_by_category = total_time_by_category[total_time_by_category > 0]
-                if total_time_by_category.sum() > 0:
-                    plot_pie_chart_on_ax(total_time_by_category, f"Répartition des actions par catégorie pour l'étude {study_choice}", ax)
-                else:
-                    ax.text(0.5, 0.5, f"Aucune donnée disponible\npour {study_choice}", ha='center', va='center', transform=ax.transAxes) # Correct reference to study choice variable and positioning
-                    ax.set_axis_off()  # Hide axes if no data
-                st.pyplot(fig)
-                
-            st.write("---")
-            col_arc, col_scr, col_rand, col_eos, col_calc= st.columns([2, 1, 1, 1, 1])
-
-            with col_arc:
-                st.write(f"Temps total passé par ARC sur l'étude {study_choice} :")
-                
-                # Group data by ARC and calculate total
-                total_time_by_arc = filtered_df_by_study.groupby('ARC')['TOTAL'].sum()
-                
-                # Check if DataFrame is not empty
-                if not total_time_by_arc.empty:
-                    # Option 1: Display as table using Markdown
-                    markdown_table = "ARC | Heures Totales\n:- | -:\n"
-                    for arc, total_hours in total_time_by_arc.items():
-                        markdown_table += f"{arc} | {total_hours:.2f}\n"
-                    st.markdown(markdown_table)
-                else:
-                    st.write("Aucune donnée disponible pour cette étude.")
-            with col_scr:
-                screened_pat = int(filtered_df_by_study['NB_PAT_SCR'].sum())
-                st.metric(label="Nombre total de patients inclus", value=screened_pat)
-
-            with col_rand:
-                rando_pat = int(filtered_df_by_study['NB_PAT_RAN'].sum())
-                st.metric(label="Nombre total de patients randomisés", value=rando_pat)
-
-            with col_eos:
-                eos_pat = int(filtered_df_by_study['NB_EOS'].sum())
-                st.metric(label="Nombre total de patients EOS", value=eos_pat)
-
-            with col_calc:
-                calc_pat = rando_pat - eos_pat
-                st.metric(label="Nombre total de patients en cours de suivi", value=calc_pat)
-
-    # ----------------------------------------------------------------------------------------------------------
-        with tab6:
-            study_df = load_study_info()
-            month_names = MONTHS
-            previous_week, current_week, next_week, current_year, current_month = calculate_weeks()
-
-            col_year, col_month, _ = st.columns([1, 3, 3])
-            with col_year:
-                year_choice = st.selectbox("Année", YEARS, key=13, index=YEARS.index(datetime.datetime.now().year))
-            with col_month:
-                # Ensure the month choice uses a different key
-                selected_month_name = st.select_slider("Mois", options=month_names, 
-                                value=month_names[current_month - 1], key=16)
-                # Convert selected month name to number
-                month_choice = month_names.index(selected_month_name) + 1
-
-            all_arcs_df = pd.DataFrame()
-            for arc in ARC_PASSWORDS.keys():
-                if arc is not None and not (isinstance(arc, float) and math.isnan(arc)):
-                    try:
-                        df_arc = load_data(arc)
-                        df_arc['ARC'] = arc
-                        all_arcs_df = pd.concat([all_arcs_df, df_arc], ignore_index=True)
-                    except:
-                        pass
-
-            # Filtering data for the month table
-            first_day_of_month = datetime.datetime(year_choice, month_choice, 1)
-            last_day_of_month = datetime.datetime(year_choice, month_choice + 1, 1) - datetime.timedelta(days=1)
-            start_week = first_day_of_month.isocalendar()[1]
-            end_week = last_day_of_month.isocalendar()[1]
-            filtered_month_df = all_arcs_df[(all_arcs_df['YEAR'] == year_choice) & 
-                                        (all_arcs_df['WEEK'] >= start_week) & 
-                                        (all_arcs_df['WEEK'] <= end_week)]
-
-            df_activities_month = filtered_month_df.groupby('STUDY')[TIME_INT_CAT].sum()
-            df_activities_month['Total Time'] = df_activities_month['TOTAL']
-            df_activities_month_sorted = df_activities_month.sort_values('Total Time', ascending=False)
-
-            filtered_year_df = all_arcs_df[(all_arcs_df['YEAR'] == year_choice)]
-            df_patient_included_year = filtered_year_df.groupby('STUDY').sum()
-
-            col_graph1, col_graph2 = st.columns([3, 3])
-            with col_graph1:
-                create_bar_chart(df_activities_month_sorted, 'Heures Passées par Étude', selected_month_name)
-            with col_graph2:
-                df_patient_included_month = filtered_month_df.groupby('STUDY').sum()
-                create_bar_chart(df_patient_included_month, "Nombre d'inclusions", selected_month_name, 'NB_PAT_SCR', y_axis="")
-            
-            metrics_year, metrics_month, metrics_suivi = st.columns([3, 3, 3])
-            with metrics_year:
-                nb_incl = int(df_patient_included_year['NB_PAT_SCR'].sum())
-                st.metric(label=f"Nombre total de patients inclus en {year_choice}", value=nb_incl)
-
-            with metrics_month: 
-                nb_incl = int(df_patient_included_month['NB_PAT_SCR'].sum())
-                st.metric(label=f"Nombre total de patients inclus en {selected_month_name} {year_choice}", value=nb_incl)
-
-            with metrics_suivi:
-                nb_incl = int(df_patient_included_month['NB_PAT_SCR'].sum())
-                nb_eos = int(df_patient_included_month['NB_EOS'].sum())
-                st.metric(label=f"Nombre total de patients suivi en {selected_month_name} {year_choice}", value=nb_incl-nb_eos)
+        show_views()
 
 
 #####################################################################
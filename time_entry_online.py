@@ -9,6 +9,18 @@ import locale
 import os
 from io import StringIO, BytesIO
 import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from imotion_storage import get_time_store, get_table_store, week_keys, normalize_time_frame
+from imotion_rollup import update_weekly_rollup
+from imotion_catalog import update_study_catalog
+from imotion_calendar import iso_week, shift_week, weeks_in_year, week_dates
+from imotion_reconcile import reconcile_week, empty_week_rows
+from imotion_assignments import get_assignment_index
+from imotion_context import RequestContext
+from imotion_registry import get_arc_registry
+from imotion_profiling import profiled, rerun_trace, show_profiling_panel
 
 
 #####################################################################
@@ -20,44 +32,25 @@ YEARS = list(range(2024, 2030))
 CATEGORIES = ['YEAR', 'WEEK', 'STUDY', 'TOTAL', 'MISE EN PLACE', 'TRAINING', 'VISITES', 'SAISIE CRF', 'QUERIES', 'MONITORING', 'REMOTE', 'REUNIONS', 
 'ARCHIVAGE EMAIL', 'MAJ DOC', 'AUDIT & INSPECTION', 'CLOTURE', 'NB_VISITE', 'NB_PAT_SCR', 'NB_PAT_RAN', 'NB_EOS', 'COMMENTAIRE']
 INT_CATEGORIES = CATEGORIES[3:-1]
-# Configuration des colonnes avec "help" pour toutes les colonnes
-COLUMN_CONFIG = {
-    'YEAR': st.column_config.TextColumn("Année", help="Année"),
-    'WEEK': st.column_config.TextColumn("Sem.", help="Numéro de la semaine"),
-    'STUDY': st.column_config.TextColumn("Étude", help="Nom de l'étude"),
-    'TOTAL': st.column_config.NumberColumn("Total", help="Temps total passé"),
-    
-    # Pour les cases à cocher
-    'MISE EN PLACE': st.column_config.CheckboxColumn("MEP", help="Mise en place"),
-    'TRAINING': st.column_config.CheckboxColumn("Form.", help="Formation"),
-    'VISITES': st.column_config.CheckboxColumn("Vis.", help="Organisation des Visites"),
-    'SAISIE CRF': st.column_config.CheckboxColumn("CRF", help="Saisie CRF"),
-    'QUERIES': st.column_config.CheckboxColumn("Quer.", help="Queries"),
-    'MONITORING': st.column_config.CheckboxColumn("Monit.", help="Monitoring"),
-    'REMOTE': st.column_config.CheckboxColumn("Rem.", help="Remote"),
-    'REUNIONS': st.column_config.CheckboxColumn("Réu.", help="Réunions"),
-    'ARCHIVAGE EMAIL': st.column_config.CheckboxColumn("Arch. Email", help="Archivage des emails"),
-    'MAJ DOC': st.column_config.CheckboxColumn("Maj. Doc", help="Mise à jour des documents"),
-    'AUDIT & INSPECTION': st.column_config.CheckboxColumn("Aud.&Insp.", help="Audit et Inspection"),
-    'CLOTURE': st.column_config.CheckboxColumn("Clôture", help="Clôture"),
-    
-    # Colonnes numériques ou textuelles avec "help"
-    'NB_VISITE': st.column_config.NumberColumn("Nb Vis.", help="Nombre de visites"),
-    'NB_PAT_SCR': st.column_config.NumberColumn("Nb Pat. Scr.", help="Nombre de patients screenés"),
-    'NB_PAT_RAN': st.column_config.NumberColumn("Nb Pat. Rand.", help="Nombre de patients randomisés"),
-    'NB_EOS': st.column_config.NumberColumn("Nb EOS.", help="Nombre d'EOS"),
-    'COMMENTAIRE': st.column_config.TextColumn("Commentaires", help="Commentaires")
-}
+# Colonnes du tableau des temps (YEAR à CLOTURE) et du tableau des quantités (YEAR, WEEK, STUDY et NB_VISITE à COMMENTAIRE)
+keys_df_time = CATEGORIES[:CATEGORIES.index('CLOTURE') + 1]
+keys_df_quantity = ['YEAR', 'WEEK', 'STUDY'] + CATEGORIES[CATEGORIES.index('NB_VISITE'):]
 
 
-def load_csv_from_local(file_name, sep=';', encoding='utf-8'):
+def load_csv_from_local(file_name, sep=';', encoding='utf-8', copy=True, filters=None):
     """
-    Load a CSV file from the local "imotion" folder into a pandas DataFrame.
+    Load a CSV file from the local "imotion" folder into a pandas DataFrame, through the configured
+    storage backend. With the CSV backend, parsed files are kept in a process-wide cache keyed by
+    (path, mtime, size), so an unchanged file is only parsed once; with the SQLite backend the file is
+    a table of imotion/imotion.db and the filters are evaluated by SQLite.
 
     Parameters:
     - file_name (str): Name of the file to load from the "imotion" folder.
     - sep (str, optional): Field separator in the CSV file. Default is ';'.
     - encoding (str, optional): Encoding of the CSV file. Default is 'utf-8'.
+    - copy (bool, optional): Return a private copy. Readers that do not mutate the DataFrame
+      can pass False to get the cached DataFrame directly. Default is True.
+    - filters (dict, optional): Equality filters {column: value} applied while loading. Default is None.
 
     Returns:
     - pandas.DataFrame: A DataFrame containing the data from the CSV file.
@@ -66,15 +59,12 @@ def load_csv_from_local(file_name, sep=';', encoding='utf-8'):
     - FileNotFoundError: If the file does not exist.
     - UnicodeDecodeError: If there is an encoding issue.
     """
-    file_path = os.path.join("imotion", file_name)
+    store = get_table_store()
 
-    if not os.path.exists(file_path):
+    if not store.exists(file_name):
         raise FileNotFoundError(f"Le fichier {file_name} n'existe pas dans le dossier 'imotion'.")
 
-    try:
-        return pd.read_csv(file_path, sep=sep, encoding=encoding)
-    except UnicodeDecodeError:
-        return pd.read_csv(file_path, sep=sep, encoding='latin1')
+    return store.read(file_name, sep=sep, encoding=encoding, copy=copy, filters=filters)
 
 
 def save_csv_to_local(df, file_name, sep=';', encoding='utf-8'):
@@ -93,21 +83,17 @@ def save_csv_to_local(df, file_name, sep=';', encoding='utf-8'):
     Raises:
     - Exception: Raises an exception if the saving fails for any reason.
     """
-    file_path = os.path.join("imotion", file_name)
-
-    # S'assurer que le dossier "imotion" existe
-    os.makedirs("imotion", exist_ok=True)
-
     try:
         # Sauvegarder le DataFrame en local
-        df.to_csv(file_path, index=False, sep=sep, encoding=encoding)
+        get_table_store().write(file_name, df, sep=sep, encoding=encoding)
     except Exception as e:
         raise Exception(f"Erreur lors de la sauvegarde du fichier {file_name}: {e}")
 
+@profiled("load:arc_passwords")
 def load_arc_passwords():
     """
-    Load passwords from a CSV file in S3, first attempting with UTF-8 encoding,
-    then with Latin1 encoding if encoding fails.
+    Load the ARC passwords from the shared ARC registry, which only checks the version of ARC_MDP.csv
+    on each call and reloads the file in the background after a change (new or archived ARC).
 
     Parameters:
     None
@@ -116,27 +102,56 @@ def load_arc_passwords():
     - dict: A dictionary with ARCs as keys and corresponding passwords as values.
 
     Raises:
-    None
+    - FileNotFoundError: If ARC_MDP.csv does not exist or is missing the ARC and MDP columns.
     """
-    try:
-        # Attempt to load the file with UTF-8 encoding
-        df = load_csv_from_local(ARC_PASSWORDS_FILE, sep=';', encoding='utf-8')
-    except UnicodeDecodeError:
-        # If encoding error occurs, attempt to load with Latin1 encoding
-        df = load_csv_from_local(ARC_PASSWORDS_FILE, sep=';', encoding='latin1')
-    return dict(zip(df['ARC'], df['MDP']))
+    passwords = get_arc_registry().passwords()
+    if passwords is None:
+        raise FileNotFoundError(f"Le fichier {ARC_PASSWORDS_FILE} est absent ou ne contient pas les colonnes ARC et MDP.")
+    return passwords
 
-ARC_PASSWORDS = load_arc_passwords()
+@st.cache_resource(show_spinner=False)
+def get_column_configs():
+    """
+    Build the column configurations of the time table and of the quantity table, once per process.
+
+    Parameters:
+    None
 
-# Keys for df1 (from YEAR to CLOTURE)
-keys_df_time = list(COLUMN_CONFIG.keys())[:list(COLUMN_CONFIG.keys()).index('CLOTURE')+1]
+    Returns:
+    - tuple: (dict, dict) The configurations of the keys_df_time and keys_df_quantity columns.
+    """
+    # Configuration des colonnes avec "help" pour toutes les colonnes
+    column_config = {
+        'YEAR': st.column_config.TextColumn("Année", help="Année"),
+        'WEEK': st.column_config.TextColumn("Sem.", help="Numéro de la semaine"),
+        'STUDY': st.column_config.TextColumn("Étude", help="Nom de l'étude"),
+        'TOTAL': st.column_config.NumberColumn("Total", help="Temps total passé"),
+        
+        # Pour les cases à cocher
+        'MISE EN PLACE': st.column_config.CheckboxColumn("MEP", help="Mise en place"),
+        'TRAINING': st.column_config.CheckboxColumn("Form.", help="Formation"),
+        'VISITES': st.column_config.CheckboxColumn("Vis.", help="Organisation des Visites"),
+        'SAISIE CRF': st.column_config.CheckboxColumn("CRF", help="Saisie CRF"),
+        'QUERIES': st.column_config.CheckboxColumn("Quer.", help="Queries"),
+        'MONITORING': st.column_config.CheckboxColumn("Monit.", help="Monitoring"),
+        'REMOTE': st.column_config.CheckboxColumn("Rem.", help="Remote"),
+        'REUNIONS': st.column_config.CheckboxColumn("Réu.", help="Réunions"),
+        'ARCHIVAGE EMAIL': st.column_config.CheckboxColumn("Arch. Email", help="Archivage des emails"),
+        'MAJ DOC': st.column_config.CheckboxColumn("Maj. Doc", help="Mise à jour des documents"),
+        'AUDIT & INSPECTION': st.column_config.CheckboxColumn("Aud.&Insp.", help="Audit et Inspection"),
+        'CLOTURE': st.column_config.CheckboxColumn("Clôture", help="Clôture"),
+        
+        # Colonnes numériques ou textuelles avec "help"
+        'NB_VISITE': st.column_config.NumberColumn("Nb Vis.", help="Nombre de visites"),
+        'NB_PAT_SCR': st.column_config.NumberColumn("Nb Pat. Scr.", help="Nombre de patients screenés"),
+        'NB_PAT_RAN': st.column_config.NumberColumn("Nb Pat. Rand.", help="Nombre de patients randomisés"),
+        'NB_EOS': st.column_config.NumberColumn("Nb EOS.", help="Nombre d'EOS"),
+        'COMMENTAIRE': st.column_config.TextColumn("Commentaires", help="Commentaires")
+    }
 
-# Keys for df2 (YEAR, WEEK, STUDY, and NB_VISITE to COMMENTAIRE)
-keys_df_quantity = ['YEAR', 'WEEK', 'STUDY'] + list(COLUMN_CONFIG.keys())[list(COLUMN_CONFIG.keys()).index('NB_VISITE'):]
+    # Create configurations for each part
+    return {k: column_config[k] for k in keys_df_time}, {k: column_config[k] for k in keys_df_quantity}
 
-# Create configurations for each part
-column_config_df_time = {k: COLUMN_CONFIG[k] for k in keys_df_time}
-column_config_df_quantity = {k: COLUMN_CONFIG[k] for k in keys_df_quantity}
 
 #####################################################################
 # ===================== ASSISTANCE FUNCTIONS ====================== #
@@ -144,9 +159,10 @@ column_config_df_quantity = {k: COLUMN_CONFIG[k] for k in keys_df_quantity}
 
 # ========================================================================================================================================
 # DATA LOADING
+@profiled("load:history")
 def load_data(arc):
     """
-    Load data for a specific ARC from a CSV file located in an S3 bucket.
+    Load data for a specific ARC from the configured time storage backend (CSV, Parquet or SQLite).
 
     Parameters:
     - arc (str): Identifier of the ARC for which to load the data.
@@ -155,63 +171,59 @@ def load_data(arc):
     - pandas.DataFrame: DataFrame containing the loaded data for the specified ARC.
 
     Raises:
-    - UnicodeDecodeError: Raises an exception if an encoding problem occurs during data loading.
+    - FileNotFoundError: If the ARC has no history yet.
     """
-    file_name = f"Time_{arc}.csv"  # Name of the file in the S3 bucket
-    try:
-        # Attempt to load the file with UTF-8 encoding
-        return load_csv_from_local(file_name, sep=';', encoding='utf-8')
-    except UnicodeDecodeError:
-        # If an encoding error occurs, attempt to load with Latin1 encoding
-        return load_csv_from_local(file_name, sep=';', encoding='latin1')
-
-import os
-import pandas as pd
+    return get_time_store().load(arc)
 
 
-def load_time_data(arc, week):
+@profiled("load:time")
+def load_time_data(arc, week, year=None, context=None):
     """
-    Load time data for a specific ARC and given week from a CSV file stored in the local "imotion" folder.
+    Load time data for a specific ARC and given week. The filters are pushed down to the storage
+    backend, so that the Parquet backend only reads the matching partitions and the SQLite backend
+    uses its (ARC, YEAR, WEEK, STUDY) index. With a request context, the rows are filtered from the
+    history loaded once for the whole rerun.
 
     Parameters:
     - arc (str): The identifier of the ARC for which to load the data.
     - week (int): The week number for which the data should be loaded.
+    - year (int, optional): The year for which the data should be loaded. Default is every year.
+    - context (RequestContext, optional): The data context of the current rerun. Default is None.
 
     Returns:
     - pandas.DataFrame: A DataFrame containing filtered time data for the specified ARC and week.
       If an error occurs during loading, an empty DataFrame is returned.
 
     Raises:
-    - FileNotFoundError: If the CSV file does not exist.
-    - Exception: If any other error occurs during data loading.
+    None
     """
     file_name = f"Time_{arc}.csv"
-    file_path = os.path.join("imotion", file_name)
-
-    # Vérifier si le fichier existe avant d'essayer de le charger
-    if not os.path.exists(file_path):
-        print(f"Le fichier {file_name} n'existe pas dans le dossier 'imotion'.")
-        return pd.DataFrame()
 
     try:
-        df = pd.read_csv(file_path, sep=';', encoding='utf-8')
+        df = context.time_rows(week, year) if context is not None else get_time_store().load(arc, year=year, week=week)
         # Vérifier que la colonne 'WEEK' existe avant de filtrer
         if 'WEEK' in df.columns:
-            return df[df['WEEK'] == week]
+            return df
         else:
             print(f"Erreur : La colonne 'WEEK' est absente dans {file_name}.")
             return pd.DataFrame()
+    except FileNotFoundError:
+        print(f"Le fichier {file_name} n'existe pas dans le dossier 'imotion'.")
+        return pd.DataFrame()
     except Exception as e:
         print(f"Erreur lors du chargement des données depuis le fichier local {file_name} : {e}")
         return pd.DataFrame()
 
         
-def load_assigned_studies_with_roles(arc):
+@profiled("load:assigned_studies_with_roles")
+def load_assigned_studies_with_roles(arc, context=None):
     """
-    Load the list of studies assigned to a specific ARC and identify if the ARC is the principal or backup for each study from a CSV file stored in S3.
+    Load the list of studies assigned to a specific ARC and identify if the ARC is the principal or backup for each study.
+    Lookups are served by the in-memory assignment index, rebuilt only when STUDY.csv changes.
 
     Parameters:
     - arc (str): The identifier of the ARC for which assigned studies should be loaded.
+    - context (RequestContext, optional): The data context of the current rerun. Default is None.
 
     Returns:
     - pandas.DataFrame: A DataFrame containing the studies assigned to the specified ARC, with an additional column 'ROLE'
@@ -220,29 +232,20 @@ def load_assigned_studies_with_roles(arc):
     Raises:
     None
     """
-    # Specify the name of the file in the S3 bucket
-    file_name = "STUDY.csv"  # Name of the file in the S3 bucket
-    
-    # Load the study data from the CSV file in the S3 bucket into a DataFrame
-    df_study = load_csv_from_local(file_name, sep=';', encoding='utf-8')
-    
-    # Create a new column 'ROLE' to identify if the ARC is 'Principal' or 'Backup' for each study
-    df_study['ROLE'] = df_study.apply(lambda row: 'Principal' if row['ARC'] == arc else 'Backup' if row['ARC_BACKUP'] == arc else None, axis=1)
-    
-    # Filter the DataFrame to include only the studies where the ARC has a role (either 'Principal' or 'Backup')
-    assigned_studies = df_study[df_study['ROLE'].notnull()]
-    
-    # Return the filtered DataFrame with the 'ROLE' information
-    return assigned_studies
+    if context is not None:
+        return context.assigned_roles()
+    return get_assignment_index().frame_of(arc)
 
 
 
-def load_assigned_studies(arc):
+@profiled("load:assigned_studies")
+def load_assigned_studies(arc, context=None):
     """
-    Load the list of studies assigned to a specific ARC from a CSV file stored in S3.
+    Load the list of studies assigned to a specific ARC, from the in-memory assignment index of STUDY.csv.
 
     Parameters:
     - arc (str): The identifier of the ARC for which assigned studies should be loaded.
+    - context (RequestContext, optional): The data context of the current rerun. Default is None.
 
     Returns:
     - list: A list containing the names of studies assigned to the specified ARC.
@@ -250,23 +253,19 @@ def load_assigned_studies(arc):
     Raises:
     None
     """
-    file_name = "STUDY.csv"  # Name of the file in the S3 bucket
-    
-    # Load the file from S3
-    df_study = load_csv_from_local(file_name, sep=';', encoding='utf-8')
-    
-    # Filter to get studies assigned to the specified ARC
-    assigned_studies = df_study[(df_study['ARC'] == arc) | (df_study['ARC_BACKUP'] == arc)]
-    
-    return assigned_studies['STUDY'].tolist()
+    if context is not None:
+        return context.assigned_studies()
+    return get_assignment_index().studies_of(arc)
 
-def load_weekly_data(arc, week):
+@profiled("load:weekly")
+def load_weekly_data(arc, week, context=None):
     """
     Load weekly data for a specific ARC and given week from a CSV file stored in S3.
 
     Parameters:
     - arc (str): The identifier of the ARC for which to load weekly data.
     - week (int): The week number for which the data should be loaded.
+    - context (RequestContext, optional): The data context of the current rerun. Default is None.
 
     Returns:
     - pandas.DataFrame: A DataFrame containing filtered weekly data for the specified ARC and week.
@@ -279,9 +278,10 @@ def load_weekly_data(arc, week):
     
     # Attempt to load the file from S3
     try:
-        df = load_csv_from_local(file_name, sep=';', encoding='utf-8')
-        # Filter the data for the specified week and return the DataFrame
-        return df[df['WEEK'] == week]
+        if context is not None:
+            return context.weekly_rows(week)
+        # The week filter is applied by the storage backend (returns a new DataFrame)
+        return load_csv_from_local(file_name, sep=';', encoding='utf-8', copy=False, filters={'WEEK': week})
     except Exception as e:
         # Error handling, for example if the file does not exist, return an empty DataFrame
         print(f"Erreur lors du chargement des données depuis S3 : {e}")
@@ -289,9 +289,10 @@ def load_weekly_data(arc, week):
 
 # ========================================================================================================================================
 # SAVE
+@profiled("save:history", argument='df')
 def save_data(df, arc):
     """
-    Save DataFrame data to a specific ARC's CSV file in the local "imotion" folder.
+    Save DataFrame data to a specific ARC's history through the configured time storage backend.
 
     Parameters:
     - df (pandas.DataFrame): The DataFrame containing the data to be saved.
@@ -304,14 +305,40 @@ def save_data(df, arc):
     - Exception: Raises an exception if the save operation fails for any reason.
     """
     file_name = f"Time_{arc}.csv"
-    file_path = os.path.join("imotion", file_name)
 
-    # S'assurer que le dossier "imotion" existe
-    os.makedirs("imotion", exist_ok=True)
+    try:
+        get_time_store().save(arc, df)
+        update_weekly_rollup(arc, df)
+        update_study_catalog(arc, df)
+    except Exception as e:
+        raise Exception(f"Erreur lors de la sauvegarde du fichier {file_name}: {e}")
+
+@profiled("save:week", argument='df_week')
+def save_week_data(df_week, arc, weeks):
+    """
+    Save the edited rows of one week without rewriting the whole history of the ARC.
+    Only the given (YEAR, WEEK) pairs are replaced; with the default "week" save mode
+    the amount of data written only depends on the size of the week. The weekly rollup
+    read by the manager dashboards is updated for the same weeks, and the study catalog
+    for the saved studies.
+
+    Parameters:
+    - df_week (pandas.DataFrame): The edited rows (principal and backup studies).
+    - arc (str): The identifier of the ARC to which the data is associated.
+    - weeks (set): The (year, week) pairs whose previous rows must be replaced.
+
+    Returns:
+    None
+
+    Raises:
+    - Exception: Raises an exception if the save operation fails for any reason.
+    """
+    file_name = f"Time_{arc}.csv"
 
     try:
-        # Sauvegarder le DataFrame en local
-        df.to_csv(file_path, index=False, sep=";", encoding='utf-8')
+        get_time_store().replace_weeks(arc, df_week, weeks)
+        update_weekly_rollup(arc, df_week, weeks)
+        update_study_catalog(arc, df_week)
     except Exception as e:
         raise Exception(f"Erreur lors de la sauvegarde du fichier {file_name}: {e}")
 
@@ -331,7 +358,7 @@ def authenticate_user(arc, password_entered):
     Raises:
     None
     """
-    return ARC_PASSWORDS.get(arc) == password_entered.lower()
+    return load_arc_passwords().get(arc) == password_entered.lower()
 
 def calculate_weeks():
     """
@@ -346,12 +373,11 @@ def calculate_weeks():
     Raises:
     None
     """
-    current_date = datetime.datetime.now()
-    current_week = current_date.isocalendar()[1]
-    previous_week = current_week - 1 if current_week > 1 else 52
-    two_weeks_ago = previous_week - 1 if previous_week > 1 else 52
-    next_week = current_week + 1 if current_week < 52 else 1
-    current_year = current_date.year
+    # ISO year and week: the first days of January can belong to the last week of the previous year (52 or 53)
+    current_year, current_week = iso_week()
+    previous_week = shift_week(current_year, current_week, -1)[1]
+    two_weeks_ago = shift_week(current_year, current_week, -2)[1]
+    next_week = shift_week(current_year, current_week, 1)[1]
     return two_weeks_ago, previous_week, current_week, next_week, current_year
 
 def get_start_end_dates(year, week_number):
@@ -370,16 +396,15 @@ def get_start_end_dates(year, week_number):
 
     The dates are calculated based on the ISO week numbering system.
     """
-    # Find the first day of the year
-    first_day_of_year = datetime.datetime(year-1, 12, 31)
-    first_monday_of_year = first_day_of_year + datetime.timedelta(days=(7-first_day_of_year.weekday()))
-    week_start_date = first_monday_of_year + datetime.timedelta(weeks=week_number-1)
+    # Monday of the week, from the ISO calendar (week 1 can start in December of the previous year)
+    week_start_date = datetime.datetime.combine(week_dates(year, week_number)[0], datetime.time())
     week_end_date = week_start_date + datetime.timedelta(days=4)
     return week_start_date, week_end_date
 
 # ========================================================================================================================================
 # CREATION AND MODIFICATION
-def check_create_weekly_file(arc, year, week):
+@profiled("save:weekly_file")
+def check_create_weekly_file(arc, year, week, context=None):
     """
     Checks the existence of a weekly file for a given ARC. If the file does not exist,
     creates a new DataFrame with the specified columns and saves it to S3.
@@ -388,6 +413,8 @@ def check_create_weekly_file(arc, year, week):
     - arc (str): The ARC identifier.
     - year (int): The relevant year.
     - week (int): The week number.
+    - context (RequestContext, optional): The data context of the current rerun, which keeps the content
+      of the weekly file after the update instead of reading it again. Default is None.
 
     Returns:
     - str or None: The name of the created or modified file on S3, or None if no studies are assigned to the ARC.
@@ -397,37 +424,90 @@ def check_create_weekly_file(arc, year, week):
     """
     file_name = f"Ongoing_{arc}.csv"
 
+    # Load assigned studies
+    assigned_studies = load_assigned_studies(arc, context)
+    if not assigned_studies:
+        # No study assigned: the caller reports it (Streamlit message or batch report)
+        return None
+
+    def add_missing_rows(df_existing):
+        df_existing, changed = add_missing_weekly_rows(df_existing, assigned_studies, year, week)
+        return df_existing if changed else None
+
+    # Read-modify-write under the lock of the file, so that a concurrent session cannot lose these rows
+    updated = get_table_store().update(file_name, add_missing_rows, sep=';', encoding='utf-8')
+    if context is not None:
+        context.set_ongoing(updated)
+
+    return file_name
+
+
+def add_missing_weekly_rows(df_existing, assigned_studies, year, week):
+    """
+    Adds a blank row for each assigned study not present yet in the weekly file for this week and year.
+
+    Parameters:
+    - df_existing (pandas.DataFrame or None): The current content of the weekly file (None if it does not exist).
+    - assigned_studies (list): The studies assigned to the ARC.
+    - year (int): The relevant year.
+    - week (int): The week number.
+
+    Returns:
+    - tuple: (pandas.DataFrame, bool) The completed content and whether rows were added.
+
+    Raises:
+    None
+    """
+    if df_existing is None:
+        df_existing = pd.DataFrame(columns=CATEGORIES)
+
+    # Filter to keep only studies not present for this week and year
+    existing_studies = df_existing[(df_existing['YEAR'] == year) & (df_existing['WEEK'] == week)]['STUDY']
+    new_studies = [study for study in assigned_studies if study not in existing_studies.tolist()]
+    
+    # Prepare new rows to add only for new studies
+    if new_studies:  # If there are new studies to add
+        df_existing = pd.concat([df_existing, empty_week_rows(new_studies, year, week)], ignore_index=True, sort=False)
+    return df_existing, bool(new_studies)
+
+
+def prepare_weekly_rows(arc, year, week):
+    """
+    Builds the content of the weekly file of an ARC in memory: the existing rows plus a blank row for each
+    assigned study not present yet for this week and year. Nothing is written.
+
+    Parameters:
+    - arc (str): The ARC identifier.
+    - year (int): The relevant year.
+    - week (int): The week number.
+
+    Returns:
+    - tuple: (pandas.DataFrame or None, bool) The content of the weekly file (None if no studies are assigned
+      to the ARC) and whether rows were added.
+
+    Raises:
+    None
+    """
+    file_name = f"Ongoing_{arc}.csv"
+
     try:
-        df_existing = load_csv_from_local(file_name, sep=';', encoding='utf-8')
+        df_existing = load_csv_from_local(file_name, sep=';', encoding='utf-8', copy=False)
     except Exception as e:
-        # If the file does not exist or another error occurs, create a new DataFrame
-        df_existing = pd.DataFrame(columns=CATEGORIES)
+        # If the file does not exist or another error occurs, start from an empty file
+        df_existing = None
         
     # Load assigned studies
     assigned_studies = load_assigned_studies(arc)
-    if assigned_studies:
-        # Filter to keep only studies not present for this week and year
-        existing_studies = df_existing[(df_existing['YEAR'] == year) & (df_existing['WEEK'] == week)]['STUDY']
-        new_studies = [study for study in assigned_studies if study not in existing_studies.tolist()]
-        
-        # Prepare new rows to add only for new studies
-        rows = [{'YEAR': year, 'WEEK': week, 'STUDY': study, 'TOTAL':0,'MISE EN PLACE': False, 'TRAINING': False, 'VISITES': False, 'SAISIE CRF': False, 'QUERIES': False, 
-             'MONITORING': False, 'REMOTE': False, 'REUNIONS': False, 'ARCHIVAGE EMAIL': False, 'MAJ DOC': False, 'AUDIT & INSPECTION': False, 'CLOTURE': False, 
-             'NB_VISITE': 0, 'NB_PAT_SCR':0, 'NB_PAT_RAN':0, 'NB_EOS':0, 'COMMENTAIRE': "Aucun"} for study in new_studies]
-        if rows:  # If there are new studies to add
-            df_existing = pd.concat([df_existing, pd.DataFrame(rows)], ignore_index=True, sort=False)
-            # Save the updated DataFrame to S3
-            save_csv_to_local(df_existing, file_name, sep=';', encoding='utf-8')
-    else:
-        st.error("Aucune étude n'a été affectée. Merci de voir avec vos managers.")
-        return None
+    if not assigned_studies:
+        return None, False
 
-    return file_name
+    return add_missing_weekly_rows(df_existing, assigned_studies, year, week)
 
 
 import os
 
 
+@profiled("save:delete_ongoing")
 def delete_ongoing_file(arc):
     """
     Deletes a specific "ongoing" file for an ARC in the local "imotion" folder.
@@ -442,12 +522,12 @@ def delete_ongoing_file(arc):
     - Exception: Raises an exception if deletion fails for any reason.
     """
     file_name = f"Ongoing_{arc}.csv"
-    file_path = os.path.join("imotion", file_name)
+    store = get_table_store()
 
     # Vérifier si le fichier existe avant de le supprimer
-    if os.path.exists(file_path):
+    if store.exists(file_name):
         try:
-            os.remove(file_path)
+            store.delete(file_name)
             print(f"Le fichier {file_name} a été supprimé avec succès.")
         except Exception as e:
             print(f"Erreur lors de la tentative de suppression du fichier {file_name} : {e}")
@@ -478,71 +558,174 @@ def validate_and_format(df, columns):
 # ========================================================================================================================================
 # SAVE AUTOMATIC
 
-def main_auto_save_all():
+def build_auto_save_rows(weekly_df, assigned_studies_df):
     """
-    Automates the process of saving data for all ARCs by updating weekly and time data for each ARC, 
-    and ensuring that the data is properly saved to S3.
+    Builds the rows saved by the automatic save from the weekly rows of an ARC: principal studies first,
+    then backup studies, with the columns of the time and quantity tables.
 
     Parameters:
-    None
+    - weekly_df (pandas.DataFrame): The rows of the week read from the weekly file.
+    - assigned_studies_df (pandas.DataFrame): The studies assigned to the ARC, with their 'ROLE'.
 
     Returns:
+    - pandas.DataFrame: The rows to save.
+
+    Raises:
     None
+    """
+    weekly_df = weekly_df.copy()
+    weekly_df['YEAR'] = weekly_df['YEAR'].astype(str)
+    weekly_df['WEEK'] = weekly_df['WEEK'].astype(str)
+    weekly_df = pd.merge(weekly_df, assigned_studies_df[['STUDY', 'ROLE']], on='STUDY', how='left')
+
+    frames = []
+    for role in ['Principal', 'Backup']:
+        df_role = weekly_df[weekly_df['ROLE'] == role]
+        df_time = df_role[keys_df_time].set_index(['YEAR', 'WEEK', 'STUDY'])
+        df_quantity = df_role[keys_df_quantity].set_index(['YEAR', 'WEEK', 'STUDY'])
+        frames.append(pd.concat([df_time, df_quantity], axis=1).reset_index())
+    return pd.concat(frames)
+
+
+def diff_week_rows(old_df, new_df):
+    """
+    Compares the saved rows of some weeks with the rows that would replace them, on the (YEAR, WEEK, STUDY) key.
+
+    Parameters:
+    - old_df (pandas.DataFrame): The rows currently saved for these weeks.
+    - new_df (pandas.DataFrame): The new rows.
+
+    Returns:
+    - dict: Number of 'added', 'removed' and 'modified' rows.
 
     Raises:
-    None, but logs errors and exceptions during the execution of the saving process.
+    None
+    """
+    keys = ['YEAR', 'WEEK', 'STUDY']
+    old_df = normalize_time_frame(old_df).drop_duplicates(keys, keep='last').set_index(keys)
+    new_df = normalize_time_frame(new_df).drop_duplicates(keys, keep='last').set_index(keys)
+    common = old_df.index.intersection(new_df.index)
+    old_common = old_df.loc[common].astype(str)
+    new_common = new_df.loc[common, old_df.columns].astype(str)
+    return {
+        'added': len(new_df.index.difference(old_df.index)),
+        'removed': len(old_df.index.difference(new_df.index)),
+        'modified': int((old_common != new_common).any(axis=1).sum()),
+    }
 
-    Process:
-    1. Iterates over all ARCs from the ARC_PASSWORDS dictionary.
-    2. For each ARC, loads the data, calculates the current and surrounding weeks.
-    3. Checks for existing time data for the current week and updates it with relevant study information.
-    4. Filters the data for "Principal" and "Backup" roles, updates the corresponding time and quantity data.
-    5. Ensures that old data for the selected week is removed and new data is saved back to S3.
-    6. Logs progress and completion of the save process for each ARC.
+
+def auto_save_arc(arc, year, week, dry_run=False):
+    """
+    Runs the automatic save of the current week for one ARC, without any Streamlit call.
+
+    Parameters:
+    - arc (str): The ARC identifier.
+    - year (int): The current year.
+    - week (int): The current week number.
+    - dry_run (bool, optional): Only compute what would change, without writing anything. Default is False.
+
+    Returns:
+    - dict: The report of the ARC: 'arc', 'seconds', 'rows', 'bytes' (size of the saved rows in CSV),
+      'added', 'removed', 'modified' and 'error' (None on success).
+
+    Raises:
+    None, every error is reported in the returned dictionary.
     """
-    for arc in ARC_PASSWORDS.keys():
-        st.write(f"Sauvegarde automatique pour l'ARC : {arc}")
+    start = time.perf_counter()
+    report = {'arc': arc, 'seconds': 0.0, 'rows': 0, 'bytes': 0, 'added': 0, 'removed': 0, 'modified': 0, 'error': None}
+    try:
+        context = RequestContext(arc)
+        time_df = load_time_data(arc, week, context=context)
+        if dry_run:
+            ongoing_df, _ = prepare_weekly_rows(arc, year, week)
+            if ongoing_df is None:
+                raise ValueError("Aucune étude n'a été affectée.")
+            weekly_df = ongoing_df[ongoing_df['WEEK'] == week]
+        else:
+            if check_create_weekly_file(arc, year, week, context) is None:
+                raise ValueError("Aucune étude n'a été affectée.")
+            weekly_df = load_weekly_data(arc, week, context)
+
+        rows = build_auto_save_rows(weekly_df, load_assigned_studies_with_roles(arc, context))
+
+        # Replace only the current (year, week) in the history: the rows are built for the current year,
+        # the same week number of the earlier years must be kept
+        weeks = {(year, week)}
+        current_df = time_df[(time_df['YEAR'] == year) & (time_df['WEEK'] == week)] if not time_df.empty else time_df
+        report.update(diff_week_rows(current_df if not current_df.empty else pd.DataFrame(columns=CATEGORIES), rows))
+        report['rows'] = len(rows)
+        report['bytes'] = len(rows.to_csv(index=False, sep=';').encode('utf-8'))
+        if not dry_run:
+            save_week_data(rows, arc, weeks)
+    except Exception as e:
+        report['error'] = f"{type(e).__name__}: {e}"
+    report['seconds'] = time.perf_counter() - start
+    return report
 
-        df_data = load_data(arc)
-        two_weeks_ago, previous_week, current_week, next_week, current_year = calculate_weeks()
 
-        selected_week = current_week
+def main_auto_save_all(workers=4, dry_run=False):
+    """
+    Automates the process of saving data for all ARCs by updating weekly and time data for each ARC.
+    The ARCs are processed concurrently in a thread pool and independently: a failing ARC is reported
+    and does not stop the others. Runs without Streamlit and prints a report at the end.
 
-        time_df = load_time_data(arc, selected_week)
-        weekly_file_path = check_create_weekly_file(arc, current_year, current_week)
-        filtered_df2 = load_weekly_data(arc, selected_week)
+    Parameters:
+    - workers (int, optional): Number of ARCs processed at the same time. Default is 4.
+    - dry_run (bool, optional): Only report what would change, without writing anything. Default is False.
 
-        assigned_studies_df = load_assigned_studies_with_roles(arc)
-        filtered_df2['YEAR'] = filtered_df2['YEAR'].astype(str)
-        filtered_df2['WEEK'] = filtered_df2['WEEK'].astype(str)
-        filtered_df2 = pd.merge(filtered_df2, assigned_studies_df[['STUDY', 'ROLE']], on='STUDY', how='left')
+    Returns:
+    - list: The report of every ARC (see auto_save_arc).
 
-        df_principal = filtered_df2[filtered_df2['ROLE'] == 'Principal']
-        df_time_principal = df_principal[keys_df_time]
-        df_quantity_principal = df_principal[keys_df_quantity]
+    Raises:
+    None, but reports errors and exceptions during the execution of the saving process.
 
-        df_backup = filtered_df2[filtered_df2['ROLE'] == 'Backup']
-        df_time_backup = df_backup[keys_df_time]
-        df_quantity_backup = df_backup[keys_df_quantity]
+    Process:
+    1. Computes the current week once for the whole run.
+    2. For each ARC, completes the weekly file with the newly assigned studies.
+    3. Builds the "Principal" and "Backup" rows of the current week.
+    4. Replaces the current week in the history of the ARC (skipped in dry-run mode).
+    5. Prints the duration, rows, bytes and changes of each ARC.
+    """
+    two_weeks_ago, previous_week, current_week, next_week, current_year = calculate_weeks()
+    arcs = [arc for arc in load_arc_passwords().keys() if isinstance(arc, str) and arc]
+    mode = " (simulation, aucune écriture)" if dry_run else ""
+    print(f"Sauvegarde automatique de la semaine {current_week}/{current_year} pour {len(arcs)} ARC(s), {workers} en parallèle{mode}")
 
-        df_data = df_data[df_data['WEEK'] != int(selected_week)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        reports = list(executor.map(lambda arc: auto_save_arc(arc, current_year, current_week, dry_run), arcs))
 
-        df_time_principal = df_time_principal.set_index(['YEAR', 'WEEK', 'STUDY'])
-        df_quantity_principal = df_quantity_principal.set_index(['YEAR', 'WEEK', 'STUDY'])
-        df_time_backup = df_time_backup.set_index(['YEAR', 'WEEK', 'STUDY'])
-        df_quantity_backup = df_quantity_backup.set_index(['YEAR', 'WEEK', 'STUDY'])
+    print(f"{'ARC':<20} {'durée (s)':>10} {'lignes':>8} {'octets':>10} {'ajoutées':>9} {'supprimées':>11} {'modifiées':>10}  statut")
+    for report in reports:
+        status = "OK" if report['error'] is None else f"ERREUR - {report['error']}"
+        print(f"{report['arc']:<20} {report['seconds']:>10.2f} {report['rows']:>8} {report['bytes']:>10} "
+              f"{report['added']:>9} {report['removed']:>11} {report['modified']:>10}  {status}")
+    failed = [report['arc'] for report in reports if report['error'] is not None]
+    print(f"Terminé en {time.perf_counter() - start:.2f} s : {len(reports) - len(failed)} ARC(s) OK, {len(failed)} en erreur.")
+    return reports
 
-        df_principal = pd.concat([df_time_principal, df_quantity_principal], axis=1)
-        df_principal.reset_index(inplace=True)
 
-        df_backup = pd.concat([df_time_backup, df_quantity_backup], axis=1)
-        df_backup.reset_index(inplace=True)
+def main_auto_save_cli(argv):
+    """
+    Command line entry point of the automatic save: "python time_entry_online.py auto_save_all [--workers N] [--dry-run]".
+
+    Parameters:
+    - argv (list): The arguments following "auto_save_all".
 
-        updated_df = pd.concat([df_data, df_principal, df_backup]).sort_index()
+    Returns:
+    - int: The exit code of the process, 1 if at least one ARC failed, else 0.
 
-        save_data(updated_df, arc)
+    Raises:
+    None
+    """
+    parser = argparse.ArgumentParser(prog="time_entry_online.py auto_save_all",
+                                     description="Sauvegarde automatique de la semaine en cours pour tous les ARCs.")
+    parser.add_argument("--workers", type=int, default=4, help="Nombre d'ARCs traités en parallèle (4 par défaut).")
+    parser.add_argument("--dry-run", action="store_true", help="Affiche ce qui changerait sans rien écrire.")
+    args = parser.parse_args(argv)
+    reports = main_auto_save_all(workers=args.workers, dry_run=args.dry_run)
+    return 1 if any(report['error'] for report in reports) else 0
 
-        st.write(f"Sauvegarde terminée pour l'ARC : {arc}")
 
 #####################################################################
 # ========================= MAIN FUNCTION ========================= #
@@ -550,7 +733,21 @@ def main_auto_save_all():
 
 def main():
     """
-    Main function running the Streamlit application. It configures the page, handles user authentication,
+    Main function running the Streamlit application. Each rerun is profiled when IMOTION_DEBUG or
+    IMOTION_PROFILE_LOG is set (see imotion_profiling): its timing spans are appended to the log file
+    and, with IMOTION_DEBUG=1, displayed in the sidebar.
+
+    Returns:
+    None
+    """
+    with rerun_trace("employee") as trace:
+        show_time_entry()
+    show_profiling_panel(trace)
+
+
+def show_time_entry():
+    """
+    Displays the time entry page. It configures the page, handles user authentication,
     data display and modification, as well as saving the changes.
 
     Parameters:
@@ -573,15 +770,18 @@ def main():
     st.write("---")
 
     # User authentication
-    arc = st.sidebar.selectbox("Choisissez votre ARC", list(ARC_PASSWORDS.keys()))
+    arc = st.sidebar.selectbox("Choisissez votre ARC", list(load_arc_passwords().keys()))
     arc_password_entered = st.sidebar.text_input(f"Entrez le mot de passe", type="password")
     
     if not authenticate_user(arc, arc_password_entered):
         st.sidebar.error("Mot de passe incorrect pour l'ARC sélectionné.")
         return
 
+    column_config_df_time, column_config_df_quantity = get_column_configs()
+    # Data of this rerun: the history, the Ongoing file and STUDY.csv are each loaded at most once
+    context = RequestContext(arc)
+
     # I. Data loading
-    df_data = load_data(arc)
     two_weeks_ago, previous_week, current_week, next_week, current_year = calculate_weeks()
 
     # II. Section for data modification
@@ -596,61 +796,37 @@ def main():
 
     # Get the selected value (week number)
     selected_week = int(week_choice2.split()[-1].strip(')'))
-    time_df = load_time_data(arc, selected_week)
+    time_df = load_time_data(arc, selected_week, context=context)
 
 
     if "en cours" in week_choice2:
         # Load data for the current week from Ongoing_arc.csv
-        weekly_file_path = check_create_weekly_file(arc, current_year, current_week)
-        filtered_df2 = load_weekly_data(arc, selected_week)
+        weekly_file_path = check_create_weekly_file(arc, current_year, current_week, context)
+        if weekly_file_path is None:
+            st.error("Aucune étude n'a été affectée. Merci de voir avec vos managers.")
+        filtered_df2 = load_weekly_data(arc, selected_week, context)
 
         if not time_df.empty:
             if not time_df[(time_df['YEAR'] == current_year) & (time_df['WEEK'] == current_week)].empty:
-                # There is data in time_df for the current year and week
-                # Merge the data
-                merged_df = pd.merge(filtered_df2, time_df, on=['YEAR', 'WEEK', 'STUDY'], suffixes=('_ongoing', '_time'), how='outer')
-                # Retrieve studies currently assigned to this ARC
-                assigned_studies = set(load_assigned_studies(arc))
-                merged_df = merged_df[merged_df['STUDY'].isin(assigned_studies)]
-                # Replace values in Ongoing with those from Time if they are not 0
-                columns_to_update = CATEGORIES[3:]
-                for col in columns_to_update:
-                    merged_df[col + '_ongoing'] = merged_df.apply(
-                        lambda row: row[col + '_time'] if not pd.isna(row[col + '_time']) and row[col + '_ongoing'] == 0 else row[col + '_ongoing'], axis=1)
-                # Add rows for missing newly assigned studies
-                for study in assigned_studies:
-                    if study not in merged_df['STUDY'].tolist():
-                        new_row_data = {'YEAR': current_year, 'WEEK': current_week, 'STUDY': study}
-                        new_row_data.update({col + '_ongoing': 0 for col in columns_to_update[:]})
-                        new_row_data['COMMENTAIRE_ongoing'] = "Aucun"
-                        new_row = pd.DataFrame([new_row_data])
-                        merged_df = pd.concat([merged_df, new_row], ignore_index=True)
-
-
-                # Filter columns to eliminate those with '_time'
-                filtered_columns = [col for col in merged_df.columns if '_time' not in col]
-
-                # Create the final DataFrame with filtered columns
-                final_df = merged_df[filtered_columns]
-                filtered_df2 = final_df.rename(columns={col + '_ongoing': col for col in columns_to_update})
+                # There is data in time_df for the current year and week: reconcile it with the Ongoing file,
+                # restricted to the studies currently assigned to this ARC
+                assigned_studies = load_assigned_studies(arc, context)
+                filtered_df2 = reconcile_week(filtered_df2, time_df, assigned_studies, current_year, current_week)
 
             else:
                 # There is data in time_df, but not for the current year and week
                 filtered_df2 = time_df
         else:
             # time_df is completely empty
-            assigned_studies = set(load_assigned_studies(arc))
-            rows = [{'YEAR': current_year, 'WEEK': current_week, 'STUDY': study, 'TOTAL':0, 'MISE EN PLACE': False, 'TRAINING': False, 'VISITES': False, 'SAISIE CRF': False, 'QUERIES': False, 
-             'MONITORING': False, 'REMOTE': False, 'REUNIONS': False, 'ARCHIVAGE EMAIL': False, 'MAJ DOC': False, 'AUDIT & INSPECTION': False, 'CLOTURE': False, 
-             'NB_VISITE': 0, 'NB_PAT_SCR':0, 'NB_PAT_RAN':0, 'NB_EOS':0, 'COMMENTAIRE': "Aucun"} for study in assigned_studies]
-            filtered_df2 = pd.DataFrame(rows)
+            assigned_studies = load_assigned_studies(arc, context)
+            filtered_df2 = empty_week_rows(dict.fromkeys(assigned_studies), current_year, current_week)
             
     else:
         # Charger les données de la semaine précédente à partir de Time_arc.csv
         filtered_df2 = time_df            
 
     # Charger les études assignées avec les rôles
-    assigned_studies_df = load_assigned_studies_with_roles(arc)
+    assigned_studies_df = load_assigned_studies_with_roles(arc, context)
 
     if not filtered_df2.empty:
         filtered_df2['YEAR'] = filtered_df2['YEAR'].astype(str)
@@ -723,9 +899,6 @@ def main():
     # III. Save button
     if st.button("Sauvegarder"):
 
-        # Remove old data for the selected week
-        df_data = df_data[df_data['WEEK'] != int(selected_week)]
-
         # Convertir les colonnes de temps en float pour assurer la bonne sauvegarde des valeurs décimales
         for col in keys_df_time[3:]:  # Exclude 'YEAR', 'WEEK', and 'STUDY'
             df1_edited_principal[col] = df1_edited_principal[col].astype(float)
@@ -747,11 +920,11 @@ def main():
         df_backup = pd.concat([df1_edited_backup, df2_edited_backup], axis=1)
         df_backup.reset_index(inplace=True)
 
-        # Concaténer les nouvelles données principales et backup avec les anciennes données
-        updated_df = pd.concat([df_data, df_principal, df_backup]).sort_index()
-
-        # Save the updated DataFrame
-        save_data(updated_df, arc)
+        # Replace only the edited week (plus the weeks of the edited rows themselves) with the new
+        # principal and backup data: the same week number of the other years is left untouched
+        df_edited = pd.concat([df_principal, df_backup])
+        weeks = {(current_year, selected_week)} | week_keys(df_edited)
+        save_week_data(df_edited, arc, weeks)
 
         # Delete the Ongoing_ARC.csv file
         delete_ongoing_file(arc)
@@ -768,10 +941,13 @@ def main():
     with col1:
         year_choice = st.selectbox("Year", YEARS, index=YEARS.index(datetime.datetime.now().year))
     with col2:
-        week_choice = st.slider("Week", 1, 52, current_week)
+        week_count = weeks_in_year(year_choice)
+        week_choice = st.slider("Week", 1, week_count, min(current_week, week_count))
 
-    # Data filtering and manipulation
-    filtered_df1 = df_data[(df_data['YEAR'] == year_choice) & (df_data['WEEK'] == week_choice)]
+    # Data loading: only the selected year and week are read from the storage backend
+    filtered_df1 = load_time_data(arc, week_choice, year=year_choice, context=context)
+    if filtered_df1.empty:
+        filtered_df1 = pd.DataFrame(columns=CATEGORIES)
 
     # Convert certain columns to integers
     int_columns = INT_CATEGORIES
@@ -802,6 +978,6 @@ def main():
 
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "auto_save_all":
-        main_auto_save_all()
+        sys.exit(main_auto_save_cli(sys.argv[2:]))
     else:
         main()
\ No newline at end of file